@@ -59,7 +59,7 @@ async def test_SCS_1(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 点击开始按钮 - click 操作 (//*[@type='button' and text()='START'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -71,7 +71,7 @@ async def test_SCS_1(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@type='button' and text()='START']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@type='button' and text()='START']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -82,7 +82,7 @@ async def test_SCS_1(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤1: 点击开始按钮 - 步骤后截图"):
@@ -108,7 +108,7 @@ async def test_SCS_1(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 点击同意按钮 - click 操作 (//*[text()='Accept'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -120,7 +120,7 @@ async def test_SCS_1(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[text()='Accept']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[text()='Accept']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -131,7 +131,7 @@ async def test_SCS_1(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 点击同意按钮 - 步骤后截图"):
@@ -149,7 +149,7 @@ async def test_SCS_1(browser_args):
                 # 页面滚动子步骤
                 with allure.step("测试步骤3: 点击图片，进入游戏 - 页面滚动准备"):
                     # 需要等待1S后再操作滚动
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 游戏操作前先滚动页面确保图片可见
                     # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
                     # 请根据实际的页面滚动进行调整到图片可见
@@ -165,7 +165,7 @@ async def test_SCS_1(browser_args):
                             raise Exception("BROWSER_CLOSED_BY_USER")
                         
                         try:
-                            time.sleep(3)
+                            await asyncio.sleep(3)
                             success = await ui_operations.click_image_with_fallback(
                                 "Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png", 
                                 confidence=0.5, 
@@ -184,10 +184,10 @@ async def test_SCS_1(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"[{task_id}] 所有 1 次尝试都失败")
                             raise Exception(f"图片定位失败：无法找到图片 Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png")
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -195,7 +195,7 @@ async def test_SCS_1(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("over_test_test_SCS_1","test_step_3")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -258,7 +258,7 @@ async def test_SCS_2(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 点击开始按钮 - click 操作 (//*[@type='button' and text()='START'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -270,7 +270,7 @@ async def test_SCS_2(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@type='button' and text()='START']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@type='button' and text()='START']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -281,7 +281,7 @@ async def test_SCS_2(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤1: 点击开始按钮 - 步骤后截图"):
@@ -307,7 +307,7 @@ async def test_SCS_2(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 点击同意按钮 - click 操作 (//*[text()='Accept'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -319,7 +319,7 @@ async def test_SCS_2(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[text()='Accept']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[text()='Accept']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -330,7 +330,7 @@ async def test_SCS_2(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 点击同意按钮 - 步骤后截图"):
@@ -348,7 +348,7 @@ async def test_SCS_2(browser_args):
                 # 页面滚动子步骤
                 with allure.step("测试步骤3: 点击图片，进入游戏 - 页面滚动准备"):
                     # 需要等待1S后再操作滚动
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 游戏操作前先滚动页面确保图片可见
                     # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
                     # 请根据实际的页面滚动进行调整到图片可见
@@ -364,7 +364,7 @@ async def test_SCS_2(browser_args):
                             raise Exception("BROWSER_CLOSED_BY_USER")
                         
                         try:
-                            time.sleep(3)
+                            await asyncio.sleep(3)
                             success = await ui_operations.click_image_with_fallback(
                                 "Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png", 
                                 confidence=0.5, 
@@ -383,10 +383,10 @@ async def test_SCS_2(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"[{task_id}] 所有 1 次尝试都失败")
                             raise Exception(f"图片定位失败：无法找到图片 Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png")
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -394,7 +394,7 @@ async def test_SCS_2(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("over_test_test_SCS_2","test_step_3")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -457,7 +457,7 @@ async def test_SCS_3(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 点击开始按钮 - click 操作 (//*[@type='button' and text()='START'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -469,7 +469,7 @@ async def test_SCS_3(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@type='button' and text()='START']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@type='button' and text()='START']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -480,7 +480,7 @@ async def test_SCS_3(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤1: 点击开始按钮 - 步骤后截图"):
@@ -506,7 +506,7 @@ async def test_SCS_3(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 点击同意按钮 - click 操作 (//*[text()='Accept'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -518,7 +518,7 @@ async def test_SCS_3(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[text()='Accept']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[text()='Accept']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -529,7 +529,7 @@ async def test_SCS_3(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 点击同意按钮 - 步骤后截图"):
@@ -547,7 +547,7 @@ async def test_SCS_3(browser_args):
                 # 页面滚动子步骤
                 with allure.step("测试步骤3: 点击图片，进入游戏 - 页面滚动准备"):
                     # 需要等待1S后再操作滚动
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 游戏操作前先滚动页面确保图片可见
                     # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
                     # 请根据实际的页面滚动进行调整到图片可见
@@ -563,7 +563,7 @@ async def test_SCS_3(browser_args):
                             raise Exception("BROWSER_CLOSED_BY_USER")
                         
                         try:
-                            time.sleep(3)
+                            await asyncio.sleep(3)
                             success = await ui_operations.click_image_with_fallback(
                                 "Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png", 
                                 confidence=0.5, 
@@ -582,10 +582,10 @@ async def test_SCS_3(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"[{task_id}] 所有 1 次尝试都失败")
                             raise Exception(f"图片定位失败：无法找到图片 Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png")
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -593,7 +593,7 @@ async def test_SCS_3(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("over_test_test_SCS_3","test_step_3")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -656,7 +656,7 @@ async def test_SCS_4(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 点击开始按钮 - click 操作 (//*[@type='button' and text()='START'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -668,7 +668,7 @@ async def test_SCS_4(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@type='button' and text()='START']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@type='button' and text()='START']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -679,7 +679,7 @@ async def test_SCS_4(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤1: 点击开始按钮 - 步骤后截图"):
@@ -705,7 +705,7 @@ async def test_SCS_4(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 点击同意按钮 - click 操作 (//*[text()='Accept'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -717,7 +717,7 @@ async def test_SCS_4(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[text()='Accept']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[text()='Accept']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -728,7 +728,7 @@ async def test_SCS_4(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 点击同意按钮 - 步骤后截图"):
@@ -746,7 +746,7 @@ async def test_SCS_4(browser_args):
                 # 页面滚动子步骤
                 with allure.step("测试步骤3: 点击图片，进入游戏 - 页面滚动准备"):
                     # 需要等待1S后再操作滚动
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 游戏操作前先滚动页面确保图片可见
                     # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
                     # 请根据实际的页面滚动进行调整到图片可见
@@ -762,7 +762,7 @@ async def test_SCS_4(browser_args):
                             raise Exception("BROWSER_CLOSED_BY_USER")
                         
                         try:
-                            time.sleep(3)
+                            await asyncio.sleep(3)
                             success = await ui_operations.click_image_with_fallback(
                                 "Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png", 
                                 confidence=0.5, 
@@ -781,10 +781,10 @@ async def test_SCS_4(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"[{task_id}] 所有 1 次尝试都失败")
                             raise Exception(f"图片定位失败：无法找到图片 Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png")
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -792,7 +792,7 @@ async def test_SCS_4(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("over_test_test_SCS_4","test_step_3")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -855,7 +855,7 @@ async def test_SCS_5(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 点击开始按钮 - click 操作 (//*[@type='button' and text()='START'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -867,7 +867,7 @@ async def test_SCS_5(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@type='button' and text()='START']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@type='button' and text()='START']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -878,7 +878,7 @@ async def test_SCS_5(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤1: 点击开始按钮 - 步骤后截图"):
@@ -904,7 +904,7 @@ async def test_SCS_5(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 点击同意按钮 - click 操作 (//*[text()='Accept'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -916,7 +916,7 @@ async def test_SCS_5(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[text()='Accept']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[text()='Accept']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -927,7 +927,7 @@ async def test_SCS_5(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 点击同意按钮 - 步骤后截图"):
@@ -945,7 +945,7 @@ async def test_SCS_5(browser_args):
                 # 页面滚动子步骤
                 with allure.step("测试步骤3: 点击图片，进入游戏 - 页面滚动准备"):
                     # 需要等待1S后再操作滚动
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 游戏操作前先滚动页面确保图片可见
                     # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
                     # 请根据实际的页面滚动进行调整到图片可见
@@ -961,7 +961,7 @@ async def test_SCS_5(browser_args):
                             raise Exception("BROWSER_CLOSED_BY_USER")
                         
                         try:
-                            time.sleep(3)
+                            await asyncio.sleep(3)
                             success = await ui_operations.click_image_with_fallback(
                                 "Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png", 
                                 confidence=0.5, 
@@ -980,10 +980,10 @@ async def test_SCS_5(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"[{task_id}] 所有 1 次尝试都失败")
                             raise Exception(f"图片定位失败：无法找到图片 Game_Img/1758183024_Snipaste_2025-09-01_16-31-13.png")
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -991,7 +991,7 @@ async def test_SCS_5(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("over_test_test_SCS_5","test_step_3")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
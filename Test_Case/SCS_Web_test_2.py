@@ -59,7 +59,7 @@ async def test_SCS(browser_args):
                     await ui_operations.elem_assert_exists("//*[@type='button' and text()='START']")
 
                 with allure.step("测试步骤1: 点击开始按钮 - click 操作 (//*[@type='button' and text()='START'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     
                 # 执行Web元素操作 1 次
                 for attempt in range(1):
@@ -73,7 +73,7 @@ async def test_SCS(browser_args):
                             log_info(f"执行第{attempt + 1}次操作: click on //*[@type='button' and text()='START']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@type='button' and text()='START']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -84,7 +84,7 @@ async def test_SCS(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤1: 步骤后截图"):
@@ -104,7 +104,7 @@ async def test_SCS(browser_args):
                     await ui_operations.elem_assert_visible("//*[text()='Accept']")
 
                 with allure.step("测试步骤2: 点击同意按钮 - click 操作 (//*[text()='Accept'])"):
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     
                 # 执行Web元素操作 1 次
                 for attempt in range(1):
@@ -118,7 +118,7 @@ async def test_SCS(browser_args):
                             log_info(f"执行第{attempt + 1}次操作: click on //*[text()='Accept']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[text()='Accept']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -129,7 +129,7 @@ async def test_SCS(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 步骤后截图"):
@@ -142,7 +142,7 @@ async def test_SCS(browser_args):
                 # 页面滚动子步骤
                 with allure.step(f"测试步骤3: 点击图片，进入游戏 - 页面滚动准备"):
                     # 需要等待1S后再操作滚动
-                    time.sleep(1)
+                    await asyncio.sleep(1)
                     # 游戏操作前先滚动页面确保图片可见
                     # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
                     # 请根据实际的页面滚动进行调整到图片可见
@@ -159,7 +159,7 @@ async def test_SCS(browser_args):
                         
                         try:
                             log_info(f"[test_SCS] 执行第{attempt + 1}次图片操作: click on Game_Img/1758183263_Snipaste_2025-09-01_15-59-25.png")
-                            time.sleep(3)
+                            await asyncio.sleep(3)
                             success = await ui_operations.click_image_with_fallback(
                                 "Game_Img/1758183263_Snipaste_2025-09-01_15-59-25.png", 
                                 confidence=0.5, 
@@ -177,10 +177,10 @@ async def test_SCS(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"[{task_id}] test_SCS 所有 1 次尝试都失败")
                             raise Exception(f"图片定位失败：无法找到图片 Game_Img/1758183263_Snipaste_2025-09-01_15-59-25.png")
-                        time.sleep(1)  # 每次操作后等待1秒
+                        await asyncio.sleep(1)  # 每次操作后等待1秒
             
             # 等待测试完成
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -188,7 +188,7 @@ async def test_SCS(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot(f"test_SCS","test_step_3")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
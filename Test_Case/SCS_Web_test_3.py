@@ -61,7 +61,7 @@ async def test_SCS_1(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤1: 公共断言URL是否存在"):
@@ -73,7 +73,7 @@ async def test_SCS_1(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 百度点击百度一下 - click 操作 (//*[@id='chat-submit-button'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -85,7 +85,7 @@ async def test_SCS_1(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='chat-submit-button']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='chat-submit-button']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -96,7 +96,7 @@ async def test_SCS_1(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
             
             # 测试步骤2: 学习网站点击博客园 (操作次数: 1)
@@ -112,7 +112,7 @@ async def test_SCS_1(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤2: 公共断言URL是否存在"):
@@ -124,7 +124,7 @@ async def test_SCS_1(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 学习网站点击博客园 - click 操作 (//*[@id='blog_nav_sitehome'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -136,7 +136,7 @@ async def test_SCS_1(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='blog_nav_sitehome']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='blog_nav_sitehome']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -147,7 +147,7 @@ async def test_SCS_1(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 学习网站点击博客园 - 步骤后截图"):
@@ -159,7 +159,7 @@ async def test_SCS_1(browser_args):
 
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -167,7 +167,7 @@ async def test_SCS_1(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("test_SCS_1","over_test_test_step_2")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -232,7 +232,7 @@ async def test_SCS_2(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤1: 公共断言URL是否存在"):
@@ -244,7 +244,7 @@ async def test_SCS_2(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 百度点击百度一下 - click 操作 (//*[@id='chat-submit-button'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -256,7 +256,7 @@ async def test_SCS_2(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='chat-submit-button']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='chat-submit-button']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -267,7 +267,7 @@ async def test_SCS_2(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
             
             # 测试步骤2: 学习网站点击博客园 (操作次数: 1)
@@ -283,7 +283,7 @@ async def test_SCS_2(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤2: 公共断言URL是否存在"):
@@ -295,7 +295,7 @@ async def test_SCS_2(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 学习网站点击博客园 - click 操作 (//*[@id='blog_nav_sitehome'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -307,7 +307,7 @@ async def test_SCS_2(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='blog_nav_sitehome']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='blog_nav_sitehome']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -318,7 +318,7 @@ async def test_SCS_2(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 学习网站点击博客园 - 步骤后截图"):
@@ -330,7 +330,7 @@ async def test_SCS_2(browser_args):
 
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -338,7 +338,7 @@ async def test_SCS_2(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("test_SCS_2","over_test_test_step_2")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -403,7 +403,7 @@ async def test_SCS_3(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤1: 公共断言URL是否存在"):
@@ -415,7 +415,7 @@ async def test_SCS_3(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 百度点击百度一下 - click 操作 (//*[@id='chat-submit-button'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -427,7 +427,7 @@ async def test_SCS_3(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='chat-submit-button']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='chat-submit-button']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -438,7 +438,7 @@ async def test_SCS_3(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
             
             # 测试步骤2: 学习网站点击博客园 (操作次数: 1)
@@ -454,7 +454,7 @@ async def test_SCS_3(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤2: 公共断言URL是否存在"):
@@ -466,7 +466,7 @@ async def test_SCS_3(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 学习网站点击博客园 - click 操作 (//*[@id='blog_nav_sitehome'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -478,7 +478,7 @@ async def test_SCS_3(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='blog_nav_sitehome']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='blog_nav_sitehome']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -489,7 +489,7 @@ async def test_SCS_3(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 学习网站点击博客园 - 步骤后截图"):
@@ -501,7 +501,7 @@ async def test_SCS_3(browser_args):
 
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -509,7 +509,7 @@ async def test_SCS_3(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("test_SCS_3","over_test_test_step_2")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -574,7 +574,7 @@ async def test_SCS_4(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤1: 公共断言URL是否存在"):
@@ -586,7 +586,7 @@ async def test_SCS_4(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 百度点击百度一下 - click 操作 (//*[@id='chat-submit-button'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -598,7 +598,7 @@ async def test_SCS_4(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='chat-submit-button']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='chat-submit-button']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -609,7 +609,7 @@ async def test_SCS_4(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
             
             # 测试步骤2: 学习网站点击博客园 (操作次数: 1)
@@ -625,7 +625,7 @@ async def test_SCS_4(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤2: 公共断言URL是否存在"):
@@ -637,7 +637,7 @@ async def test_SCS_4(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 学习网站点击博客园 - click 操作 (//*[@id='blog_nav_sitehome'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -649,7 +649,7 @@ async def test_SCS_4(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='blog_nav_sitehome']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='blog_nav_sitehome']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -660,7 +660,7 @@ async def test_SCS_4(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 学习网站点击博客园 - 步骤后截图"):
@@ -672,7 +672,7 @@ async def test_SCS_4(browser_args):
 
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -680,7 +680,7 @@ async def test_SCS_4(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("test_SCS_4","over_test_test_step_2")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
@@ -745,7 +745,7 @@ async def test_SCS_5(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤1: 公共断言URL是否存在"):
@@ -757,7 +757,7 @@ async def test_SCS_5(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤1: 百度点击百度一下 - click 操作 (//*[@id='chat-submit-button'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -769,7 +769,7 @@ async def test_SCS_5(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='chat-submit-button']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='chat-submit-button']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -780,7 +780,7 @@ async def test_SCS_5(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
             
             # 测试步骤2: 学习网站点击博客园 (操作次数: 1)
@@ -796,7 +796,7 @@ async def test_SCS_5(browser_args):
                     
                     # 获取所有标签页信息并确保切换到正确的标签页
                     all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
+                    await asyncio.sleep(1)  # 等待页面加载
                 
                 # URL断言子步骤
                 with allure.step("测试步骤2: 公共断言URL是否存在"):
@@ -808,7 +808,7 @@ async def test_SCS_5(browser_args):
 
                 # 操作执行子步骤
                 with allure.step("测试步骤2: 学习网站点击博客园 - click 操作 (//*[@id='blog_nav_sitehome'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     # 执行Web元素操作 1 次
                     for attempt in range(1):
                         # 检查浏览器是否已关闭
@@ -820,7 +820,7 @@ async def test_SCS_5(browser_args):
                             log_info(f"[{task_id}] 执行第{attempt + 1}次操作: click on //*[@id='blog_nav_sitehome']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='blog_nav_sitehome']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -831,7 +831,7 @@ async def test_SCS_5(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 学习网站点击博客园 - 步骤后截图"):
@@ -843,7 +843,7 @@ async def test_SCS_5(browser_args):
 
             
             # 等待测试完成
-            time.sleep(3)
+            await asyncio.sleep(3)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -851,7 +851,7 @@ async def test_SCS_5(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot("test_SCS_5","over_test_test_step_2")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
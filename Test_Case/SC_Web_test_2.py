@@ -64,14 +64,14 @@ async def test_SC(browser_args):
                 # 公共断言方法，断言URL是否存在
                 with allure.step("测试步骤1: 公共断言URL是否存在"):
                     await ui_operations.url_assert_exists("https://www.baidu.com/")
-                time.sleep(1)  # 等待页面加载
+                await asyncio.sleep(1)  # 等待页面加载
                 
                 # 公共断言方法，断言元素是否存在
                 with allure.step("测试步骤1: 公共断言元素是否存在"):
                     await ui_operations.elem_assert_exists("//*[@id='chat-submit-button']")
 
                 with allure.step("测试步骤1: 百度点击百度一下 - click 操作 (//*[@id='chat-submit-button'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     
                 # 执行Web元素操作 1 次
                 for attempt in range(1):
@@ -85,7 +85,7 @@ async def test_SC(browser_args):
                             log_info(f"执行第{attempt + 1}次操作: click on //*[@id='chat-submit-button']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='chat-submit-button']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -96,7 +96,7 @@ async def test_SC(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
             
             # 测试步骤2: 学习网站点击博客园 (操作次数: 1)
@@ -113,14 +113,14 @@ async def test_SC(browser_args):
                 # 公共断言方法，断言URL是否存在
                 with allure.step("测试步骤2: 公共断言URL是否存在"):
                     await ui_operations.url_assert_exists("https://www.cnblogs.com/yoyoketang/p/17197319.html")
-                time.sleep(1)  # 等待页面加载
+                await asyncio.sleep(1)  # 等待页面加载
                 
                 # 公共断言方法，断言元素是否存在
                 with allure.step("测试步骤2: 公共断言元素是否存在"):
                     await ui_operations.elem_assert_exists("//*[@id='blog_nav_sitehome']")
 
                 with allure.step("测试步骤2: 学习网站点击博客园 - click 操作 (//*[@id='blog_nav_sitehome'])"):
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     
                 # 执行Web元素操作 1 次
                 for attempt in range(1):
@@ -134,7 +134,7 @@ async def test_SC(browser_args):
                             log_info(f"执行第{attempt + 1}次操作: click on //*[@id='blog_nav_sitehome']")
                             # 使用安全操作机制，带重试
                             await ui_operations.elem_click("//*[@id='blog_nav_sitehome']")
-                            time.sleep(1)  # 每次操作后等待1秒
+                            await asyncio.sleep(1)  # 每次操作后等待1秒
                         except Exception as e:
                             # 检查是否是浏览器关闭导致的异常
                             error_msg = str(e).lower()
@@ -145,14 +145,14 @@ async def test_SC(browser_args):
                             if attempt == 1 - 1:  # 最后一次尝试失败
                                 log_info(f"所有操作均失败！")
                                 
-                time.sleep(1)  # 每次操作后等待1秒
+                await asyncio.sleep(1)  # 每次操作后等待1秒
 
                 # 步骤后截图
                 with allure.step("测试步骤2: 步骤后截图"):
                     await ui_operations.page_screenshot(f"test_SC","test_step_2_after")
 
             # 等待测试完成
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 最终检查浏览器状态
             if await ui_operations.is_browser_closed():
@@ -160,7 +160,7 @@ async def test_SC(browser_args):
                 raise Exception("BROWSER_CLOSED_BY_USER")
             
             await ui_operations.page_screenshot(f"test_SC","test_step_2")
-            time.sleep(2)
+            await asyncio.sleep(2)
             
             # 输出图片识别统计信息
             stats = ui_operations.get_image_stats()
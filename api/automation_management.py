@@ -4,6 +4,7 @@ import json
 import os
 import time
 import subprocess
+import tempfile
 import threading
 from datetime import datetime
 from config.database import execute_insert_query, get_db_connection_with_retry
@@ -16,6 +17,9 @@ from flask import current_app
 from werkzeug.utils import secure_filename
 from config.logger import log_error, log_info
 from utils.image_upload_manager import image_upload_manager
+from utils.test_code_generator import test_code_generator
+from utils.test_file_validator import test_file_validator
+from utils.concurrent_runner import concurrent_runner
 
 automation_bp = Blueprint('automation', __name__)
 
@@ -393,13 +397,149 @@ def update_execution_detailed_log(execution_id: int, detailed_log: str):
         log_info(f"更新详细日志失败: {e}")
         return False
 
+def update_execution_address_results(execution_id: int, project_id: int, results: list):
+    """记录每个产品地址（测试函数）的执行结果，供重跑失败地址使用"""
+    try:
+        # 生成的测试文件只回传函数名，按项目当前的地址配置补全地址
+        if any('address' not in r for r in results):
+            with get_db_connection_with_retry() as conn:
+                query = adapt_query_placeholders('SELECT product_ids, product_address FROM automation_projects WHERE id=?')
+                project_results = execute_query_with_results(conn, query, (project_id,))
+            if project_results:
+                product_ids, product_address = project_results[0]
+                data = {
+                    'product_ids': json.loads(product_ids) if isinstance(product_ids, str) else product_ids,
+                    'product_address': product_address
+                }
+                functions = test_code_generator.build_functions(resolve_test_product_addresses(data))
+                addresses = {fn['name']: fn['address'] for fn in functions}
+                results = [dict(r, address=r.get('address', addresses.get(r['function'], ''))) for r in results]
+        
+        with get_db_connection_with_retry() as conn:
+            query = adapt_query_placeholders('UPDATE automation_executions SET address_results = ? WHERE id = ?')
+            execute_insert_query(conn, query, (json.dumps(results, ensure_ascii=False), execution_id))
+        return True
+        
+    except Exception as e:
+        log_info(f"更新地址执行结果失败: {e}")
+        return False
+
 def allowed_file(filename):
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# 项目列表允许的排序字段（白名单，防止SQL注入）
+PROJECT_SORT_FIELDS = {
+    'updated_at': 'ap.updated_at',
+    'created_at': 'ap.created_at',
+    'process_name': 'ap.process_name',
+    'status': 'ap.status',
+    'id': 'ap.id',
+    'last_start_time': 'last_start_time',
+}
+
+def build_project_filters(args):
+    """
+    根据请求参数构建项目列表的过滤条件
+    
+    支持的参数:
+        search: 按流程名称或产品ID模糊搜索
+        status / system / environment / created_by: 精确过滤
+    
+    Returns:
+        (where子句, 参数列表) 的元组
+    """
+    conditions = []
+    params = []
+    
+    search = (args.get('search') or '').strip()
+    if search:
+        like_value = f"%{search}%"
+        conditions.append('(ap.process_name LIKE ? OR ap.product_ids LIKE ?)')
+        params.extend([like_value, like_value])
+    
+    filter_columns = {
+        'status': 'ap.status',
+        'system': 'ap.`system`',
+        'environment': 'ap.environment',
+        'created_by': 'ap.created_by',
+    }
+    for param_name, column in filter_columns.items():
+        value = (args.get(param_name) or '').strip()
+        if value:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return where_clause, params
+
+def build_project_order(args):
+    """根据请求参数构建排序子句，默认按更新时间倒序"""
+    sort_field = PROJECT_SORT_FIELDS.get(args.get('sort', 'updated_at'), 'ap.updated_at')
+    sort_order = 'ASC' if (args.get('order') or '').lower() == 'asc' else 'DESC'
+    # 追加id作为次级排序，保证分页结果稳定
+    return f'ORDER BY {sort_field} {sort_order}, ap.id {sort_order}'
+
+def is_summary_projection(args):
+    """判断是否使用摘要投影（列表视图默认只返回摘要字段）"""
+    return (args.get('fields') or 'summary').lower() != 'full'
+
+def build_step_count_expression():
+    """测试步骤数量的SQL表达式（test_steps为JSON数组文本，无法解析时按0计）"""
+    if get_current_db_config()['type'] == 'mysql':
+        return 'CASE WHEN JSON_VALID(ap.test_steps) THEN JSON_LENGTH(ap.test_steps) ELSE 0 END'
+    return 'CASE WHEN json_valid(ap.test_steps) THEN json_array_length(ap.test_steps) ELSE 0 END'
+
+def build_project_list_columns(summary=True):
+    """
+    构建项目列表查询的字段列表
+    
+    摘要模式下不查询test_steps和product_address这类大字段，只在数据库中计算步骤数量，
+    完整数据通过 GET /projects/<id> 获取
+    """
+    detail_columns = '' if summary else 'ap.product_address, ap.test_steps,'
+    return f'''
+        ap.id, ap.project_id, ap.process_name, ap.product_ids, ap.`system`, ap.product_type,
+        ap.environment, ap.status, ap.created_by, ap.created_at, ap.updated_at,
+        ap.product_package_names, {detail_columns}
+        COUNT(ae.id) as execution_count,
+        MAX(ae.start_time) as last_start_time,
+        (SELECT status FROM automation_executions 
+         WHERE project_id = ap.id 
+         ORDER BY start_time DESC LIMIT 1) as last_status,
+        {build_step_count_expression()} as step_count
+    '''
+
+def project_list_row_to_dict(row, summary=True):
+    """将项目列表查询结果行转换为字典（字段顺序与build_project_list_columns一致）"""
+    project = {
+        'id': row[0],
+        'project_id': row[1],
+        'process_name': row[2],
+        'product_ids': json.loads(row[3]) if row[3] else [],
+        'system': row[4],
+        'product_type': row[5],
+        'environment': row[6],
+        'status': row[7],
+        'created_by': row[8],
+        'created_at': row[9],
+        'updated_at': row[10],
+        'product_package_names': json.loads(row[11]) if row[11] else [],
+    }
+    index = 12
+    if not summary:
+        project['product_address'] = row[12]
+        project['test_steps'] = json.loads(row[13]) if row[13] else []
+        index = 14
+    project['execution_count'] = row[index]
+    project['last_start_time'] = row[index + 1]
+    project['last_status'] = row[index + 2]
+    project['step_count'] = row[index + 3] or 0
+    return project
+
 @automation_bp.route('/projects', methods=['GET'])
 def get_automation_projects():
-    """获取自动化项目列表"""
+    """获取自动化项目列表（支持搜索、过滤和排序）"""
     try:
         # 获取分页参数
         page = request.args.get('page', 1, type=int)
@@ -417,55 +557,33 @@ def get_automation_projects():
         for project_id in list(running_tests.keys()):
             check_process_status(project_id)
         
+        # 构建过滤和排序条件
+        where_clause, filter_params = build_project_filters(request.args)
+        order_clause = build_project_order(request.args)
+        
         with get_db_connection_with_retry() as conn:
-            # 首先获取总数
-            total_count = execute_single_result(conn, 'SELECT COUNT(*) FROM automation_projects')[0]
+            # 首先获取总数（应用相同的过滤条件）
+            count_query = adapt_query_placeholders(f'SELECT COUNT(*) FROM automation_projects ap {where_clause}')
+            total_count = execute_single_result(conn, count_query, tuple(filter_params))[0]
             
             # 计算分页信息
             total_pages = (total_count + page_size - 1) // page_size
             offset = (page - 1) * page_size
             
             # 获取分页数据 - 简化查询以避免MySQL复杂性
-            query = adapt_query_placeholders('''
-                SELECT ap.id, ap.project_id, ap.process_name, ap.product_ids, ap.`system`, ap.product_type,
-                       ap.environment, ap.product_address, ap.test_steps, ap.status,
-                       ap.created_by, ap.created_at, ap.updated_at,
-                       ap.product_package_names,
-                       COUNT(ae.id) as execution_count,
-                       MAX(ae.start_time) as last_start_time,
-                       (SELECT status FROM automation_executions 
-                        WHERE project_id = ap.id 
-                        ORDER BY start_time DESC LIMIT 1) as last_status
+            summary = is_summary_projection(request.args)
+            query = adapt_query_placeholders(f'''
+                SELECT {build_project_list_columns(summary)}
                 FROM automation_projects ap
                 LEFT JOIN automation_executions ae ON ap.id = ae.project_id
+                {where_clause}
                 GROUP BY ap.id
-                ORDER BY ap.updated_at DESC
+                {order_clause}
                 LIMIT ? OFFSET ?
             ''')
-            results = execute_query_with_results(conn, query, (page_size, offset))
+            results = execute_query_with_results(conn, query, tuple(filter_params) + (page_size, offset))
             
-            projects = []
-            for row in results:
-                project = {
-                    'id': row[0],
-                    'project_id': row[1],
-                    'process_name': row[2],
-                    'product_ids': json.loads(row[3]) if row[3] else [],
-                    'system': row[4],
-                    'product_type': row[5],
-                    'environment': row[6],
-                    'product_address': row[7],
-                    'test_steps': json.loads(row[8]) if row[8] else [],
-                    'status': row[9],
-                    'created_by': row[10],
-                    'created_at': row[11],
-                    'updated_at': row[12],
-                    'product_package_names': json.loads(row[13]) if row[13] else [],
-                    'execution_count': row[14],
-                    'last_start_time': row[15],
-                    'last_status': row[16]
-                }
-                projects.append(project)
+            projects = [project_list_row_to_dict(row, summary) for row in results]
         
         return jsonify({
             'success': True,
@@ -710,6 +828,99 @@ def create_automation_project():
             'message': f'创建自动化项目失败: {str(e)}'
         }), 500
 
+# 批量获取项目时单次请求允许的最大ID数量
+BULK_PROJECT_MAX_IDS = 100
+
+@automation_bp.route('/projects/bulk', methods=['GET'])
+def get_automation_projects_bulk():
+    """批量获取自动化项目及其最近一次执行记录（ids=1,2,3）"""
+    try:
+        ids_param = request.args.get('ids', '')
+        try:
+            project_ids = list(dict.fromkeys(int(pid) for pid in ids_param.split(',') if pid.strip()))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'ids参数格式错误，应为逗号分隔的整数'
+            }), 400
+        
+        if not project_ids:
+            return jsonify({
+                'success': False,
+                'message': '缺少ids参数'
+            }), 400
+        
+        if len(project_ids) > BULK_PROJECT_MAX_IDS:
+            return jsonify({
+                'success': False,
+                'message': f'单次最多获取 {BULK_PROJECT_MAX_IDS} 个项目'
+            }), 400
+        
+        summary = is_summary_projection(request.args)
+        placeholders = ', '.join(['?'] * len(project_ids))
+        
+        with get_db_connection_with_retry() as conn:
+            # 批量获取项目信息
+            projects_query = adapt_query_placeholders(f'''
+                SELECT {build_project_list_columns(summary)}
+                FROM automation_projects ap
+                LEFT JOIN automation_executions ae ON ap.id = ae.project_id
+                WHERE ap.id IN ({placeholders})
+                GROUP BY ap.id
+            ''')
+            project_rows = execute_query_with_results(conn, projects_query, tuple(project_ids))
+            
+            # 批量获取每个项目的最近一次执行记录
+            executions_query = adapt_query_placeholders(f'''
+                SELECT ae.id, ae.project_id, ae.status, ae.start_time, ae.end_time,
+                       ae.log_message, ae.executed_by, ae.cancel_type
+                FROM automation_executions ae
+                WHERE ae.id IN (
+                    SELECT MAX(id) FROM automation_executions
+                    WHERE project_id IN ({placeholders})
+                    GROUP BY project_id
+                )
+            ''')
+            execution_rows = execute_query_with_results(conn, executions_query, tuple(project_ids))
+        
+        latest_executions = {}
+        for row in execution_rows:
+            latest_executions[row[1]] = {
+                'id': row[0],
+                'project_id': row[1],
+                'status': row[2],
+                'start_time': row[3],
+                'end_time': row[4],
+                'log_message': row[5],
+                'executed_by': row[6],
+                'cancel_type': row[7]
+            }
+        
+        projects_by_id = {}
+        for row in project_rows:
+            project = project_list_row_to_dict(row, summary)
+            project['latest_execution'] = latest_executions.get(project['id'])
+            projects_by_id[project['id']] = project
+        
+        # 按请求顺序返回，并标记不存在的项目
+        projects = [projects_by_id[pid] for pid in project_ids if pid in projects_by_id]
+        missing_ids = [pid for pid in project_ids if pid not in projects_by_id]
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'projects': projects,
+                'missing_ids': missing_ids
+            }
+        })
+        
+    except Exception as e:
+        log_info(f"批量获取自动化项目失败: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'批量获取自动化项目失败: {str(e)}'
+        }), 500
+
 @automation_bp.route('/projects/<int:project_id>', methods=['GET'])
 def get_automation_project(project_id):
     """获取单个自动化项目详情"""
@@ -723,7 +934,8 @@ def get_automation_project(project_id):
                        MAX(ae.start_time) as last_start_time,
                        (SELECT status FROM automation_executions 
                         WHERE project_id = ap.id 
-                        ORDER BY start_time DESC LIMIT 1) as last_status
+                        ORDER BY start_time DESC LIMIT 1) as last_status,
+                       ap.product_package_names
                 FROM automation_projects ap
                 LEFT JOIN automation_executions ae ON ap.id = ae.project_id
                 WHERE ap.id = ?
@@ -754,7 +966,8 @@ def get_automation_project(project_id):
                 'updated_at': row[12],
                 'execution_count': row[13] or 0,
                 'last_start_time': row[14],
-                'last_status': row[15] or 'pending'
+                'last_status': row[15] or 'pending',
+                'product_package_names': json.loads(row[16]) if row[16] else []
             }
             
             return jsonify({
@@ -939,6 +1152,59 @@ def update_automation_project(project_id):
             'message': f'更新自动化项目失败: {str(e)}'
         }), 500
 
+# 测试执行模式
+EXECUTION_MODES = ('file', 'interpreter')
+DEFAULT_EXECUTION_MODE = 'file'
+
+def get_test_file_compile_error(project_id):
+    """检查项目已有的测试文件能否编译，返回编译错误（无文件或可编译时返回None）"""
+    from utils.file_manager import file_manager
+    file_mapping = file_manager.get_project_file_mapping(project_id)
+    if file_mapping and os.path.exists(file_mapping['file_path']):
+        analysis = analyze_test_file(file_mapping['file_path'])
+        if not analysis['valid']:
+            return analysis['error']
+    return None
+
+def get_request_fail_fast(request_data):
+    """读取请求中的失败即停开关，未传入、null 或空字符串时使用默认策略（关闭）"""
+    fail_fast = concurrent_runner.parse_flag(request_data.get('fail_fast'))
+    return concurrent_runner.default_fail_fast if fail_fast is None else fail_fast
+
+def start_test_execution(project_id, mode, fail_fast, only_functions=None, log_message='测试开始执行'):
+    """创建执行记录并在后台线程中执行测试，返回执行记录ID
+    only_functions 不为空时只执行其中的测试函数（用于重跑失败的产品地址）
+    """
+    # 更新项目状态为运行中
+    with get_db_connection_with_retry() as conn:
+        update_query = adapt_query_placeholders('UPDATE automation_projects SET status=? WHERE id=?')
+        execute_insert_query(conn, update_query, ('running', project_id))
+    
+    # 记录测试开始的执行记录
+    start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    current_user = get_current_user()
+    execution_id = create_execution_record(project_id, 'running', 
+                                         executed_by=current_user,
+                                         log_message=log_message, start_time=start_time)
+    
+    # 设置当前执行ID，用于实时日志记录
+    from config.logger import set_current_execution_id
+    set_current_execution_id(execution_id)
+    
+    # 在后台执行测试
+    running_tests[project_id] = {
+        'start_time': datetime.now(),
+        'execution_id': execution_id,
+        'mode': mode,
+        'fail_fast': fail_fast,
+        'only_functions': only_functions
+    }
+    thread = threading.Thread(target=run_test_in_background, args=(project_id, start_time, execution_id, current_user, mode))
+    thread.daemon = True
+    running_tests[project_id]['thread'] = thread
+    thread.start()
+    return execution_id
+
 @automation_bp.route('/projects/<int:project_id>/execute', methods=['POST'])
 def execute_test(project_id):
     """执行测试"""
@@ -950,6 +1216,18 @@ def execute_test(project_id):
                 'message': '该项目测试正在运行中'
             }), 400
         
+        # 执行模式：file 生成测试文件并用pytest执行，interpreter 直接解释执行测试步骤
+        request_data = request.get_json(silent=True) or {}
+        mode = request_data.get('mode') or request.args.get('mode') or DEFAULT_EXECUTION_MODE
+        if mode not in EXECUTION_MODES:
+            return jsonify({
+                'success': False,
+                'message': f'不支持的执行模式: {mode}'
+            }), 400
+        
+        # 失败即停：任一产品地址失败时立即取消其余地址，默认关闭，请求中传入 fail_fast 时开启
+        fail_fast = get_request_fail_fast(request_data)
+        
         # 获取项目信息
         with get_db_connection_with_retry() as conn:
             query = adapt_query_placeholders('SELECT id FROM automation_projects WHERE id=?')
@@ -960,37 +1238,27 @@ def execute_test(project_id):
                     'success': False,
                     'message': '项目不存在'
                 }), 404
-            
-            # 更新项目状态为运行中
-            update_query = adapt_query_placeholders('UPDATE automation_projects SET status=? WHERE id=?')
-            execute_insert_query(conn, update_query, ('running', project_id))
-        
-        # 记录测试开始的执行记录
-        start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        current_user = get_current_user()
-        execution_id = create_execution_record(project_id, 'running', 
-                                             executed_by=current_user,
-                                             log_message='测试开始执行', start_time=start_time)
-        
-        # 设置当前执行ID，用于实时日志记录
-        from config.logger import set_current_execution_id
-        set_current_execution_id(execution_id)
-        
-        # 在后台执行测试
-        thread = threading.Thread(target=run_test_in_background, args=(project_id, start_time, execution_id, current_user))
-        thread.daemon = True
-        thread.start()
-        
-        running_tests[project_id] = {
-            'thread': thread,
-            'start_time': datetime.now(),
-            'execution_id': execution_id
-        }
+        
+        # 文件模式下，已有的测试文件无法编译时不进入执行队列
+        if mode == 'file':
+            compile_error = get_test_file_compile_error(project_id)
+            if compile_error:
+                return jsonify({
+                    'success': False,
+                    'message': f"测试文件无法编译: {test_file_validator.format_error(compile_error)}",
+                    'data': {
+                        'compile_error': compile_error
+                    }
+                }), 400
+        
+        execution_id = start_test_execution(project_id, mode, fail_fast)
         
         return jsonify({
             'success': True,
             'message': '测试已开始执行',
-            'execution_id': execution_id
+            'execution_id': execution_id,
+            'mode': mode,
+            'fail_fast': fail_fast
         })
         
     except Exception as e:
@@ -1391,7 +1659,8 @@ def get_execution_detail(execution_id):
         with get_db_connection_with_retry() as conn:
             query = adapt_query_placeholders('''
                 SELECT id, project_id, process_name, product_ids, `system`, product_type, 
-                       environment, product_address, status, start_time, end_time, log_message, detailed_log, executed_by, cancel_type 
+                       environment, product_address, status, start_time, end_time, log_message, detailed_log, executed_by, cancel_type,
+                       address_results 
                 FROM automation_executions 
                 WHERE id = ?
             ''')
@@ -1419,7 +1688,8 @@ def get_execution_detail(execution_id):
                 'log_message': row[11],
                 'detailed_log': row[12],
                 'executed_by': row[13],
-                'cancel_type': row[14]
+                'cancel_type': row[14],
+                'address_results': json.loads(row[15]) if row[15] else []
             }
             
             return jsonify({
@@ -1434,6 +1704,115 @@ def get_execution_detail(execution_id):
             'message': f'获取执行记录详情失败: {str(e)}'
         }), 500
 
+@automation_bp.route('/executions/<int:execution_id>/rerun-failed', methods=['POST'])
+def rerun_failed_addresses(execution_id):
+    """只重跑某次执行中失败（或因失败即停被取消）的产品地址"""
+    try:
+        with get_db_connection_with_retry() as conn:
+            query = adapt_query_placeholders('SELECT project_id, address_results FROM automation_executions WHERE id = ?')
+            execution_results = execute_query_with_results(conn, query, (execution_id,))
+        
+        if not execution_results:
+            return jsonify({
+                'success': False,
+                'message': '执行记录不存在'
+            }), 404
+        
+        project_id, address_results = execution_results[0]
+        if not address_results:
+            return jsonify({
+                'success': False,
+                'message': '该执行记录没有记录各产品地址的执行结果，无法重跑失败地址'
+            }), 400
+        
+        failed_results = [r for r in json.loads(address_results) if not r.get('success')]
+        if not failed_results:
+            return jsonify({
+                'success': False,
+                'message': '该执行记录没有失败的产品地址'
+            }), 400
+        
+        if project_id in running_tests:
+            return jsonify({
+                'success': False,
+                'message': '该项目测试正在运行中'
+            }), 400
+        
+        request_data = request.get_json(silent=True) or {}
+        mode = request_data.get('mode') or request.args.get('mode') or DEFAULT_EXECUTION_MODE
+        if mode not in EXECUTION_MODES:
+            return jsonify({
+                'success': False,
+                'message': f'不支持的执行模式: {mode}'
+            }), 400
+        
+        fail_fast = get_request_fail_fast(request_data)
+        
+        # 函数名由地址在列表中的位置决定，地址配置变化后同名函数可能对应其他地址，
+        # 因此按记录的地址匹配项目当前配置下的测试函数
+        with get_db_connection_with_retry() as conn:
+            query = adapt_query_placeholders('SELECT product_ids, product_address FROM automation_projects WHERE id=?')
+            project_results = execute_query_with_results(conn, query, (project_id,))
+        if not project_results:
+            return jsonify({
+                'success': False,
+                'message': '项目不存在'
+            }), 404
+        product_ids, product_address = project_results[0]
+        data = {
+            'product_ids': json.loads(product_ids) if isinstance(product_ids, str) else product_ids,
+            'product_address': product_address
+        }
+        failed_addresses = {r.get('address', '') for r in failed_results}
+        rerun_functions = [fn for fn in test_code_generator.build_functions(resolve_test_product_addresses(data))
+                           if fn['address'] in failed_addresses]
+        if not rerun_functions:
+            return jsonify({
+                'success': False,
+                'message': '失败的产品地址已不在项目当前的地址配置中，无法重跑'
+            }), 400
+        unmatched = failed_addresses - {fn['address'] for fn in rerun_functions}
+        if unmatched:
+            log_info(f"以下失败地址已不在项目当前的地址配置中，跳过: {', '.join(sorted(unmatched))}")
+        
+        if mode == 'file':
+            compile_error = get_test_file_compile_error(project_id)
+            if compile_error:
+                return jsonify({
+                    'success': False,
+                    'message': f"测试文件无法编译: {test_file_validator.format_error(compile_error)}",
+                    'data': {
+                        'compile_error': compile_error
+                    }
+                }), 400
+        
+        only_functions = [fn['name'] for fn in rerun_functions]
+        log_info(f"重跑执行记录 {execution_id} 中失败的产品地址: {', '.join(only_functions)}")
+        new_execution_id = start_test_execution(
+            project_id, mode, fail_fast, only_functions=only_functions,
+            log_message=f'重跑执行记录 {execution_id} 中失败的 {len(only_functions)} 个产品地址'
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': f'已开始重跑 {len(only_functions)} 个失败的产品地址',
+            'execution_id': new_execution_id,
+            'mode': mode,
+            'fail_fast': fail_fast,
+            'functions': [
+                {'function': fn['name'], 'address': fn['address']}
+                for fn in rerun_functions
+            ],
+            'skipped_addresses': sorted(unmatched)
+        })
+        
+    except Exception as e:
+        log_info(f"重跑失败地址失败: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'重跑失败地址失败: {str(e)}'
+        }), 500
+
 @automation_bp.route('/projects/<int:project_id>/stop', methods=['POST'])
 def stop_project(project_id):
     """停止项目执行"""
@@ -1528,1593 +1907,263 @@ def upload_test_image():
             'message': f'上传图片失败: {str(e)}'
         }), 500
 
-def generate_test_code(automation_id, data):
-    """生成测试代码文件"""
-    try:
-        # 使用文件管理器获取正确的文件名
-        from utils.file_manager import file_manager
-        
-        # 获取项目的文件映射信息
-        file_mapping = file_manager.get_project_file_mapping(automation_id)
-        
-        if file_mapping:
-            # 使用映射中的文件名
-            filename = file_mapping['file_name']
-            product_ids = data['product_ids']
-            
-            if len(product_ids) == 1:
-                # 单产品ID场景：支持一个产品对应多个地址 → 生成多个方法
-                product_id = product_ids[0]
-                addresses = []
-                raw_addr = data.get('product_address')
-                if raw_addr:
-                    try:
-                        parsed = json.loads(raw_addr)
-                        if isinstance(parsed, dict):
-                            # 先按 product_id、product_id_n 顺序收集
-                            indexed = []
-                            for key, value in parsed.items():
-                                if key == product_id:
-                                    indexed.append((0, value))
-                                elif key.startswith(f"{product_id}_"):
-                                    suffix = key[len(product_id) + 1:]
-                                    try:
-                                        num = int(suffix)
-                                    except Exception:
-                                        num = 0
-                                    indexed.append((num, value))
-                            if indexed:
-                                for _, value in sorted(indexed, key=lambda x: x[0]):
-                                    addresses.append(value)
-                            else:
-                                # 若没有匹配到以 product_id 开头的键，则退化为 values 顺序
-                                addresses.extend(list(parsed.values()))
-                        elif isinstance(parsed, list):
-                            addresses = list(parsed)
-                        else:
-                            addresses = [raw_addr]
-                    except (json.JSONDecodeError, TypeError):
-                        addresses = [raw_addr]
-                
-                # 若前端未提供，尝试从DB取并解析
-                if not addresses:
-                    with get_db_connection_with_retry() as conn:
-                        query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                        result = execute_query_with_results(conn, query, (product_id,))
-                        if result:
-                            db_raw = result[0][0]
-                            try:
-                                parsed = json.loads(db_raw)
-                                if isinstance(parsed, dict):
-                                    indexed = []
-                                    for key, value in parsed.items():
-                                        if key == product_id:
-                                            indexed.append((0, value))
-                                        elif key.startswith(f"{product_id}_"):
-                                            suffix = key[len(product_id) + 1:]
-                                            try:
-                                                num = int(suffix)
-                                            except Exception:
-                                                num = 0
-                                            indexed.append((num, value))
-                                    if indexed:
-                                        for _, value in sorted(indexed, key=lambda x: x[0]):
-                                            addresses.append(value)
-                                    else:
-                                        addresses.extend(list(parsed.values()))
-                                elif isinstance(parsed, list):
-                                    addresses = list(parsed)
-                                else:
-                                    addresses = [db_raw]
-                            except (json.JSONDecodeError, TypeError):
-                                addresses = [db_raw]
-                
-                if len(addresses) > 1:
-                    product_addresses = [(product_id, addr) for addr in addresses]
-                    generate_multi_product_test_file(filename, data, product_addresses)
-                else:
-                    # 保持单地址逻辑
-                    single_addr = addresses[0] if addresses else ''
-                    data_single = dict(data)
-                    data_single['product_address'] = single_addr
-                    generate_single_test_file(filename, data_single, product_id)
-            else:
-                # 多产品ID的情况，需要获取每个产品的地址（支持 PID、PID_1..PID_n 全量解析）
-                product_addresses = []
-                
-                # 从当前项目的product_address字段获取地址映射
-                if data.get('product_address'):
-                    try:
-                        address_map = json.loads(data['product_address'])
-                        if isinstance(address_map, dict):
-                            # 针对每个基础产品ID，收集同名与带序号的全部地址
-                            unique_bases = list(dict.fromkeys(product_ids))
-                            for base in unique_bases:
-                                indexed = []
-                                for key, value in address_map.items():
-                                    if key == base:
-                                        indexed.append((0, value))
-                                    elif key.startswith(f"{base}_"):
-                                        suffix = key[len(base) + 1:]
-                                        try:
-                                            num = int(suffix)
-                                        except Exception:
-                                            continue
-                                        indexed.append((num, value))
-                                for _, val in sorted(indexed, key=lambda x: x[0]):
-                                    product_addresses.append((base, val))
-                        elif isinstance(address_map, list):
-                            # 列表顺序分配，超出部分归到最后一个产品ID
-                            if product_ids:
-                                for idx, val in enumerate(address_map):
-                                    base = product_ids[min(idx, len(product_ids) - 1)]
-                                    product_addresses.append((base, val))
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                
-                # 如果没有从product_address字段获取到地址，尝试从projects表获取
-                if not product_addresses:
-                    with get_db_connection_with_retry() as conn:
-                        unique_bases = list(dict.fromkeys(product_ids))
-                        for base in unique_bases:
-                            query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                            result = execute_query_with_results(conn, query, (base,))
-                            
-                            if result:
-                                product_address = result[0][0]
-                                # 安全解析：支持JSON列表或字典，且收集全部序号
-                                try:
-                                    parsed = json.loads(product_address)
-                                    if isinstance(parsed, dict):
-                                        indexed = []
-                                        for key, value in parsed.items():
-                                            if key == base:
-                                                indexed.append((0, value))
-                                            elif key.startswith(f"{base}_"):
-                                                suffix = key[len(base) + 1:]
-                                                try:
-                                                    num = int(suffix)
-                                                except Exception:
-                                                    continue
-                                                indexed.append((num, value))
-                                        for _, val in sorted(indexed, key=lambda x: x[0]):
-                                            product_addresses.append((base, val))
-                                    elif isinstance(parsed, list):
-                                        for val in parsed:
-                                            product_addresses.append((base, val))
-                                    else:
-                                        product_addresses.append((base, product_address))
-                                except (json.JSONDecodeError, TypeError):
-                                    product_addresses.append((base, product_address))
-                            else:
-                                log_info(f"警告: 未找到产品 {base} 的地址信息")
+def collect_product_address_values(address_map, product_id):
+    """从地址字典中按 PID、PID_1..PID_n 的顺序收集指定产品的全部地址"""
+    indexed = []
+    for key, value in address_map.items():
+        if key == product_id:
+            indexed.append((0, value))
+        elif key.startswith(f"{product_id}_"):
+            try:
+                indexed.append((int(key[len(product_id) + 1:]), value))
+            except ValueError:
+                continue
+    return [value for _, value in sorted(indexed, key=lambda x: x[0])]
 
-                if product_addresses:
-                    generate_multi_product_test_file(filename, data, product_addresses)
-                else:
-                    # 如果没有找到产品地址，使用第一个产品ID生成代码
-                    generate_single_test_file(filename, data, product_ids[0])
-        else:
-            # 如果没有文件映射，使用旧的逻辑作为后备
-            product_ids = data['product_ids']
-            system = data['system']
-            
-            if len(product_ids) == 1:
-                # 单产品ID场景：也支持一个产品多个地址
-                clean_product_id = product_ids[0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                filename = generate_unique_filename(clean_product_id, system)
-                product_id = product_ids[0]
-                addresses = []
-                raw_addr = data.get('product_address')
-                if raw_addr:
-                    try:
-                        parsed = json.loads(raw_addr)
-                        if isinstance(parsed, dict):
-                            indexed = []
-                            for key, value in parsed.items():
-                                if key == product_id:
-                                    indexed.append((0, value))
-                                elif key.startswith(f"{product_id}_"):
-                                    suffix = key[len(product_id) + 1:]
-                                    try:
-                                        num = int(suffix)
-                                    except Exception:
-                                        num = 0
-                                    indexed.append((num, value))
-                            if indexed:
-                                for _, value in sorted(indexed, key=lambda x: x[0]):
-                                    addresses.append(value)
-                            else:
-                                addresses.extend(list(parsed.values()))
-                        elif isinstance(parsed, list):
-                            addresses = list(parsed)
-                        else:
-                            addresses = [raw_addr]
-                    except (json.JSONDecodeError, TypeError):
-                        addresses = [raw_addr]
-                
-                if not addresses:
-                    with get_db_connection_with_retry() as conn:
-                        query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                        result = execute_query_with_results(conn, query, (product_id,))
-                        if result:
-                            db_raw = result[0][0]
-                            try:
-                                parsed = json.loads(db_raw)
-                                if isinstance(parsed, dict):
-                                    indexed = []
-                                    for key, value in parsed.items():
-                                        if key == product_id:
-                                            indexed.append((0, value))
-                                        elif key.startswith(f"{product_id}_"):
-                                            suffix = key[len(product_id) + 1:]
-                                            try:
-                                                num = int(suffix)
-                                            except Exception:
-                                                num = 0
-                                            indexed.append((num, value))
-                                    if indexed:
-                                        for _, value in sorted(indexed, key=lambda x: x[0]):
-                                            addresses.append(value)
-                                    else:
-                                        addresses.extend(list(parsed.values()))
-                                elif isinstance(parsed, list):
-                                    addresses = list(parsed)
-                                else:
-                                    addresses = [db_raw]
-                            except (json.JSONDecodeError, TypeError):
-                                addresses = [db_raw]
-                
-                if len(addresses) > 1:
-                    product_addresses = [(product_id, addr) for addr in addresses]
-                    generate_multi_product_test_file(filename, data, product_addresses)
-                else:
-                    data_single = dict(data)
-                    data_single['product_address'] = addresses[0] if addresses else ''
-                    generate_single_test_file(filename, data_single, product_id)
-            else:
-                # 多产品ID的情况，需要获取每个产品的地址（支持 PID、PID_1..PID_n 全量解析）
-                product_addresses = []
-                
-                # 从当前项目的product_address字段获取地址映射
-                if data.get('product_address'):
-                    try:
-                        address_map = json.loads(data['product_address'])
-                        if isinstance(address_map, dict):
-                            unique_bases = list(dict.fromkeys(product_ids))
-                            for base in unique_bases:
-                                indexed = []
-                                for key, value in address_map.items():
-                                    if key == base:
-                                        indexed.append((0, value))
-                                    elif key.startswith(f"{base}_"):
-                                        suffix = key[len(base) + 1:]
-                                        try:
-                                            num = int(suffix)
-                                        except Exception:
-                                            continue
-                                        indexed.append((num, value))
-                                for _, val in sorted(indexed, key=lambda x: x[0]):
-                                    product_addresses.append((base, val))
-                        elif isinstance(address_map, list):
-                            if product_ids:
-                                for idx, val in enumerate(address_map):
-                                    base = product_ids[min(idx, len(product_ids) - 1)]
-                                    product_addresses.append((base, val))
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                
-                # 如果没有从product_address字段获取到地址，尝试从projects表获取
-                if not product_addresses:
-                    with get_db_connection_with_retry() as conn:
-                        unique_bases = list(dict.fromkeys(product_ids))
-                        for base in unique_bases:
-                            query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                            result = execute_query_with_results(conn, query, (base,))
-                            
-                            if result:
-                                product_address = result[0][0]
-                                # 安全解析：支持JSON列表或字典，且收集全部序号
-                                try:
-                                    parsed = json.loads(product_address)
-                                    if isinstance(parsed, dict):
-                                        indexed = []
-                                        for key, value in parsed.items():
-                                            if key == base:
-                                                indexed.append((0, value))
-                                            elif key.startswith(f"{base}_"):
-                                                suffix = key[len(base) + 1:]
-                                                try:
-                                                    num = int(suffix)
-                                                except Exception:
-                                                    continue
-                                                indexed.append((num, value))
-                                        for _, val in sorted(indexed, key=lambda x: x[0]):
-                                            product_addresses.append((base, val))
-                                    elif isinstance(parsed, list):
-                                        for val in parsed:
-                                            product_addresses.append((base, val))
-                                    else:
-                                        product_addresses.append((base, product_address))
-                                except (json.JSONDecodeError, TypeError):
-                                    product_addresses.append((base, product_address))
-                            else:
-                                log_info(f"警告: 未找到产品 {base} 的地址信息")
-                
-                if product_addresses:
-                    # 使用第一个产品的ID生成文件名
-                    clean_product_id = product_ids[0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                    filename = generate_unique_filename(clean_product_id, system)
-                    generate_multi_product_test_file(filename, data, product_addresses)
-                else:
-                    # 如果没有找到产品地址，使用第一个产品ID生成代码
-                    clean_product_id = product_ids[0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                    filename = generate_unique_filename(clean_product_id, system)
-                    generate_single_test_file(filename, data, product_ids[0])
-        
-    except Exception as e:
-        log_info(f"生成测试代码失败: {e}")
+def resolve_test_product_addresses(data):
+    """解析生成测试代码所需的产品地址，返回 [(product_id, address), ...]
+    单产品时一个产品可对应多个地址；多产品时按产品ID分别收集全部地址。
+    项目未配置地址时回退到 `projects` 表查询，仍未找到则使用第一个产品ID和空地址。
+    """
+    product_ids = data['product_ids']
+    unique_bases = list(dict.fromkeys(product_ids))
+    single_product = len(unique_bases) == 1
+    product_addresses = []
 
-def update_test_code(automation_id, data):
-    """更新现有测试代码文件"""
-    try:
-        # 使用文件管理器获取正确的文件名
-        from utils.file_manager import file_manager
-        
-        # 获取项目的文件映射信息
-        file_mapping = file_manager.get_project_file_mapping(automation_id)
-        
-        if file_mapping:
-            # 使用映射中的文件名
-            filename = file_mapping['file_name']
-            product_ids = data['product_ids']
-            
-            if len(product_ids) == 1:
-                # 单产品ID：若有多个地址则生成/更新多方法，否则更新单方法
-                product_id = product_ids[0]
-                addresses = []
-                raw_addr = data.get('product_address')
-                if raw_addr:
-                    try:
-                        parsed = json.loads(raw_addr)
-                        if isinstance(parsed, dict):
-                            indexed = []
-                            for key, value in parsed.items():
-                                if key == product_id:
-                                    indexed.append((0, value))
-                                elif key.startswith(f"{product_id}_"):
-                                    suffix = key[len(product_id) + 1:]
-                                    try:
-                                        num = int(suffix)
-                                    except Exception:
-                                        num = 0
-                                    indexed.append((num, value))
-                            if indexed:
-                                for _, value in sorted(indexed, key=lambda x: x[0]):
-                                    addresses.append(value)
-                            else:
-                                addresses.extend(list(parsed.values()))
-                        elif isinstance(parsed, list):
-                            addresses = list(parsed)
-                        else:
-                            addresses = [raw_addr]
-                    except (json.JSONDecodeError, TypeError):
-                        addresses = [raw_addr]
-                if not addresses:
-                    with get_db_connection_with_retry() as conn:
-                        query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                        result = execute_query_with_results(conn, query, (product_id,))
-                        if result:
-                            db_raw = result[0][0]
-                            try:
-                                parsed = json.loads(db_raw)
-                                if isinstance(parsed, dict):
-                                    indexed = []
-                                    for key, value in parsed.items():
-                                        if key == product_id:
-                                            indexed.append((0, value))
-                                        elif key.startswith(f"{product_id}_"):
-                                            suffix = key[len(product_id) + 1:]
-                                            try:
-                                                num = int(suffix)
-                                            except Exception:
-                                                num = 0
-                                            indexed.append((num, value))
-                                    if indexed:
-                                        for _, value in sorted(indexed, key=lambda x: x[0]):
-                                            addresses.append(value)
-                                    else:
-                                        addresses.extend(list(parsed.values()))
-                                elif isinstance(parsed, list):
-                                    addresses = list(parsed)
-                                else:
-                                    addresses = [db_raw]
-                            except (json.JSONDecodeError, TypeError):
-                                addresses = [db_raw]
-                if len(addresses) > 1:
-                    product_addresses = [(product_id, addr) for addr in addresses]
-                    update_multi_product_test_file(filename, data, product_addresses)
-                else:
-                    data_single = dict(data)
-                    data_single['product_address'] = addresses[0] if addresses else ''
-                    update_single_test_file(filename, data_single, product_id)
-            else:
-                # 多产品ID的情况，需要获取每个产品的地址（支持 PID、PID_1..PID_n 全量解析）
-                product_addresses = []
-                
-                # 从当前项目的product_address字段获取地址映射
-                if data.get('product_address'):
-                    try:
-                        address_map = json.loads(data['product_address'])
-                        if isinstance(address_map, dict):
-                            # 针对每个基础产品ID，收集同名与带序号的全部地址
-                            unique_bases = list(dict.fromkeys(product_ids))
-                            for base in unique_bases:
-                                indexed = []
-                                for key, value in address_map.items():
-                                    if key == base:
-                                        indexed.append((0, value))
-                                    elif key.startswith(f"{base}_"):
-                                        suffix = key[len(base) + 1:]
-                                        try:
-                                            num = int(suffix)
-                                        except Exception:
-                                            continue
-                                        indexed.append((num, value))
-                                for _, val in sorted(indexed, key=lambda x: x[0]):
-                                    product_addresses.append((base, val))
-                        elif isinstance(address_map, list):
-                            # 列表顺序分配，超出部分归到最后一个产品ID
-                            if product_ids:
-                                for idx, val in enumerate(address_map):
-                                    base = product_ids[min(idx, len(product_ids) - 1)]
-                                    product_addresses.append((base, val))
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                
-                # 如果没有从product_address字段获取到地址，尝试从projects表获取
-                if not product_addresses:
-                    with get_db_connection_with_retry() as conn:
-                        unique_bases = list(dict.fromkeys(product_ids))
-                        for base in unique_bases:
-                            query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                            result = execute_query_with_results(conn, query, (base,))
-                            
-                            if result:
-                                product_address = result[0][0]
-                                # 安全解析：支持JSON列表或字典，且收集全部序号
-                                try:
-                                    parsed = json.loads(product_address)
-                                    if isinstance(parsed, dict):
-                                        indexed = []
-                                        for key, value in parsed.items():
-                                            if key == base:
-                                                indexed.append((0, value))
-                                            elif key.startswith(f"{base}_"):
-                                                suffix = key[len(base) + 1:]
-                                                try:
-                                                    num = int(suffix)
-                                                except Exception:
-                                                    continue
-                                                indexed.append((num, value))
-                                        for _, val in sorted(indexed, key=lambda x: x[0]):
-                                            product_addresses.append((base, val))
-                                    elif isinstance(parsed, list):
-                                        for val in parsed:
-                                            product_addresses.append((base, val))
-                                    else:
-                                        product_addresses.append((base, product_address))
-                                except (json.JSONDecodeError, TypeError):
-                                    product_addresses.append((base, product_address))
-                            else:
-                                log_info(f"警告: 未找到产品 {base} 的地址信息")
-                
-                if product_addresses:
-                    update_multi_product_test_file(filename, data, product_addresses)
-                else:
-                    # 如果没有找到产品地址，使用第一个产品ID更新代码
-                    update_single_test_file(filename, data, product_ids[0])
-        else:
-            # 如果没有文件映射，使用旧的逻辑作为后备
-            product_ids = data['product_ids']
-            system = data['system']
-            
-            if len(product_ids) == 1:
-                clean_product_id = product_ids[0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                filename = find_existing_test_file(clean_product_id, system)
-                if filename:
-                    update_single_test_file(filename, data, product_ids[0])
-                else:
-                    filename = generate_unique_filename(clean_product_id, system)
-                    generate_single_test_file(filename, data, product_ids[0])
-            else:
-                # 多产品ID的情况，需要获取每个产品的地址（支持 PID、PID_1..PID_n 全量解析）
-                product_addresses = []
-                
-                # 从当前项目的product_address字段获取地址映射
-                if data.get('product_address'):
-                    try:
-                        address_map = json.loads(data['product_address'])
-                        if isinstance(address_map, dict):
-                            unique_bases = list(dict.fromkeys(product_ids))
-                            for base in unique_bases:
-                                indexed = []
-                                for key, value in address_map.items():
-                                    if key == base:
-                                        indexed.append((0, value))
-                                    elif key.startswith(f"{base}_"):
-                                        suffix = key[len(base) + 1:]
-                                        try:
-                                            num = int(suffix)
-                                        except Exception:
-                                            continue
-                                        indexed.append((num, value))
-                                for _, val in sorted(indexed, key=lambda x: x[0]):
-                                    product_addresses.append((base, val))
-                        elif isinstance(address_map, list):
-                            if product_ids:
-                                for idx, val in enumerate(address_map):
-                                    base = product_ids[min(idx, len(product_ids) - 1)]
-                                    product_addresses.append((base, val))
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                
-                # 如果没有从product_address字段获取到地址，尝试从projects表获取
-                if not product_addresses:
-                    with get_db_connection_with_retry() as conn:
-                        unique_bases = list(dict.fromkeys(product_ids))
-                        list_index = 0
-                        for base in unique_bases:
-                            query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                            result = execute_query_with_results(conn, query, (base,))
-                            
-                            if result:
-                                product_address = result[0][0]
-                                # 安全解析：支持JSON列表或字典，且收集全部序号
-                                try:
-                                    parsed = json.loads(product_address)
-                                    if isinstance(parsed, dict):
-                                        indexed = []
-                                        for key, value in parsed.items():
-                                            if key == base:
-                                                indexed.append((0, value))
-                                            elif key.startswith(f"{base}_"):
-                                                suffix = key[len(base) + 1:]
-                                                try:
-                                                    num = int(suffix)
-                                                except Exception:
-                                                    continue
-                                                indexed.append((num, value))
-                                        for _, val in sorted(indexed, key=lambda x: x[0]):
-                                            product_addresses.append((base, val))
-                                    elif isinstance(parsed, list):
-                                        for val in parsed:
-                                            product_addresses.append((base, val))
-                                    else:
-                                        product_addresses.append((base, product_address))
-                                except (json.JSONDecodeError, TypeError):
-                                    product_addresses.append((base, product_address))
-                            else:
-                                log_info(f"警告: 未找到产品 {base} 的地址信息")
-                
-                if product_addresses:
-                    # 使用第一个产品的ID查找现有文件
-                    clean_product_id = product_ids[0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                    filename = find_existing_test_file(clean_product_id, system)
-                    if filename:
-                        update_multi_product_test_file(filename, data, product_addresses)
-                    else:
-                        filename = generate_unique_filename(clean_product_id, system)
-                        generate_multi_product_test_file(filename, data, product_addresses)
+    raw_address = data.get('product_address')
+    if raw_address:
+        try:
+            parsed = json.loads(raw_address)
+        except (json.JSONDecodeError, TypeError):
+            parsed = raw_address
+
+        if isinstance(parsed, dict):
+            for base in unique_bases:
+                product_addresses.extend((base, value) for value in collect_product_address_values(parsed, base))
+            if not product_addresses and single_product:
+                # 若没有匹配到以 product_id 开头的键，则退化为 values 顺序
+                product_addresses = [(product_ids[0], value) for value in parsed.values()]
+        elif isinstance(parsed, list):
+            # 列表顺序分配，超出部分归到最后一个产品ID
+            for idx, value in enumerate(parsed):
+                product_addresses.append((product_ids[min(idx, len(product_ids) - 1)], value))
+        elif single_product:
+            product_addresses = [(product_ids[0], raw_address)]
+
+    # 如果没有从product_address字段获取到地址，尝试从projects表获取
+    if not product_addresses:
+        with get_db_connection_with_retry() as conn:
+            query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
+            for base in unique_bases:
+                result = execute_query_with_results(conn, query, (base,))
+                if not result or not result[0][0]:
+                    log_info(f"警告: 未找到产品 {base} 的地址信息")
+                    continue
+
+                db_raw = result[0][0]
+                try:
+                    parsed = json.loads(db_raw)
+                except (json.JSONDecodeError, TypeError):
+                    parsed = db_raw
+
+                if isinstance(parsed, dict):
+                    values = collect_product_address_values(parsed, base)
+                    if not values and single_product:
+                        values = list(parsed.values())
+                elif isinstance(parsed, list):
+                    values = list(parsed)
                 else:
-                    # 如果没有找到产品地址，使用第一个产品ID更新代码
-                    clean_product_id = product_ids[0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                    filename = find_existing_test_file(clean_product_id, system)
-                    if filename:
-                        update_single_test_file(filename, data, product_ids[0])
-                    else:
-                        filename = generate_unique_filename(clean_product_id, system)
-                        generate_single_test_file(filename, data, product_ids[0])
-        
-    except Exception as e:
-        log_info(f"更新测试代码失败: {e}")
+                    values = [db_raw]
+                product_addresses.extend((base, value) for value in values)
 
-def generate_unique_filename(product_id, system):
-    """生成唯一的文件名，如果文件已存在则添加序号"""
-    base_filename = f"{product_id}_{system}_test.py"
-    file_path = os.path.join('Test_Case', base_filename)
-    
-    # 如果文件不存在，直接返回
-    if not os.path.exists(file_path):
-        return base_filename
-    
-    # 如果文件存在，查找下一个可用的序号
-    counter = 2
-    while True:
-        numbered_filename = f"{product_id}_{system}_{counter}_test.py"
-        numbered_file_path = os.path.join('Test_Case', numbered_filename)
-        
-        if not os.path.exists(numbered_file_path):
-            return numbered_filename
-        
-        counter += 1
+    if not product_addresses:
+        # 如果没有找到产品地址，使用第一个产品ID生成代码
+        product_addresses = [(product_ids[0], '')]
+    return product_addresses
 
-def find_existing_test_file(product_id, system, project_id=None):
-    """查找实际存在的测试文件"""
-    log_info(f"查找测试文件 - 产品ID: {product_id}, 系统: {system}, 项目ID: {project_id}")
-    
-    # 如果提供了项目ID，优先查找对应的文件
-    if project_id:
-        # 首先检查是否有带项目ID的文件
-        project_filename = f"{product_id}_{system}_{project_id}_test.py"
-        project_file_path = os.path.join('Test_Case', project_filename)
-        
-        log_info(f"检查项目特定文件: {project_file_path}")
-        if os.path.exists(project_file_path):
-            log_info(f"找到项目特定文件: {project_filename}")
-            return project_filename
-    
-    # 首先检查基础文件名
-    base_filename = f"{product_id}_{system}_test.py"
-    base_file_path = os.path.join('Test_Case', base_filename)
-    
-    log_info(f"检查基础文件: {base_file_path}")
-    if os.path.exists(base_file_path):
-        log_info(f"找到基础文件: {base_filename}")
-        return base_filename
-    
-    # 检查带序号的文件名 (格式: {product_id}_{system}_test_{number}.py)
-    counter = 2
-    while True:
-        numbered_filename = f"{product_id}_{system}_test_{counter}.py"
-        numbered_file_path = os.path.join('Test_Case', numbered_filename)
-        
-        log_info(f"检查序号文件: {numbered_file_path}")
-        if os.path.exists(numbered_file_path):
-            log_info(f"找到序号文件: {numbered_filename}")
-            return numbered_filename
-        
-        # 如果找不到更多文件，停止搜索
-        if counter > 100:  # 防止无限循环
-            break
-            
-        counter += 1
-    
-    # 也检查旧格式的文件名 (格式: {product_id}_{system}_{number}_test.py)
-    counter = 2
-    while True:
-        old_format_filename = f"{product_id}_{system}_{counter}_test.py"
-        old_format_file_path = os.path.join('Test_Case', old_format_filename)
-        
-        log_info(f"检查旧格式文件: {old_format_file_path}")
-        if os.path.exists(old_format_file_path):
-            log_info(f"找到旧格式文件: {old_format_filename}")
-            return old_format_filename
-        
-        # 如果找不到更多文件，停止搜索
-        if counter > 100:  # 防止无限循环
-            break
-            
-        counter += 1
-    
-    # 列出Test_Case目录中的所有文件，帮助调试
-    try:
-        test_case_files = os.listdir('Test_Case')
-        py_files = [f for f in test_case_files if f.endswith('.py') and not f.startswith('__')]
-        log_info(f"Test_Case目录中的Python文件: {py_files}")
-    except Exception as e:
-        log_info(f"无法列出Test_Case目录: {e}")
-    
-    log_info(f"未找到匹配的文件，返回None")
-    return None
-
-def generate_assertion_code(step, step_index):
-    """生成断言代码 - 支持UI断言、图片断言、自定义断言"""
-    assertion_code = ""
-    
-    # 获取断言配置
-    assertion_config = step.get('assertion_config', {})
-    ui_assertions = assertion_config.get('ui_assertions', [])
-    image_assertions = assertion_config.get('image_assertions', [])
-    custom_assertions = assertion_config.get('custom_assertions', [])
-    
-    # 检查是否启用了断言
-    assertion_enabled = step.get('assertion_enabled', 'no')
-    
-    if assertion_enabled != 'yes':
-        return assertion_code
-    
-    # =============================================================================
-    # UI断言代码生成
-    # =============================================================================
-    if ui_assertions:
-        for assertion in ui_assertions:
-            assertion_type = assertion.get('type', '')
-            target_element = assertion.get('target_element', '').replace('"', "'")
-            expected_value = assertion.get('expected_value', '')
-            
-            if not target_element:
-                continue
-                
-            # 根据断言类型生成对应的代码
-            if assertion_type == 'exists':
-                assertion_code += f'''
-                # UI断言: 元素存在
-                with allure.step("测试步骤{step_index}: UI断言 - 元素存在"):
-                    await ui_operations.elem_assert_exists("{target_element}")
-'''
-            elif assertion_type == 'visible':
-                assertion_code += f'''
-                # UI断言: 元素可见
-                with allure.step("测试步骤{step_index}: UI断言 - 元素可见"):
-                    await ui_operations.elem_assert_visible("{target_element}")
-'''
-            elif assertion_type == 'text_contains':
-                if expected_value:
-                    assertion_code += f'''
-                # UI断言: 文本包含
-                with allure.step("测试步骤{step_index}: UI断言 - 文本包含"):
-                    await ui_operations.elem_assert_text_contains("{target_element}", "{expected_value}")
-'''
-            elif assertion_type == 'attribute_match':
-                if expected_value and ':' in expected_value:
-                    assertion_code += f'''
-                # UI断言: 属性匹配
-                with allure.step("测试步骤{step_index}: UI断言 - 属性匹配"):
-                    await ui_operations.elem_assert_attribute_match("{target_element}", "{expected_value}")
-'''
-            elif assertion_type == 'element_count':
-                if expected_value and expected_value.isdigit():
-                    assertion_code += f'''
-                # UI断言: 元素数量
-                with allure.step("测试步骤{step_index}: UI断言 - 元素数量"):
-                    await ui_operations.elem_assert_count("{target_element}", {expected_value})
-'''
-    
-    # =============================================================================
-    # 图片断言代码生成
-    # =============================================================================
-    if image_assertions:
-        for assertion in image_assertions:
-            # 处理图片断言数据，保存图片文件到指定目录
-            processed_assertion = image_upload_manager.process_image_assertion_data(assertion)
-            
-            assertion_type = processed_assertion.get('method', '')  # 修复：使用method字段而不是type
-            image_path = processed_assertion.get('image_path', '')
-            # 移除路径前缀的斜杠，确保生成的代码使用相对路径
-            if image_path.startswith('/'):
-                image_path = image_path[1:]
-            threshold = processed_assertion.get('threshold', '')
-            confidence = processed_assertion.get('confidence', '')
-            screenshot_area = processed_assertion.get('screenshot_area', None)
-            
-            if not image_path:
-                log_info(f"跳过图片断言：缺少图片路径")
-                continue
-                
-            # 根据图片断言类型生成对应的代码
-            if assertion_type == 'template_match':
-                confidence_value = float(confidence) if confidence else 0.8
-                assertion_code += f'''
-                # 图片断言: 模板匹配
-                with allure.step("测试步骤{step_index}: 图片断言 - 模板匹配"):
-                    await ui_operations.image_assert_template_match("{image_path}", confidence={confidence_value})
-'''
-            elif assertion_type == 'mse':
-                threshold_value = float(threshold) if threshold else 100.0
-                if screenshot_area:
-                    assertion_code += f'''
-                # 图片断言: MSE比较
-                with allure.step("测试步骤{step_index}: 图片断言 - MSE比较"):
-                    await ui_operations.image_assert_mse("{image_path}", threshold={threshold_value}, screenshot_area={screenshot_area})
-'''
-                else:
-                    assertion_code += f'''
-                # 图片断言: MSE比较
-                with allure.step("测试步骤{step_index}: 图片断言 - MSE比较"):
-                    await ui_operations.image_assert_mse("{image_path}", threshold={threshold_value})
-'''
-            elif assertion_type == 'ssim':
-                threshold_value = float(threshold) if threshold else 0.8
-                if screenshot_area:
-                    assertion_code += f'''
-                # 图片断言: SSIM比较
-                with allure.step("测试步骤{step_index}: 图片断言 - SSIM比较"):
-                    await ui_operations.image_assert_ssim("{image_path}", threshold={threshold_value}, screenshot_area={screenshot_area})
-'''
-                else:
-                    assertion_code += f'''
-                # 图片断言: SSIM比较
-                with allure.step("测试步骤{step_index}: 图片断言 - SSIM比较"):
-                    await ui_operations.image_assert_ssim("{image_path}", threshold={threshold_value})
-'''
-            elif assertion_type == 'perceptual_hash':
-                threshold_value = float(threshold) if threshold else 10.0
-                if screenshot_area:
-                    assertion_code += f'''
-                # 图片断言: 感知哈希比较
-                with allure.step("测试步骤{step_index}: 图片断言 - 感知哈希比较"):
-                    await ui_operations.image_assert_perceptual_hash("{image_path}", threshold={threshold_value}, screenshot_area={screenshot_area})
-'''
-                else:
-                    assertion_code += f'''
-                # 图片断言: 感知哈希比较
-                with allure.step("测试步骤{step_index}: 图片断言 - 感知哈希比较"):
-                    await ui_operations.image_assert_perceptual_hash("{image_path}", threshold={threshold_value})
-'''
+def write_project_test_code(automation_id, data, reuse_existing=False):
+    """生成或更新项目的测试代码文件，新建与更新共用同一条生成路径
+    每个产品地址生成一个独立的测试函数，并附带并发执行入口。
+    """
+    # 使用文件管理器获取正确的文件名
+    from utils.file_manager import file_manager
+
+    file_mapping = file_manager.get_project_file_mapping(automation_id)
+    if file_mapping:
+        filename = file_mapping['file_name']
+    else:
+        # 如果没有文件映射，使用旧的文件命名逻辑作为后备
+        clean_product_id = data['product_ids'][0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
+        filename = find_existing_test_file(clean_product_id, data['system']) if reuse_existing else None
+        if not filename:
+            filename = generate_unique_filename(clean_product_id, data['system'])
+
+    product_addresses = resolve_test_product_addresses(data)
     
-    # =============================================================================
-    # 自定义断言代码生成
-    # =============================================================================
-    if custom_assertions:
-        for assertion in custom_assertions:
-            assertion_name = assertion.get('name', '')
-            target_element = assertion.get('target_element', '')
-            expected_result = assertion.get('expected_result', '')
-            assertion_code_snippet = assertion.get('code', '')
-            
-            # 如果有目标元素和预期结果，使用elem_custom_assert方法
-            if target_element and expected_result:
-                assertion_code += f'''
-                # 自定义断言: {assertion_name}
-                with allure.step("测试步骤{step_index}: 自定义断言 - {assertion_name}"):
-                    await ui_operations.elem_custom_assert("{target_element}", "{expected_result}")
-'''
-            # 如果有自定义脚本代码，直接使用脚本代码
-            elif assertion_code_snippet and assertion_code_snippet.strip():
-                assertion_code += f'''
-                # 自定义断言: {assertion_name}
-                with allure.step("测试步骤{step_index}: 自定义断言 - {assertion_name}"):
-                    # 自定义断言代码
-                    {assertion_code_snippet}
-'''
+    # 影响生成代码的输入未变化且文件存在时，跳过重新生成
+    content_hash = test_code_generator.compute_input_hash(data, product_addresses)
+    if file_mapping and file_mapping.get('content_hash') == content_hash \
+            and os.path.exists(file_mapping['file_path']):
+        log_info(f"项目 {automation_id} 的测试代码输入未变化，跳过重新生成: {filename}")
+        return file_mapping['file_path']
     
-    return assertion_code
+    file_path = test_code_generator.write(filename, data, product_addresses)
+    if file_mapping:
+        file_manager.update_content_hash(automation_id, content_hash)
+    return file_path
 
-def generate_single_test_file(filename, data, product_id):
-    """生成单个测试文件"""
+def generate_test_code(automation_id, data):
+    """生成测试代码文件"""
     try:
-        file_path = os.path.join('Test_Case', filename)
-        
-        # 获取产品地址
-        product_address = data.get('product_address', '')
-        if not product_address:
-            # 如果product_address为空，尝试从projects表获取
-            with get_db_connection_with_retry() as conn:
-                query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                address_results = execute_query_with_results(conn, query, (product_id,))
-                if address_results:
-                    product_address = address_results[0][0]
-                    log_info(f"从projects表获取到产品 {product_id} 的地址: {product_address}")
-                else:
-                    log_info(f"警告: 未找到产品 {product_id} 的地址信息")
-        
-        # 生成代码内容
-        code_content = '''
-import time
-import sys
-import pyautogui
-import numpy
-import pytest
-import asyncio
-import os
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-import requests
-import allure
-from config.logger import log_info
-from playwright.async_api import async_playwright
-from utils.screen_manager import screen_manager
-from utils.ui_operations import UIOperations
-from typing import Tuple, List
-from Base_ENV.config import *
-
-
-async def test_''' + product_id.replace("-", "_") + '''(browser_args):
-    """
-    为 test_''' + product_id.replace("-", "_") + ''' 创建完全独立的浏览器实例，使用指定的浏览器参数
-    """
-    task_id = "test_''' + product_id.replace("-", "_") + '''"
-    async with async_playwright() as p:
-        browser = None
-        context = None
-        page = None
-        try:
-            # 启动独立的浏览器实例
-            browser = await p.chromium.launch(headless=False, args=browser_args)
-            context = await browser.new_context(no_viewport=True)
-            page = await context.new_page()
-                    
-            # 创建UIOperations实例并使用混合图片识别机制，为每个任务创建独立实例
-            ui_operations = UIOperations(page, task_id=task_id)
-            
-            # 配置参数
-            website_url = "''' + product_address + '''"
-            
-            # 导航到目标网站
-            await ui_operations.navigate_to(website_url)
-            
-            # 初始检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info(f"[{task_id}] 检测到浏览器已关闭，test_''' + product_id.replace("-", "_") + ''' 测试无法继续")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-'''
-        
-        # 生成测试步骤代码
-        for i, step in enumerate(data['test_steps']):
-            step_name = step.get('step_name', f'step_{i+1}')
-            operation_type = step.get('operation_type', 'web')
-            operation_event = step.get('operation_event', 'click')
-            operation_params = step.get('operation_params', '').replace('"', "'")
-            input_value = step.get('input_value', '').replace('"', "'")
-            
-            # 获取标签页跳转配置
-            tab_switch_action = step.get('tab_switch_action', 'no')
-            tab_target_url = step.get('tab_target_url', '')
-
-            # 获取断言配置
-            assert_action = step.get('assert_action', 'no')
-            assert_params = step.get('assert_params', '')
-            
-            # 获取截图配置
-            screenshot_enabled = step.get('screenshot_enabled', 'NO').upper()
-            screenshot_config = step.get('screenshot_config', {})
-            screenshot_timing = screenshot_config.get('timing', 'after')
-
-            # 安全地转换数字字段，确保它们是有效的正整数
-            try:
-                operation_count = max(1, int(step.get('operation_count', 1)))
-            except (ValueError, TypeError):
-                operation_count = 1
-                log_info(f"警告: 步骤 {i+1} 的操作次数无效，使用默认值 1")
-            
-            try:
-                pause_time = max(0, int(step.get('pause_time', 1)))
-            except (ValueError, TypeError):
-                pause_time = 1
-                log_info(f"警告: 步骤 {i+1} 的暂停时间无效，使用默认值 1")
-            
-            if operation_type == 'web':
-                # 检查是否需要跳转到新标签页 - 需要启用跳转且有目标URL
-                tab_switch_enabled = step.get('tab_switch_enabled', 'no')
-                
-                # 生成统一的测试步骤包装
-                code_content += '''            
-            # 测试步骤''' + str(i+1) + ''': ''' + step_name + ''' (操作次数: ''' + str(operation_count) + ''')
-            with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + '''"):
-                log_info(f"开始测试步骤''' + str(i+1) + ''' ''' + step_name + ''' 的操作==============")
-'''
-                
-                # 如果需要标签页跳转，添加跳转代码
-                if tab_switch_enabled == 'yes' and tab_target_url and tab_target_url.strip():
-                    code_content += '''                
-                # 标签页跳转配置
-                log_info(f"[{task_id}] 正在打开新标签页: ''' + tab_target_url + '''")
-                new_page = await ui_operations.open_new_tab_and_navigate("''' + tab_target_url + '''")
-
-                # 获取所有标签页信息并确保切换到正确的标签页
-                all_tabs = await ui_operations.get_all_tabs()
-
-                # 公共断言方法，断言URL是否存在
-                with allure.step("测试步骤''' + str(i+1) + ''': 公共断言URL是否存在"):
-                    await ui_operations.url_assert_exists("''' + tab_target_url + '''")
-                time.sleep(1)  # 等待页面加载
-'''
-                # 添加元素操作代码
-                code_content += '''                
-                # 公共断言方法，断言元素是否存在
-                with allure.step("测试步骤''' + str(i+1) + ''': 公共断言元素是否存在"):
-                    await ui_operations.elem_assert_exists("''' + operation_params + '''")
-'''
-                
-                # 添加自定义断言代码
-                assertion_code = generate_assertion_code(step, i+1)
-                if assertion_code:
-                    code_content += assertion_code
-                
-                # 添加步骤前截图代码
-                if screenshot_enabled == 'YES' and (screenshot_timing == 'before' or screenshot_timing == 'both'):
-                    code_content += '''
-                # 步骤前截图
-                with allure.step("测试步骤''' + str(i+1) + ''': 步骤前截图"):
-                    await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''","test_step_''' + str(i+1) + '''_before")
-'''
-                
-                # 根据截图设置动态生成失败截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing == 'on_failure':
-                    failure_screenshot_code = '''
-                            try:
-                                # 失败时截图
-                                with allure.step("测试步骤''' + str(i+1) + ''': 操作失败截图"):
-                                    await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''","test_step_''' + str(i+1) + '''_failure")
-                            except Exception as screenshot_error:
-                                log_info(f"失败截图失败: {screenshot_error}")
-                                raise screenshot_error
-'''
-                else:
-                    failure_screenshot_code = ''
-                
-                # 根据截图设置动态生成步骤后截图代码  
-                if screenshot_enabled == 'YES' and (screenshot_timing == 'after' or screenshot_timing == 'both'):
-                    after_screenshot_code = '''
-                # 步骤后截图
-                with allure.step("测试步骤''' + str(i+1) + ''': 步骤后截图"):
-                    await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''","test_step_''' + str(i+1) + '''_after")
-'''
-                else:
-                    after_screenshot_code = ''
-                
-                # 构造操作调用语句，根据事件决定参数个数
-                if operation_event == 'input':
-                    operation_invoke = 'await ui_operations.elem_input("' + operation_params + '", "' + input_value + '")'
-                else:
-                    operation_invoke = 'await ui_operations.elem_' + operation_event + '("' + operation_params + '")'
-                
-                code_content += '''
-                with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - ''' + operation_event + ''' 操作 (''' + operation_params + ''')"):
-                    time.sleep(''' + str(pause_time) + ''')
-                    
-                # 执行Web元素操作 ''' + str(operation_count) + ''' 次
-                for attempt in range(''' + str(operation_count) + '''):
-                        # 检查浏览器是否已关闭
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，测试被用户中断")
-                            # 创建一个自定义异常来标识用户中断
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            log_info(f"执行第{attempt + 1}次操作: ''' + operation_event + ''' on ''' + operation_params + '''")
-                            # 使用安全操作机制，带重试
-                            ''' + operation_invoke + '''
-                            time.sleep(1)  # 每次操作后等待1秒
-                        except Exception as e:
-                            # 检查是否是浏览器关闭导致的异常
-                            error_msg = str(e).lower()
-                            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
-                                log_info(f"检测到浏览器连接异常，可能被用户关闭")
-                                raise Exception("BROWSER_CLOSED_BY_USER")
-                            log_info(f"第''' + str(operation_count) + '''次操作失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"所有操作均失败！")
-                                ''' + failure_screenshot_code + '''
-                time.sleep(1)  # 每次操作后等待1秒
-''' + after_screenshot_code + '''
-'''
-                
-            elif operation_type == 'game':
-                img_path = operation_params.replace('\\', '/')
-                # 根据操作事件选择对应的pyautogui方法
-                if operation_event == 'double_click':
-                    click_action = 'pyautogui.doubleClick(center_x, center_y)'
-                else:
-                    click_action = 'pyautogui.click(center_x, center_y)'
-                
-                code_content += '''            # 测试步骤''' + str(i+1) + ''': ''' + step_name + ''' (操作次数: ''' + str(operation_count) + ''')
-            with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + '''"):
-                log_info(f"开始测试步骤''' + str(i+1) + ''' ''' + step_name + ''' 的操作==============")
-                
-                # 页面滚动子步骤
-                with allure.step(f"测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 页面滚动准备"):
-                    # 需要等待1S后再操作滚动
-                    time.sleep(1)
-                    # 游戏操作前先滚动页面确保图片可见
-                    # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
-                    # 请根据实际的页面滚动进行调整到图片可见
-                    await ui_operations.page_mouse_scroll(delta_x=0, delta_y=1500)
-                
-                # 图片操作子步骤
-                with allure.step(f"测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 游戏图片''' + operation_event + ''' 操作"):
-                    # 执行游戏图片操作 ''' + str(operation_count) + ''' 次
-                    for attempt in range(''' + str(operation_count) + '''):
-                        # 检查浏览器是否已关闭（即使是游戏操作也需要检查浏览器状态）
-                        if await ui_operations.is_browser_closed():
-                            log_info(f"[{task_id}] 检测到浏览器已关闭，test_''' + product_id.replace("-", "_") + ''' 测试被用户中断")
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            log_info(f"[test_''' + product_id.replace("-", "_") + '''] 执行第{attempt + 1}次图片操作: ''' + operation_event + ''' on ''' + img_path + '''")
-                            time.sleep(''' + str(pause_time) + ''')
-                            success = await ui_operations.click_image_with_fallback(
-                                "''' + img_path + '''", 
-                                confidence=0.5, 
-                                timeout=10
-                            )
-                            if success:
-                                log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 第{attempt + 1}次操作完成")
-                            else:
-                                log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 第{attempt + 1}次尝试：没有找到图片 ''' + img_path + '''")
-                                if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                    log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 所有 ''' + str(operation_count) + ''' 次尝试都失败，无法找到图片")
-                                raise Exception(f"图片定位失败：无法找到图片 ''' + img_path + '''")
-                        except Exception as e:
-                            log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 第{attempt + 1}次图片定位失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 所有 ''' + str(operation_count) + ''' 次尝试都失败")
-                            raise Exception(f"图片定位失败：无法找到图片 ''' + img_path + '''")
-                        time.sleep(1)  # 每次操作后等待1秒
-            
-'''
-        
-        code_content += f'''            # 等待测试完成
-            time.sleep(2)
-            
-            # 最终检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info(f"检测到浏览器已关闭，test_''' + product_id.replace("-", "_") + ''' 测试被用户中断")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-            await ui_operations.page_screenshot(f"''' + product_id.replace("-", "_") + '''","over_test_test_step_''' + str(i+1) + '''")
-            time.sleep(2)
-            
-            # 输出图片识别统计信息
-            stats = ui_operations.get_image_stats()
-            log_info(f"[{task_id}] 图片识别统计: 截图识别成功 {stats['screenshot_success']} 次, "
-                    f"pyautogui成功 {stats['pyautogui_success']} 次, "
-                    f"总成功率 {stats['success_rate']:.2%}")
-            
-            log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 完成")
-            
-        except Exception as e:
-            log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 失败")
-            raise e
-        finally:
-            # 清理资源
-            if page:
-                await page.close()
-            if context:
-                await context.close()
-            if browser:
-                await browser.close()
-'''
-        
-        # 为单个测试案例生成并发执行函数
-        product_addresses = [(product_id, product_address)]
-        concurrent_function = generate_concurrent_execution_function(product_addresses)
-        code_content += concurrent_function
-        
-        # 写入文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code_content)
-            
+        write_project_test_code(automation_id, data)
     except Exception as e:
-        log_info(f"生成测试文件失败: {e}")
+        log_info(f"生成测试代码失败: {e}")
 
-def update_single_test_file(filename, data, product_id):
-    """更新单个测试文件"""
+def update_test_code(automation_id, data):
+    """更新现有测试代码文件"""
     try:
-        file_path = os.path.join('Test_Case', filename)
-        # 获取产品地址
-        product_address = data.get('product_address', '')
-        if not product_address:
-            # 如果product_address为空，尝试从projects表获取
-            with get_db_connection_with_retry() as conn:
-                query = adapt_query_placeholders('SELECT product_address FROM projects WHERE product_id = ?')
-                address_results = execute_query_with_results(conn, query, (product_id,))
-                if address_results:
-                    product_address = address_results[0][0]
-                    log_info(f"从projects表获取到产品 {product_id} 的地址: {product_address}")
-                else:
-                    log_info(f"警告: 未找到产品 {product_id} 的地址信息")
-        
-        # 生成代码内容（与generate_single_test_file相同的逻辑）
-        code_content = f'''
-import time
-import sys
-import pyautogui
-import numpy
-import pytest
-import asyncio
-import os
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-import requests
-import allure
-from config.logger import log_info
-from playwright.async_api import async_playwright
-from utils.screen_manager import screen_manager
-from utils.ui_operations import UIOperations
-from typing import Tuple, List
-from Base_ENV.config import *
-
-async def test_''' + product_id.replace("-", "_") + '''(browser_args):
-    """
-    为 test_''' + product_id.replace("-", "_") + ''' 创建完全独立的浏览器实例，使用指定的浏览器参数
-    """
-    task_id = "test_''' + product_id.replace("-", "_") + '''"
-    async with async_playwright() as p:
-        browser = None
-        context = None
-        page = None
-        try:
-            # 启动独立的浏览器实例
-            browser = await p.chromium.launch(headless=False, args=browser_args)
-            context = await browser.new_context(no_viewport=True)
-            page = await context.new_page()
-                    
-            # 创建UIOperations实例并使用混合图片识别机制，为每个任务创建独立实例
-            ui_operations = UIOperations(page, task_id=task_id)
-            
-            # 配置参数
-            website_url = "''' + product_address + '''"
-            
-            # 导航到目标网站
-            await ui_operations.navigate_to(website_url)
-            
-            # 初始检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info(f"[{task_id}] 检测到浏览器已关闭，test_''' + product_id.replace("-", "_") + ''' 测试无法继续")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-'''
-        
-        # 生成测试步骤代码
-        for i, step in enumerate(data['test_steps']):
-            step_name = step.get('step_name', f'step_{i+1}')
-            operation_type = step.get('operation_type', 'web')
-            operation_event = step.get('operation_event', 'click')
-            operation_params = step.get('operation_params', '').replace('"', "'")
-            input_value = step.get('input_value', '').replace('"', "'")
-            
-            # 获取标签页跳转配置
-            tab_switch_action = step.get('tab_switch_action', 'no')
-            tab_target_url = step.get('tab_target_url', '')
-            
-            # 安全地转换数字字段，确保它们是有效的正整数
-            try:
-                operation_count = max(1, int(step.get('operation_count', 1)))
-            except (ValueError, TypeError):
-                operation_count = 1
-                log_info(f"警告: 步骤 {i+1} 的操作次数无效，使用默认值 1")
-            
-            try:
-                pause_time = max(0, int(step.get('pause_time', 1)))
-            except (ValueError, TypeError):
-                pause_time = 1
-                log_info(f"警告: 步骤 {i+1} 的暂停时间无效，使用默认值 1")
-            
-            if operation_type == 'web':
-                # 检查是否需要跳转到新标签页 - 需要启用跳转且有目标URL
-                tab_switch_enabled = step.get('tab_switch_enabled', 'no')
-                
-                # 构造操作调用语句与文案后缀
-                if operation_event == 'input':
-                    operation_invoke = 'await ui_operations.elem_input("' + operation_params + '", "' + input_value + '")'
-                else:
-                    operation_invoke = 'await ui_operations.elem_' + operation_event + '("' + operation_params + '")'
-                
-                # 生成截图代码变量
-                screenshot_enabled = step.get('screenshot_enabled', 'NO').upper()
-                screenshot_config = step.get('screenshot_config', {})
-                screenshot_timing = screenshot_config.get('timing', 'none')
-                
-                # 步骤前截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing in ['before', 'both']:
-                    before_screenshot_code = '''
-                # 步骤前截图
-                with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 步骤前截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''", f"step_''' + str(i+1) + '''_before")
-                        log_info(f"步骤''' + str(i+1) + '''前截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(i+1) + '''前截图")
-'''
-                else:
-                    before_screenshot_code = ''
-                
-                # 步骤后截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing in ['after', 'both']:
-                    after_screenshot_code = '''
-                # 步骤后截图
-                with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 步骤后截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''", f"step_''' + str(i+1) + '''_after")
-                        log_info(f"步骤''' + str(i+1) + '''后截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(i+1) + '''后截图")
-'''
-                else:
-                    after_screenshot_code = ''
-                
-                # 失败截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing == 'on_failure':
-                    failure_screenshot_code = '''
-                                # 操作失败截图
-                                    with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 操作失败截图"):
-                                    try:
-                                        if not await ui_operations.is_browser_closed():
-                                            await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''", f"step_''' + str(i+1) + '''_failure")
-                                            log_info(f"步骤''' + str(i+1) + '''操作失败截图完成")
-                                    except Exception as screenshot_e:
-                                        log_info(f"失败截图异常: {screenshot_e}")
-                                        raise screenshot_e
-                                '''
-                else:
-                    failure_screenshot_code = ''
-
-                # 生成统一的测试步骤包装
-                code_content += f'''            
-            # 测试步骤{i+1}: {step_name} (操作次数: {operation_count})
-            with allure.step("测试步骤{i+1}: {step_name}"):
-                log_info(f"开始测试步骤{i+1} {step_name} 的操作==============")
-'''
-                
-                # 如果需要标签页跳转，添加跳转代码
-                if tab_switch_enabled == 'yes' and tab_target_url and tab_target_url.strip():
-                    code_content += f'''                
-                # 标签页跳转配置
-                log_info(f"[{{task_id}}] 正在打开新标签页: {tab_target_url}")
-                new_page = await ui_operations.open_new_tab_and_navigate("{tab_target_url}")
-
-                # 获取所有标签页信息并确保切换到正确的标签页
-                all_tabs = await ui_operations.get_all_tabs()
+        write_project_test_code(automation_id, data, reuse_existing=True)
+    except Exception as e:
+        log_info(f"更新测试代码失败: {e}")
 
-                # 公共断言方法，断言URL是否存在
-                with allure.step("测试步骤{i+1}: 公共断言URL是否存在"):
-                    await ui_operations.url_assert_exists("{tab_target_url}")
-                time.sleep(1)  # 等待页面加载
-'''
-                
-                # 添加元素操作代码
-                code_content += f'''                
-                # 公共断言方法，断言元素是否存在
-                with allure.step("测试步骤{i+1}: 公共断言元素是否存在"):
-                    await ui_operations.elem_assert_exists("{operation_params}")
-'''
-                
-                # 添加自定义断言代码
-                assertion_code = generate_assertion_code(step, i+1)
-                if assertion_code:
-                    code_content += assertion_code
-                
-                # 添加步骤前截图代码
-                code_content += before_screenshot_code
-                
-                code_content += f'''
-                with allure.step("测试步骤{i+1}: {step_name} - {operation_event} 操作 ({operation_params})"):
-                    time.sleep({pause_time})
-                    
-                    # 执行Web元素操作 {operation_count} 次
-                    for attempt in range({operation_count}):
-                        # 检查浏览器是否已关闭
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，测试被用户中断")
-                            # 创建一个自定义异常来标识用户中断
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            log_info(f"[{{task_id}}]  执行第{attempt + 1}次操作: {operation_event} on {operation_params}")
-                            # 使用安全操作机制，带重试
-                            ''' + operation_invoke + '''
-                            time.sleep(1)  # 每次操作后等待1秒
-                        except Exception as e:
-                            # 检查是否是浏览器关闭导致的异常
-                            error_msg = str(e).lower()
-                            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
-                                log_info(f"检测到浏览器连接异常，可能被用户关闭")
-                                raise Exception("BROWSER_CLOSED_BY_USER")
-                            log_info(f"第''' + str(operation_count) + '''次操作失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"所有操作均失败！")
-                                ''' + failure_screenshot_code + '''
-                time.sleep(1)  # 每次操作后等待1秒
-''' + after_screenshot_code + '''
-            
-'''
-            elif operation_type == 'game':
-                img_path = operation_params.replace('\\', '/')
-                # 根据操作事件选择对应的pyautogui方法
-                if operation_event == 'double_click':
-                    click_action = 'pyautogui.doubleClick(center_x, center_y)'
-                else:
-                    click_action = 'pyautogui.click(center_x, center_y)'
-                
-                # 生成截图代码
-                screenshot_enabled = step.get('screenshot_enabled', 'NO')
-                screenshot_timing = step.get('screenshot_timing', 'none')
-                
-                # 步骤前截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing in ['before', 'both']:
-                    before_screenshot_code = '''
-                # 步骤前截图
-                with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 步骤前截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''", f"step_''' + str(i+1) + '''_before")
-                        log_info(f"步骤''' + str(i+1) + '''前截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(i+1) + '''前截图")
-'''
-                else:
-                    before_screenshot_code = ''
-                
-                # 步骤后截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing in ['after', 'both']:
-                    after_screenshot_code = '''
-                # 步骤后截图
-                with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 步骤后截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''", f"step_''' + str(i+1) + '''_after")
-                        log_info(f"步骤''' + str(i+1) + '''后截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(i+1) + '''后截图")
-'''
-                else:
-                    after_screenshot_code = ''
-                
-                # 失败截图代码
-                if screenshot_enabled == 'YES' and screenshot_timing == 'on_failure':
-                    failure_screenshot_code = '''
-                                # 操作失败截图
-                                with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 操作失败截图"):
-                                    try:
-                                        if not await ui_operations.is_browser_closed():
-                                            await ui_operations.page_screenshot(f"test_''' + product_id.replace("-", "_") + '''", f"step_''' + str(i+1) + '''_failure")
-                                            log_info(f"步骤''' + str(i+1) + '''操作失败截图完成")
-                                    except Exception as screenshot_e:
-                                        log_info(f"失败截图异常: {screenshot_e}")
-                                        raise screenshot_e
-                                '''
-                else:
-                    failure_screenshot_code = ''
-                
-                code_content += '''            # 测试步骤''' + str(i+1) + ''': ''' + step_name + ''' (操作次数: ''' + str(operation_count) + ''')
-            with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + '''"):
-                log_info(f"开始测试步骤''' + str(i+1) + ''' ''' + step_name + ''' 的操作==============")
-'''
-                # 添加步骤前截图代码
-                code_content += before_screenshot_code
-                
-                code_content += '''
-                
-                # 页面滚动子步骤
-                with allure.step(f"测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 页面滚动准备"):
-                    # 需要等待1S后再操作滚动
-                    time.sleep(1)
-                    # 游戏操作前先滚动页面确保图片可见
-                    # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
-                    # 请根据实际的页面滚动进行调整到图片可见
-                    await ui_operations.page_mouse_scroll(delta_x=0, delta_y=1500)
-                
-                # 图片操作子步骤
-                with allure.step(f"测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 游戏图片''' + operation_event + ''' 操作"):
-                    # 执行游戏图片操作 ''' + str(operation_count) + ''' 次
-                    for attempt in range(''' + str(operation_count) + '''):
-                        # 检查浏览器是否已关闭（即使是游戏操作也需要检查浏览器状态）
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，测试被用户中断")
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            time.sleep(''' + str(pause_time) + ''')
-                            success = await ui_operations.click_image_with_fallback(
-                                "''' + img_path + '''", 
-                                confidence=0.5, 
-                                timeout=10
-                            )
-                            
-                            if success:
-                                log_info(f"第{attempt + 1}次操作完成")
-                            else:
-                                log_info(f"第{attempt + 1}次尝试：没有找到图片 '''+img_path+'''")
-                                if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                    log_info(f"所有 {attempt + 1} 次尝试都失败，无法找到图片")
-                                raise Exception(f"图片定位失败：无法找到图片 '''+ img_path +'''")
-                        except Exception as e:
-                            log_info(f"第{attempt + 1}次图片定位失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"所有 '''+ str(operation_count) + ''' 次尝试都失败")
-                                ''' + failure_screenshot_code + '''
-                            raise Exception(f"图片定位失败：无法找到图片 '''+ img_path + '''")
-                time.sleep(1)  # 每次操作后等待1秒
-''' + after_screenshot_code + '''
-            
-'''
-        code_content += f'''            # 等待测试完成
-            time.sleep(3)
-            
-            # 最终检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info("检测到浏览器已关闭，test_''' + product_id.replace("-", "_") + ''' 无法截图")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-            await ui_operations.page_screenshot(f"''' + product_id.replace("-", "_") + '''","over_test_test_step_''' + str(i+1) + '''")
-            time.sleep(2)
-            
-            # 输出图片识别统计信息
-            stats = ui_operations.get_image_stats()
-            log_info(f"[{task_id}] 图片识别统计: 截图识别成功 {stats['screenshot_success']} 次, "
-                    f"pyautogui成功 {stats['pyautogui_success']} 次, "
-                    f"总成功率 {stats['success_rate']:.2%}")
-            
-            log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 完成")
-            
-        except Exception as e:
-            log_info(f"[{task_id}] test_''' + product_id.replace("-", "_") + ''' 失败")
-            raise e
-        finally:
-            # 清理资源
-            if page:
-                await page.close()
-            if context:
-                await context.close()
-            if browser:
-                await browser.close()
+def generate_unique_filename(product_id, system):
+    """生成唯一的文件名，如果文件已存在则添加序号"""
+    from utils.test_file_index import test_file_index
+    return test_file_index.allocate(f"{product_id}_{system}_test.py", 'infix', f"{product_id}_{system}")
 
-'''
-        # 为单个测试案例生成并发执行函数
-        product_addresses = [(product_id, data.get('product_address', ''))]
-        concurrent_function = generate_concurrent_execution_function(product_addresses)
-        code_content += concurrent_function
-        
-        # 更新现有文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code_content)
-            
-        log_info(f"测试文件更新成功: {file_path}")
-            
-    except Exception as e:
-        log_info(f"更新测试文件失败: {e}")
+def find_existing_test_file(product_id, system, project_id=None):
+    """查找实际存在的测试文件（基于内存中的文件名索引）"""
+    from utils.test_file_index import test_file_index
+    log_info(f"查找测试文件 - 产品ID: {product_id}, 系统: {system}, 项目ID: {project_id}")
+    
+    candidates = []
+    # 如果提供了项目ID，优先查找带项目ID的文件
+    if project_id:
+        candidates.append(f"{product_id}_{system}_{project_id}_test.py")
+    candidates.append(f"{product_id}_{system}_test.py")
+    
+    # 带序号的文件名 (格式: {product_id}_{system}_test_{number}.py)
+    number = test_file_index.lowest_number('suffix', f"{product_id}_{system}_test")
+    if number is not None:
+        candidates.append(test_file_index.format_name('suffix', f"{product_id}_{system}_test", number))
+    
+    # 旧格式的文件名 (格式: {product_id}_{system}_{number}_test.py)
+    number = test_file_index.lowest_number('infix', f"{product_id}_{system}")
+    if number is not None:
+        candidates.append(test_file_index.format_name('infix', f"{product_id}_{system}", number))
+    
+    for filename in candidates:
+        if test_file_index.exists_on_disk(filename):
+            log_info(f"找到测试文件: {filename}")
+            return filename
+    
+    log_info(f"未找到匹配的文件，返回None")
+    return None
+
+def run_project_steps(project_id):
+    """解释执行模式：直接读取项目的测试步骤并执行，不生成测试文件"""
+    from utils.step_interpreter import step_interpreter
+    from config.logger import get_log_file_line_count, read_test_execution_logs
+    
+    with get_db_connection_with_retry() as conn:
+        query = adapt_query_placeholders('SELECT product_ids, product_address, test_steps FROM automation_projects WHERE id=?')
+        project_results = execute_query_with_results(conn, query, (project_id,))
+    if not project_results:
+        log_info(f"无法找到项目数据: {project_id}")
+        return False
+    
+    product_ids, product_address, test_steps = project_results[0]
+    data = {
+        'product_ids': json.loads(product_ids) if isinstance(product_ids, str) else product_ids,
+        'product_address': product_address,
+        'test_steps': json.loads(test_steps) if test_steps else []
+    }
+    
+    start_line_number = get_log_file_line_count()
+    if project_id in running_tests:
+        running_tests[project_id]['start_line_number'] = start_line_number
+    
+    outcome = step_interpreter.run(
+        data['test_steps'],
+        resolve_test_product_addresses(data),
+        is_cancelled=lambda: running_tests.get(project_id, {}).get('cancelled', False),
+        fail_fast=running_tests.get(project_id, {}).get('fail_fast'),
+        only_functions=running_tests.get(project_id, {}).get('only_functions')
+    )
+    
+    # 收集执行期间的日志和每个地址的结果，写入执行记录
+    execution_id = running_tests.get(project_id, {}).get('execution_id')
+    if execution_id:
+        end_line_number = get_log_file_line_count()
+        if end_line_number > start_line_number:
+            test_execution_log = read_test_execution_logs(start_line_number + 1, end_line_number)
+        else:
+            test_execution_log = "未检测到新的日志内容"
+        result_lines = [
+            f"{r['function']} ({r['address']}): {'成功' if r['success'] else '失败 - ' + r['error']}"
+            for r in outcome['results']
+        ]
+        update_execution_detailed_log(execution_id,
+            f"=== 测试执行过程日志 (行数范围: {start_line_number + 1}-{end_line_number}) ===\n{test_execution_log}\n\n"
+            f"=== 解释执行结果 ===\n" + "\n".join(result_lines))
+        update_execution_address_results(execution_id, project_id, outcome['results'])
+    
+    return outcome['success']
 
-def run_test_in_background(project_id, start_time, execution_id, current_user):
+def run_test_in_background(project_id, start_time, execution_id, current_user, mode='file'):
     """在后台运行测试"""
     try:
-        # 获取项目信息
-        with get_db_connection_with_retry() as conn:
-            query = adapt_query_placeholders('SELECT product_ids, `system`, environment FROM automation_projects WHERE id=?')
-            project_results = execute_query_with_results(conn, query, (project_id,))
-            project = project_results[0] if project_results else None
+        if mode == 'interpreter':
+            log_info(f"解释执行项目 {project_id} 的测试步骤")
+            result = run_project_steps(project_id)
+        else:
+            # 获取项目信息
+            with get_db_connection_with_retry() as conn:
+                query = adapt_query_placeholders('SELECT product_ids, `system`, environment FROM automation_projects WHERE id=?')
+                project_results = execute_query_with_results(conn, query, (project_id,))
+                project = project_results[0] if project_results else None
         
-        if not project:
-            return
+            if not project:
+                return
         
-        product_ids = json.loads(project[0])
-        system = project[1]
-        environment = project[2]
+            product_ids = json.loads(project[0])
+            system = project[1]
+            environment = project[2]
         
-        # 执行测试文件 - 使用文件管理器查找正确的文件
-        from utils.file_manager import file_manager
+            # 执行测试文件 - 使用文件管理器查找正确的文件
+            from utils.file_manager import file_manager
         
-        # 获取项目的文件映射信息
-        file_mapping = file_manager.get_project_file_mapping(project_id)
+            # 获取项目的文件映射信息
+            file_mapping = file_manager.get_project_file_mapping(project_id)
         
-        if file_mapping:
-            # 使用映射中的文件名
-            filename = file_mapping['file_name']
-            log_info(f"执行测试文件: {filename}")
-            result = run_pytest_file(filename, project_id)
-        else:
-            # 如果没有文件映射，使用旧的逻辑作为后备
-            # 从数据库中获取项目数据
-            with get_db_connection_with_retry() as conn:
-                query = adapt_query_placeholders('SELECT product_ids, `system`, environment, test_steps FROM automation_projects WHERE id=?')
-                project_data = execute_query_with_results(conn, query, (project_id,))
-                project_data = project_data[0] if project_data else None
+            if file_mapping:
+                # 使用映射中的文件名
+                filename = file_mapping['file_name']
+                log_info(f"执行测试文件: {filename}")
+                result = run_pytest_file(filename, project_id)
+            else:
+                # 如果没有文件映射，使用旧的逻辑作为后备
+                # 从数据库中获取项目数据
+                with get_db_connection_with_retry() as conn:
+                    query = adapt_query_placeholders('SELECT product_ids, `system`, environment, test_steps FROM automation_projects WHERE id=?')
+                    project_data = execute_query_with_results(conn, query, (project_id,))
+                    project_data = project_data[0] if project_data else None
             
-            if project_data:
-                # 构建data字典
-                data = {
-                    'product_ids': json.loads(project_data[0]) if isinstance(project_data[0], str) else project_data[0],
-                    'system': project_data[1],
-                    'environment': project_data[2],
-                    'test_steps': json.loads(project_data[3]) if project_data[3] else []
-                }
+                if project_data:
+                    # 构建data字典
+                    data = {
+                        'product_ids': json.loads(project_data[0]) if isinstance(project_data[0], str) else project_data[0],
+                        'system': project_data[1],
+                        'environment': project_data[2],
+                        'test_steps': json.loads(project_data[3]) if project_data[3] else []
+                    }
                 
-                if len(data['product_ids']) == 1:
                     clean_product_id = data['product_ids'][0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
                     filename = generate_unique_filename(clean_product_id, data['system'])
-                    generate_single_test_file(filename, data, data['product_ids'][0])
+                    test_code_generator.write(filename, data, resolve_test_product_addresses(data))
                 else:
-                    for i, product_id in enumerate(data['product_ids'], 1):
-                        clean_product_id = product_id.replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                        filename = generate_unique_filename(clean_product_id, data['system'])
-                        generate_single_test_file(filename, data, product_id)
-            else:
-                log_info(f"无法找到项目数据: {project_id}")
-                result = False
+                    log_info(f"无法找到项目数据: {project_id}")
+                    result = False
         
         # 计算结束时间
         end_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -3246,42 +2295,23 @@ def check_process_status(project_id):
     return False
 
 def analyze_test_file(file_path):
-    """分析测试文件，检测是否有多个测试方法和并发方法"""
+    """分析测试文件，检测是否有多个测试方法和并发方法（基于缓存的AST摘要）"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 检测测试方法数量
-        test_methods = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            # 检测以 test_ 开头的函数定义
-            if line.startswith('async def test_') or line.startswith('def test_'):
-                method_name = line.split('(')[0].replace('async def ', '').replace('def ', '')
-                test_methods.append(method_name)
-        
-        # 检查是否有并发方法
-        has_concurrent_method = 'test_concurrent_independent_browsers' in test_methods
-        
-        return {
-            'test_methods': test_methods,
-            'method_count': len(test_methods),
-            'has_concurrent_method': has_concurrent_method,
-            'should_use_concurrent': len(test_methods) > 1 and has_concurrent_method
-        }
+        return test_file_validator.get_summary(file_path)
     except Exception as e:
         log_info(f"分析测试文件失败: {e}")
         return {
             'test_methods': [],
             'method_count': 0,
             'has_concurrent_method': False,
-            'should_use_concurrent': False
+            'should_use_concurrent': False,
+            'valid': False,
+            'error': {'type': type(e).__name__, 'message': str(e), 'line': None, 'column': None, 'text': ''}
         }
 
 def run_pytest_file(filename, project_id=None):
     """执行pytest文件"""
+    result_file = None
     try:
         file_path = os.path.join('Test_Case', filename)
         if not os.path.exists(file_path):
@@ -3301,6 +2331,9 @@ def run_pytest_file(filename, project_id=None):
         # 分析测试文件
         analysis = analyze_test_file(file_path)
         log_info(f"测试文件分析结果: {analysis}")
+        if not analysis['valid']:
+            log_error(f"测试文件无法编译，跳过执行: {file_path}, {test_file_validator.format_error(analysis['error'])}")
+            return False
         
         # 构建pytest命令
         if analysis['should_use_concurrent']:
@@ -3313,9 +2346,19 @@ def run_pytest_file(filename, project_id=None):
         
         # 设置测试环境变量
         env = os.environ.copy()
+        # 执行进程通过结果文件回传每个测试函数的结果
+        result_file = os.path.join(tempfile.gettempdir(), f"automation_result_{project_id or 0}_{uuid.uuid4().hex}.json")
+        env[concurrent_runner.RESULT_FILE_ENV] = result_file
         if project_id:
             env['PROJECT_ID'] = str(project_id)
             log_info(f"设置环境变量 PROJECT_ID: {project_id}")
+            fail_fast = running_tests.get(project_id, {}).get('fail_fast')
+            if fail_fast is not None:
+                env[concurrent_runner.FAIL_FAST_ENV] = '1' if fail_fast else '0'
+            only_functions = running_tests.get(project_id, {}).get('only_functions')
+            if only_functions:
+                env[concurrent_runner.ONLY_FUNCTIONS_ENV] = ','.join(only_functions)
+                log_info(f"只重跑测试函数: {env[concurrent_runner.ONLY_FUNCTIONS_ENV]}")
             
             # 获取项目详细信息以设置更多环境变量
             try:
@@ -3413,6 +2456,19 @@ def run_pytest_file(filename, project_id=None):
         if stderr:
             detailed_log += f"pytest stderr:\n{stderr}\n"
         
+        # 读取执行进程回传的每个测试函数的结果
+        address_results = None
+        if os.path.exists(result_file):
+            address_results = concurrent_runner.read_results(result_file)
+        if address_results:
+            if project_id and project_id in running_tests:
+                running_tests[project_id]['address_results'] = address_results
+            result_lines = [
+                f"{r['function']}: {'成功' if r['success'] else ('已取消 - ' if r['cancelled'] else '失败 - ') + str(r['error'])}"
+                for r in address_results
+            ]
+            detailed_log += "并发执行结果:\n" + "\n".join(result_lines) + "\n"
+        
         # 记录到系统日志
         if stdout:
             log_info(f"pytest stdout: {stdout}")
@@ -3456,6 +2512,9 @@ def run_pytest_file(filename, project_id=None):
             except Exception as e:
                 log_info(f"从数据库获取执行记录失败: {e}")
         
+        if execution_id and address_results:
+            update_execution_address_results(execution_id, project_id, address_results)
+        
         if execution_id:
             # 获取测试结束时的日志行数
             end_line_number = get_log_file_line_count()
@@ -3518,6 +2577,13 @@ def run_pytest_file(filename, project_id=None):
             del running_tests[project_id]
             log_info(f"异常后清理项目 {project_id} 的运行记录")
         return False
+    finally:
+        # 超时、取消和异常退出时执行进程可能已写入结果文件，统一在这里删除
+        if result_file and os.path.exists(result_file):
+            try:
+                os.remove(result_file)
+            except OSError as e:
+                log_info(f"删除执行结果文件失败: {result_file}, {e}")
 
 @automation_bp.route('/products', methods=['GET'])
 def get_products_for_automation():
@@ -3805,6 +2871,11 @@ def monitor_running_processes():
                             del running_tests[project_id]
                             log_info(f"进程对象失效，清理项目 {project_id} 的运行记录")
                 else:
+                    # 解释执行模式没有子进程，执行线程存活期间由其自行维护状态
+                    thread = test_info.get('thread')
+                    if test_info.get('mode') == 'interpreter' and thread and thread.is_alive():
+                        continue
+                    
                     # 没有进程信息，可能是run_test_in_background已经完成但还没有清理
                     log_info(f"项目 {project_id} 没有进程信息，检查是否需要清理")
                     
@@ -4031,15 +3102,9 @@ def get_project_code(project_id):
                         'test_steps': []  # 这里可能需要从数据库获取测试步骤
                     }
                     
-                    if len(data['product_ids']) == 1:
-                        clean_product_id = data['product_ids'][0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                        filename = generate_unique_filename(clean_product_id, data['system'])
-                        generate_single_test_file(filename, data, data['product_ids'][0])
-                    else:
-                        for i, product_id in enumerate(data['product_ids'], 1):
-                            clean_product_id = product_id.replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
-                            filename = generate_unique_filename(clean_product_id, data['system'])
-                            generate_single_test_file(filename, data, product_id)
+                    clean_product_id = data['product_ids'][0].replace('"', '').replace('[', '').replace(']', '').replace('-', '_')
+                    filename = generate_unique_filename(clean_product_id, data['system'])
+                    test_code_generator.write(filename, data, resolve_test_product_addresses(data))
             else:
                 log_info(f"读取现有文件成功，文件大小: {len(code_content)} 字符")
                 log_info(f"文件不存在，生成默认代码，代码长度: {len(code_content)} 字符")
@@ -4093,6 +3158,17 @@ def save_project_code(project_id):
         code_content = data['code']
         log_info(f"接收到的代码内容长度: {len(code_content)}")
         
+        # 保存前编译校验，语法错误连同位置返回给编辑器
+        compile_error = test_file_validator.validate_source(code_content, f'project_{project_id}.py')
+        if compile_error:
+            return jsonify({
+                'success': False,
+                'message': f'代码编译失败: {test_file_validator.format_error(compile_error)}',
+                'data': {
+                    'compile_error': compile_error
+                }
+            }), 400
+        
         # 获取项目信息
         with get_db_connection_with_retry() as conn:            
             query = adapt_query_placeholders('''
@@ -4121,6 +3197,9 @@ def save_project_code(project_id):
                     'message': '保存文件失败'
                 }), 500
             
+            # 刷新AST摘要缓存
+            test_file_validator.validate_file(file_path, code_content)
+            
             # 获取文件映射信息
             file_mapping = file_manager.get_project_file_mapping(project_id)
             filename = file_mapping['file_name'] if file_mapping else 'unknown.py'
@@ -4233,796 +3312,6 @@ def run_connection_test(test_file, project_id, system, product_type, environment
             'details': f'异常类型: {type(e).__name__}'
         } 
 
-def generate_multi_product_test_file(filename, data, product_addresses):
-    """生成多产品地址的测试文件，每个地址对应一个独立函数"""
-    try:
-        file_path = os.path.join('Test_Case', filename)
-        
-        # 生成代码头部
-        code_content = '''
-import time
-import sys
-import pyautogui
-import numpy
-import pytest
-import asyncio
-import os
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-import requests
-import allure
-from config.logger import log_info
-from playwright.async_api import async_playwright
-from utils.screen_manager import screen_manager
-from utils.ui_operations import UIOperations
-from typing import Tuple, List
-from Base_ENV.config import *
-
-'''
-        
-        # 为每个产品地址生成独立的函数
-        for i, (product_id, product_address) in enumerate(product_addresses,1):
-            # 生成函数名，使用产品ID
-            function_name = f"test_{product_id.replace('-', '_')}_{i}"
-            
-            code_content += '''async def ''' + function_name + '''(browser_args):
-    """
-    为 ''' + function_name + ''' 创建完全独立的浏览器实例，使用指定的浏览器参数
-    """
-    task_id = "''' + function_name + '''"
-    async with async_playwright() as p:
-        browser = None
-        context = None
-        page = None
-        try:
-            # 启动独立的浏览器实例
-            browser = await p.chromium.launch(headless=False, args=browser_args)
-            context = await browser.new_context(no_viewport=True)
-            page = await context.new_page()
-                    
-            # 创建UIOperations实例并使用混合图片识别机制，为每个任务创建独立实例
-            ui_operations = UIOperations(page, task_id=task_id)
-            
-            # 配置参数
-            website_url = "''' + product_address + '''"
-            
-            # 导航到目标网站
-            await ui_operations.navigate_to(website_url)
-            
-            # 初始检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info(f"[{task_id}] 检测到浏览器已关闭，''' + function_name + ''' 测试无法继续")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-'''
-            
-            # 生成测试步骤代码
-            for j, step in enumerate(data['test_steps']):
-                step_name = step.get('step_name', f'step_{j+1}')
-                operation_type = step.get('operation_type', 'web')
-                operation_event = step.get('operation_event', 'click')
-                operation_params = step.get('operation_params', '').replace('"', "'")
-                input_value = step.get('input_value', '').replace('"', "'")
-            
-                # 获取标签页跳转配置
-                tab_switch_action = step.get('tab_switch_action', 'no')
-                tab_target_url = step.get('tab_target_url', '')
-                
-                # 安全地转换数字字段，确保它们是有效的正整数
-                try:
-                    operation_count = max(1, int(step.get('operation_count', 1)))
-                except (ValueError, TypeError):
-                    operation_count = 1
-                    log_info(f"警告: 步骤 {j+1} 的操作次数无效，使用默认值 1")
-                
-                try:
-                    pause_time = max(0, int(step.get('pause_time', 1)))
-                except (ValueError, TypeError):
-                    pause_time = 1
-                    log_info(f"警告: 步骤 {j+1} 的暂停时间无效，使用默认值 1")
-                
-                if operation_type == 'web':
-                    # 生成截图代码变量
-                    screenshot_enabled = step.get('screenshot_enabled', 'NO').upper()
-                    screenshot_config = step.get('screenshot_config', {})
-                    screenshot_timing = screenshot_config.get('timing', 'none')
-                    
-                    # 步骤前截图代码
-                    if screenshot_enabled == 'YES' and screenshot_timing in ['before', 'both']:
-                        before_screenshot_code = '''
-                # 步骤前截图
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 步骤前截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"''' + function_name + '''", f"step_''' + str(j+1) + '''_before")
-                        log_info(f"步骤''' + str(j+1) + '''前截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(j+1) + '''前截图")
-'''
-                    else:
-                        before_screenshot_code = ''
-                    
-                    # 步骤后截图代码
-                    if screenshot_enabled == 'YES' and screenshot_timing in ['after', 'both']:
-                        after_screenshot_code = '''
-                # 步骤后截图
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 步骤后截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"''' + function_name + '''", f"step_''' + str(j+1) + '''_after")
-                        log_info(f"步骤''' + str(j+1) + '''后截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(j+1) + '''后截图")
-'''
-                    else:
-                        after_screenshot_code = ''
-                    
-                    # 失败截图代码
-                    if screenshot_enabled == 'YES' and screenshot_timing == 'on_failure':
-                        failure_screenshot_code = '''
-                        # 操作失败截图
-                            with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 操作失败截图"):
-                            try:
-                                if not await ui_operations.is_browser_closed():
-                                    await ui_operations.page_screenshot(f"''' + function_name + '''", f"step_''' + str(j+1) + '''_failure")
-                                    log_info(f"步骤''' + str(j+1) + '''操作失败截图完成")
-                            except Exception as screenshot_e:
-                                log_info(f"失败截图异常: {screenshot_e}")
-                                raise screenshot_e
-                        '''
-                    else:
-                        failure_screenshot_code = ''
-                    
-                    # 检查是否需要跳转到新标签页 - 需要启用跳转且有目标URL
-                    tab_switch_enabled = step.get('tab_switch_enabled', 'no')
-                    
-                    # 生成统一的测试步骤包装
-                    code_content += f'''            
-            # 测试步骤{j+1}: {step_name} (操作次数: {operation_count})
-            with allure.step("测试步骤{j+1}: {step_name}"):
-                log_info(f"开始测试步骤{j+1} {step_name} 的操作==============")
-'''
-                    # 添加步骤前截图代码
-                    code_content += before_screenshot_code
-                    
-                    code_content += '''
-'''
-                    
-                    # 如果需要标签页跳转，添加跳转代码
-                    if tab_switch_enabled == 'yes' and tab_target_url and tab_target_url.strip():
-                        code_content += f'''                
-                # 标签页跳转配置
-                log_info(f"[{{task_id}}] 正在打开新标签页: {tab_target_url}")
-                new_page = await ui_operations.open_new_tab_and_navigate("{tab_target_url}")
-                
-                # 获取所有标签页信息并确保切换到正确的标签页
-                all_tabs = await ui_operations.get_all_tabs()
-                
-                # 公共断言方法，断言URL是否存在
-                with allure.step("测试步骤{j+1}: 公共断言URL是否存在"):
-                    await ui_operations.url_assert_exists("{tab_target_url}")
-                time.sleep(1)  # 等待页面加载
-                
-                # 公共断言方法，断言元素是否存在
-                with allure.step("测试步骤''' + str(j+1) + ''': 公共断言元素是否存在"):
-                    await ui_operations.elem_assert_exists("''' + operation_params + '''")
-'''
-                    
-                    # 添加自定义断言代码
-                    assertion_code = generate_assertion_code(step, j+1)
-                    if assertion_code:
-                        code_content += assertion_code
-                    
-                    # 构造操作调用语句与文案后缀
-                    if operation_event == 'input':
-                        operation_invoke = 'await ui_operations.elem_input("' + operation_params + '", "' + input_value + '")'
-                    else:
-                        operation_invoke = 'await ui_operations.elem_' + operation_event + '("' + operation_params + '")'
-                    
-                    code_content += f'''
-                with allure.step("测试步骤{j+1}: {step_name} - {operation_event} 操作 ({operation_params})"):
-                    time.sleep({pause_time})
-                    
-                    # 执行Web元素操作 {operation_count} 次
-                    for attempt in range({operation_count}):
-                        # 检查浏览器是否已关闭
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，''' + function_name + ''' 测试被用户中断")
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            log_info(f"[{task_id}] 执行第{attempt + 1}次操作: ''' + operation_event + ''' on ''' + operation_params + '''")
-                            # 使用安全操作机制，带重试
-                            ''' + operation_invoke + '''
-                            time.sleep(1)  # 每次操作后等待1秒
-                        except Exception as e:
-                            # 检查是否是浏览器关闭导致的异常
-                            error_msg = str(e).lower()
-                            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
-                                log_info(f"检测到浏览器连接异常，''' + function_name + ''' 可能被用户关闭")
-                                raise Exception("BROWSER_CLOSED_BY_USER")
-                            log_info(f"[{task_id}]第{attempt + 1}次操作失败")
-                            if attempt == ''' + str(operation_count - 1) + ''':  # 最后一次尝试失败
-                                log_info(f"所有操作均失败！")
-                                ''' + failure_screenshot_code + '''
-                time.sleep(1)  # 每次操作后等待1秒
-''' + after_screenshot_code + '''
-            
-'''
-                elif operation_type == 'game':
-                    img_path = operation_params.replace('\\', '/')
-                    # 根据操作事件选择对应的pyautogui方法
-                    if operation_event == 'double_click':
-                        click_action = 'pyautogui.doubleClick(center_x, center_y)'
-                    else:
-                        click_action = 'pyautogui.click(center_x, center_y)'
-                    
-                    code_content += f'''            
-            # 测试步骤{j+1}: {step_name} (操作次数: {operation_count})
-            with allure.step("{step_name} - 游戏图片{operation_event} 操作 ({img_path})"):
-                # 需要等待1S后再操作滚动
-                time.sleep(1)
-                # 游戏操作前先滚动页面确保图片可见
-                # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
-                # 请根据实际的页面滚动进行调整到图片可见
-                await ui_operations.page_mouse_scroll(delta_x=0, delta_y=1500)
-                
-                # 执行游戏图片操作 {operation_count} 次
-                for attempt in range({operation_count}):
-                    # 检查浏览器是否已关闭（即使是游戏操作也需要检查浏览器状态）
-                    if await ui_operations.is_browser_closed():
-                        log_info(f"[{{task_id}}] 检测到浏览器已关闭，{function_name} 测试被用户中断")
-                        raise Exception("BROWSER_CLOSED_BY_USER")
-                    
-                    try:
-                        time.sleep({pause_time})
-                        success = await ui_operations.click_image_with_fallback(
-                            "{img_path}",
-                            confidence=0.5, 
-                            timeout=10
-                        )
-                        
-                        if success:
-                            log_info(f"[{{task_id}}] 第{attempt + 1}次操作完成")
-                        else:
-                            log_info(f"[{{task_id}}] 第{attempt + 1}次尝试：没有找到图片 {img_path}")
-                            if attempt == {operation_count - 1}:  # 最后一次尝试失败
-                                log_info(f"[{{task_id}}]  所有 {operation_count} 次尝试都失败，无法找到图片")
-                            raise Exception(f"图片定位失败：无法找到图片 {img_path}")
-                    except Exception as e:
-                        log_info(f"[{{task_id}}]  第{attempt + 1}次图片定位失败")
-                        if attempt == {operation_count - 1}:  # 最后一次尝试失败
-                            log_info(f"[{{task_id}}]  所有 {operation_count} 次尝试都失败")
-                        raise Exception(f"图片定位失败：无法找到图片 {img_path}")
-                    time.sleep(1)  # 每次操作后等待1秒
-            
-'''
-            
-            code_content += f'''            # 等待测试完成
-            time.sleep(3)
-            
-            # 最终检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info("检测到浏览器已关闭，''' + function_name + ''' 无法截图")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-            await ui_operations.page_screenshot("''' + function_name + '''","over_test_test_step_''' + str(j+1) + '''")
-            time.sleep(2)
-            
-            # 输出图片识别统计信息
-            stats = ui_operations.get_image_stats()
-            log_info(f"[{task_id}] 图片识别统计: 截图识别成功 {stats['screenshot_success']} 次, "
-                    f"pyautogui成功 {stats['pyautogui_success']} 次, "
-                    f"总成功率 {stats['success_rate']:.2%}")
-            
-            log_info(f"[{task_id}] ''' + function_name + ''' 完成")
-            
-        except Exception as e:
-            log_info(f"[{task_id}] ''' + function_name + ''' 失败")
-            raise e
-        finally:
-            # 清理资源
-            if page:
-                await page.close()
-            if context:
-                await context.close()
-            if browser:
-                await browser.close()
-            
-
-'''
-        
-        # 生成动态并发执行函数
-        concurrent_function = generate_concurrent_execution_function(product_addresses)
-        code_content += concurrent_function
-        
-        # 写入文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code_content)
-            
-    except Exception as e:
-        log_info(f"生成多产品测试文件失败: {e}")
-        raise e
-
-def update_multi_product_test_file(filename, data, product_addresses):
-    """更新多产品地址的测试文件"""
-    try:
-        file_path = os.path.join('Test_Case', filename)
-        
-        # 生成代码内容（与generate_multi_product_test_file相同的逻辑）
-        code_content = '''
-import time
-import sys
-import pyautogui
-import numpy
-import pytest
-import asyncio
-import os
-# 添加项目根目录到Python路径
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-import requests
-import allure
-from config.logger import log_info
-from playwright.async_api import async_playwright
-from utils.screen_manager import screen_manager
-from utils.ui_operations import UIOperations
-from typing import Tuple, List
-from Base_ENV.config import *
-
-'''
-        
-        # 为每个产品地址生成独立的函数
-        for i, (product_id, product_address) in enumerate(product_addresses,1):
-            # 生成函数名，使用产品ID
-            function_name = f"test_{product_id.replace('-', '_')}_{i}"
-            
-            code_content += '''async def ''' + function_name + '''(browser_args):
-    """
-    为 ''' + function_name + ''' 创建完全独立的浏览器实例，使用指定的浏览器参数
-    """
-    task_id = "''' + function_name + '''"
-    async with async_playwright() as p:
-        browser = None
-        context = None
-        page = None
-        try:
-            # 启动独立的浏览器实例
-            browser = await p.chromium.launch(headless=False, args=browser_args)
-            context = await browser.new_context(no_viewport=True)
-            page = await context.new_page()
-                    
-            # 创建UIOperations实例并使用混合图片识别机制，为每个任务创建独立实例
-            ui_operations = UIOperations(page, task_id=task_id)
-            
-            # 配置参数
-            website_url = "''' + product_address + '''"
-            
-            # 导航到目标网站
-            await ui_operations.navigate_to(website_url)
-            
-            # 初始检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info(f"[{task_id}] 检测到浏览器已关闭，''' + function_name + ''' 测试无法继续")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-'''
-            
-            # 生成测试步骤代码
-            for j, step in enumerate(data['test_steps']):
-                step_name = step.get('step_name', f'step_{j+1}')
-                operation_type = step.get('operation_type', 'web')
-                operation_event = step.get('operation_event', 'click')
-                operation_params = step.get('operation_params', '').replace('"', "'")
-                input_value = step.get('input_value', '').replace('"', "'")
-            
-                # 获取标签页跳转配置
-                tab_switch_action = step.get('tab_switch_action', 'no')
-                tab_target_url = step.get('tab_target_url', '')
-                
-                # 安全地转换数字字段，确保它们是有效的正整数
-                try:
-                    operation_count = max(1, int(step.get('operation_count', 1)))
-                except (ValueError, TypeError):
-                    operation_count = 1
-                    log_info(f"警告: 步骤 {j+1} 的操作次数无效，使用默认值 1")
-                
-                try:
-                    pause_time = max(0, int(step.get('pause_time', 1)))
-                except (ValueError, TypeError):
-                    pause_time = 1
-                    log_info(f"警告: 步骤 {j+1} 的暂停时间无效，使用默认值 1")
-                
-                if operation_type == 'web':
-                    # 生成截图代码变量
-                    screenshot_enabled = step.get('screenshot_enabled', 'NO').upper()
-                    screenshot_config = step.get('screenshot_config', {})
-                    screenshot_timing = screenshot_config.get('timing', 'none')
-                    
-                    # 步骤前截图代码
-                    if screenshot_enabled == 'YES' and screenshot_timing in ['before', 'both']:
-                        before_screenshot_code = '''
-                # 步骤前截图
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 步骤前截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"''' + function_name + '''", f"step_''' + str(j+1) + '''_before")
-                        log_info(f"步骤''' + str(j+1) + '''前截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(j+1) + '''前截图")
-'''
-                    else:
-                        before_screenshot_code = ''
-                    
-                    # 步骤后截图代码
-                    if screenshot_enabled == 'YES' and screenshot_timing in ['after', 'both']:
-                        after_screenshot_code = '''
-                # 步骤后截图
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 步骤后截图"):
-                    if not await ui_operations.is_browser_closed():
-                        await ui_operations.page_screenshot(f"''' + function_name + '''", f"step_''' + str(j+1) + '''_after")
-                        log_info(f"步骤''' + str(j+1) + '''后截图完成")
-                    else:
-                        log_info(f"浏览器已关闭，跳过步骤''' + str(j+1) + '''后截图")
-'''
-                    else:
-                        after_screenshot_code = ''
-                    
-                    # 失败截图代码
-                    if screenshot_enabled == 'YES' and screenshot_timing == 'on_failure':
-                        failure_screenshot_code = '''
-                            # 操作失败截图
-                            with allure.step("测试步骤''' + str(i+1) + ''': ''' + step_name + ''' - 操作失败截图"):
-                                try:
-                                    if not await ui_operations.is_browser_closed():
-                                        await ui_operations.page_screenshot(f"''' + function_name + '''", f"step_''' + str(j+1) + '''_failure")
-                                        log_info(f"步骤''' + str(j+1) + '''操作失败截图完成")
-                                except Exception as screenshot_e:
-                                    log_info(f"失败截图异常: {screenshot_e}")
-                                    raise screenshot_e
-                            '''
-                    else:
-                        failure_screenshot_code = ''
-                    
-                    # 检查是否需要跳转到新标签页 - 需要启用跳转且有目标URL
-                    tab_switch_enabled = step.get('tab_switch_enabled', 'no')
-                    if tab_switch_enabled == 'yes' and tab_target_url and tab_target_url.strip():
-                        # 有标签页跳转的Web操作 - 统一包装
-                        code_content += '''            # 测试步骤''' + str(j+1) + ''': ''' + step_name + ''' (操作次数: ''' + str(operation_count) + ''')
-            with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + '''"):
-                log_info(f"开始测试步骤''' + str(j+1) + ''' ''' + step_name + ''' 的操作==============")
-'''
-                        # 添加步骤前截图代码
-                        code_content += before_screenshot_code
-                        
-                        code_content += '''
-                
-                # 标签页跳转子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 标签页跳转到: ''' + tab_target_url + '''"):
-                    # 打开新标签页并导航到目标URL
-                    log_info(f"[{task_id}] 正在打开新标签页: ''' + tab_target_url + '''")
-                    new_page = await ui_operations.open_new_tab_and_navigate("''' + tab_target_url + '''")
-                    
-                    # 获取所有标签页信息并确保切换到正确的标签页
-                    all_tabs = await ui_operations.get_all_tabs()
-                    time.sleep(1)  # 等待页面加载
-                
-                # URL断言子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': 公共断言URL是否存在"):
-                    await ui_operations.url_assert_exists("''' + tab_target_url + '''")
-                
-                # 元素断言子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': 公共断言元素是否存在"):
-                    await ui_operations.elem_assert_exists("'''+operation_params+'''")
-'''
-                        
-                        # 添加自定义断言代码
-                        assertion_code = generate_assertion_code(step, j+1)
-                        if assertion_code:
-                            code_content += assertion_code
-                        
-                        # 构造操作调用语句与文案后缀（web）
-                        if operation_event == 'input':
-                            operation_invoke = 'await ui_operations.elem_input("' + operation_params + '", "' + input_value + '")'
-                        else:
-                            operation_invoke = 'await ui_operations.elem_' + operation_event + '("' + operation_params + '")'
-                        
-                        code_content += '''
-                # 操作执行子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - ''' + operation_event + ''' 操作 (''' + operation_params + ''')"):
-                    time.sleep(''' + str(pause_time) + ''')
-                    # 执行Web元素操作 ''' + str(operation_count) + ''' 次
-                    for attempt in range(''' + str(operation_count) + '''):
-                        # 检查浏览器是否已关闭
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，''' + function_name + ''' 测试被用户中断")
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            log_info(f"[{task_id}] 执行第{attempt + 1}次操作: ''' + operation_event + ''' on ''' + operation_params + '''")
-                            # 使用安全操作机制，带重试
-                            ''' + operation_invoke + '''
-                            time.sleep(1)  # 每次操作后等待1秒
-                        except Exception as e:
-                            # 检查是否是浏览器关闭导致的异常
-                            error_msg = str(e).lower()
-                            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
-                                log_info(f"[{task_id}] 检测到浏览器连接异常，''' + function_name + ''' 可能被用户关闭")
-                                raise Exception("BROWSER_CLOSED_BY_USER")
-                            log_info(f"[{task_id}]第{attempt + 1}次操作失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"所有操作均失败！")
-                                ''' + failure_screenshot_code + '''
-                time.sleep(1)  # 每次操作后等待1秒
-''' + after_screenshot_code + '''
-            
-'''
-                    else:
-                        # 无标签页跳转的Web操作 - 统一包装  
-                        code_content += '''            # 测试步骤''' + str(j+1) + ''': ''' + step_name + ''' (操作次数: ''' + str(operation_count) + ''')
-            with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + '''"):
-                log_info(f"开始测试步骤''' + str(j+1) + ''' ''' + step_name + ''' 的操作==============")
-'''
-                        # 添加步骤前截图代码
-                        code_content += before_screenshot_code
-                        
-                        code_content += '''
-                
-                # 元素断言子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': 公共断言元素是否存在"):
-                    await ui_operations.elem_assert_exists("''' + operation_params + '''")
-'''
-                        
-                        # 添加自定义断言代码
-                        assertion_code = generate_assertion_code(step, j+1)
-                        if assertion_code:
-                            code_content += assertion_code
-                        
-                        # 构造操作调用语句与文案后缀（web）
-                        if operation_event == 'input':
-                            operation_invoke = 'await ui_operations.elem_input("' + operation_params + '", "' + input_value + '")'
-                        else:
-                            operation_invoke = 'await ui_operations.elem_' + operation_event + '("' + operation_params + '")'
-                        
-                        code_content += '''
-                # 操作执行子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - ''' + operation_event + ''' 操作 (''' + operation_params + ''')"):
-                    time.sleep(''' + str(pause_time) + ''')
-                    # 执行Web元素操作 ''' + str(operation_count) + ''' 次
-                    for attempt in range(''' + str(operation_count) + '''):
-                        # 检查浏览器是否已关闭
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，''' + function_name + ''' 测试被用户中断")
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            log_info(f"[{task_id}] 执行第{attempt + 1}次操作: ''' + operation_event + ''' on ''' + operation_params + '''")
-                            # 使用安全操作机制，带重试
-                            ''' + operation_invoke + '''
-                            time.sleep(1)  # 每次操作后等待1秒
-                        except Exception as e:
-                            # 检查是否是浏览器关闭导致的异常
-                            error_msg = str(e).lower()
-                            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
-                                log_info(f"[{task_id}] 检测到浏览器连接异常，'''+function_name+''' 可能被用户关闭")
-                                raise Exception("BROWSER_CLOSED_BY_USER")
-                            log_info(f"[{task_id}]第{attempt + 1}次操作失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"所有操作均失败！")
-                                ''' + failure_screenshot_code + '''
-                time.sleep(1)  # 每次操作后等待1秒
-''' + after_screenshot_code + '''
-            
-'''
-                elif operation_type == 'game':
-                    img_path = operation_params.replace('\\', '/')
-                    # 根据操作事件选择对应的pyautogui方法
-                    if operation_event == 'double_click':
-                        click_action = 'pyautogui.doubleClick(center_x, center_y)'
-                    else:
-                        click_action = 'pyautogui.click(center_x, center_y)'
-                    
-                    code_content += '''            # 测试步骤''' + str(j+1) + ''': ''' + step_name + ''' (操作次数: ''' + str(operation_count) + ''')
-            with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + '''"):
-                log_info(f"开始测试步骤''' + str(j+1) + ''' ''' + step_name + ''' 的操作==============")
-                
-                # 页面滚动子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 页面滚动准备"):
-                    # 需要等待1S后再操作滚动
-                    time.sleep(1)
-                    # 游戏操作前先滚动页面确保图片可见
-                    # 此功能需要由编写者确认需要滚动到的页面位置是什么，默认参数：delta_x=0, delta_y=1100
-                    # 请根据实际的页面滚动进行调整到图片可见
-                    await ui_operations.page_mouse_scroll(delta_x=0, delta_y=1500)
-                
-                # 图片操作子步骤
-                with allure.step("测试步骤''' + str(j+1) + ''': ''' + step_name + ''' - 游戏图片''' + operation_event + ''' 操作"):
-                    # 执行游戏图片操作 '''+str(operation_count)+''' 次
-                    for attempt in range('''+str(operation_count)+'''):
-                        # 检查浏览器是否已关闭（即使是游戏操作也需要检查浏览器状态）
-                        if await ui_operations.is_browser_closed():
-                            log_info("检测到浏览器已关闭，'''+function_name+''' 测试被用户中断")
-                            raise Exception("BROWSER_CLOSED_BY_USER")
-                        
-                        try:
-                            time.sleep('''+str(pause_time)+''')
-                            success = await ui_operations.click_image_with_fallback(
-                                "'''+img_path+'''", 
-                                confidence=0.5, 
-                                timeout=10
-                            )
-                            
-                            if success:
-                                log_info(f"[{task_id}] 第{attempt + 1}次操作完成")
-                            else:
-                                log_info(f"[{task_id}] 第{attempt + 1}次尝试：没有找到图片 '''+img_path+'''")
-                                if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                    log_info(f"[{task_id}] 所有 '''+ str(operation_count) + ''' 次尝试都失败，无法找到图片")
-                                raise Exception(f"图片定位失败：无法找到图片 '''+img_path+'''")
-                        except Exception as e:
-                            log_info(f"[{task_id}] 第{attempt + 1}次图片定位失败")
-                            if attempt == ''' + str(operation_count) + ''' - 1:  # 最后一次尝试失败
-                                log_info(f"[{task_id}] 所有 '''+ str(operation_count) + ''' 次尝试都失败")
-                            raise Exception(f"图片定位失败：无法找到图片 '''+img_path+'''")
-                time.sleep(1)  # 每次操作后等待1秒
-            
-'''
-            
-            code_content += '''            # 等待测试完成
-            time.sleep(3)
-            
-            # 最终检查浏览器状态
-            if await ui_operations.is_browser_closed():
-                log_info("检测到浏览器已关闭，''' + function_name + ''' 无法截图")
-                raise Exception("BROWSER_CLOSED_BY_USER")
-            
-            await ui_operations.page_screenshot("''' + function_name + '''","over_test_test_step_''' + str(j+1) + '''")
-            time.sleep(2)
-            
-            # 输出图片识别统计信息
-            stats = ui_operations.get_image_stats()
-            log_info(f"[{task_id}] 图片识别统计: 截图识别成功 {stats['screenshot_success']} 次, "
-                    f"pyautogui成功 {stats['pyautogui_success']} 次, "
-                    f"总成功率 {stats['success_rate']:.2%}")
-            
-            log_info(f"[{task_id}] ''' + function_name + ''' 完成")
-            
-        except Exception as e:
-            log_info(f"[{task_id}] ''' + function_name + ''' 失败")
-            raise e
-        finally:
-            # 清理资源
-            if page:
-                await page.close()
-            if context:
-                await context.close()
-            if browser:
-                await browser.close()
-            
-
-'''
-        
-        # 生成动态并发执行函数
-        concurrent_function = generate_concurrent_execution_function(product_addresses)
-        code_content += concurrent_function
-        
-        # 写入文件
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code_content)
-            
-    except Exception as e:
-        log_info(f"更新多产品测试文件失败: {e}")
-
-def generate_concurrent_execution_function(product_addresses):
-    """根据产品地址数量动态生成并发执行函数"""
-    function_calls = []
-    has_multiple_products = len(product_addresses) > 1
-    for i, (product_id, _) in enumerate(product_addresses):
-        # 根据产品数量决定是否添加序号
-        base_name = f"test_{product_id.replace('-', '_')}"
-        function_name = f"{base_name}_{i+1}" if has_multiple_products else base_name
-        function_calls.append(f"    task{i+1} = asyncio.create_task({function_name}(browser_args_list[{i}]))")
-    
-    # 生成任务列表
-    task_list = ", ".join([f"task{i+1}" for i in range(len(product_addresses))])
-    
-    # 生成并发执行函数
-    concurrent_code = f'''
-
-@pytest.mark.asyncio
-async def test_concurrent_independent_browsers():
-    """
-    并发执行 ''' + str(len(product_addresses)) + ''' 个完全独立的浏览器实例
-    每个测试方法都会获得自己独立的浏览器进程
-    """
-    # 存储所有创建的任务，用于清理
-    tasks = []
-    try:
-        log_info("开始并发执行 ''' + str(len(product_addresses)) + ''' 个独立浏览器实例")
-        log_info("=" * 60)
-
-        # 获取浏览器位置
-        browser_count = ''' + str(len(product_addresses)) + '''  # 当前有''' + str(len(product_addresses)) + '''个测试方法
-        browser_positions = screen_manager.get_browser_positions(browser_count)
-        
-        # 为每个位置生成浏览器参数
-        browser_args_list = []
-        for position in browser_positions:
-            browser_args = screen_manager.get_browser_args(position, browser_count)
-            browser_args_list.append(browser_args)
-
-        # 打印布局信息
-        screen_manager.print_layout_info(browser_count)
-        
-        # 创建 ''' + str(len(product_addresses)) + ''' 个独立的浏览器实例任务
-        ''' + '\n        '.join([call.strip() for call in function_calls]) + '''
-        
-        log_info("创建了 ''' + str(len(product_addresses)) + ''' 个独立浏览器实例的测试任务")
-        log_info("开始并发执行...")
-        
-        # 存储创建的任务
-        tasks = [''' + task_list + ''']
-        
-        # 并发执行所有测试
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 处理结果
-        success_count = 0
-        failed_tests = []
-        for i, result in enumerate(results, 1):
-            if isinstance(result, Exception):
-                error_msg = str(result)
-                if "EPIPE" in error_msg:
-                    log_info(f"测试 {i} 因管道通信中断而失败，这可能是由于浏览器被手动关闭")
-                else:
-                    log_info(f"测试 {i} 失败: {result}")
-                failed_tests.append(f"测试 {i}: {result}")
-            else:
-                log_info(f"测试 {i} 成功完成")
-                success_count += 1
-        
-        log_info(f"并发执行结果: {success_count}/{len(results)} 个测试成功")
-        
-        if success_count == len(results):
-            log_info("所有测试都成功完成！")
-        else:
-            log_info("部分测试失败，请检查错误信息")
-            # 获取当前项目ID
-            project_id = os.environ.get('PROJECT_ID')
-            if not project_id:
-                log_info("无法获取当前项目ID，跳过取消接口调用")
-            else:
-                log_info(f"获取到项目ID: {project_id}")
-            # 获取当前服务URL
-            # 尝试从环境变量获取，如果没有则使用默认值
-            service_host = os.environ.get('SERVICE_HOST', '127.0.0.1')
-            service_port = os.environ.get('SERVICE_PORT', '5000')
-            service_url = f"http://{service_host}:{service_port}"
-            log_info(f"服务URL: {service_url}")
-            # 调用取消接口
-            try:
-                cancel_url = f"{service_url}/api/automation/projects/{project_id}/cancel"
-                log_info(f"调用取消接口: {cancel_url}")
-                
-                # 传递取消类型为 errors，表示测试运行异常
-                payload = {"type": "errors"}
-                response = requests.post(cancel_url, json=payload, timeout=10)
-                
-                if response.status_code == 200:
-                    log_info("✅ 取消接口调用成功")
-                else:
-                    log_info(f"⚠️  取消接口调用失败，状态码: {response.status_code}")
-            except Exception as e:
-                log_info(f"❌ 调用取消接口时发生错误: {e}")
-        # 如果有任何测试失败，抛出异常让pytest知道测试失败
-    except Exception as e:
-        raise Exception(f"并发测试失败: {', '.join(failed_tests)}")
-    return results
-
-'''
-    
-    return concurrent_code
-
 @automation_bp.route('/projects/grouped', methods=['GET'])
 def get_grouped_automation_projects():
     """获取按产品分组的自动化项目列表"""
@@ -5053,45 +3342,22 @@ def get_grouped_automation_projects():
                 }
                 grouped_projects[product_package_name] = []
             
-            # 获取所有自动化项目（包含 project_id 字段）
-            projects_query = adapt_query_placeholders('''
-                SELECT ap.id, ap.project_id, ap.process_name, ap.product_ids, ap.`system`, ap.product_type,
-                       ap.environment, ap.product_address, ap.test_steps, ap.status,
-                       ap.created_by, ap.created_at, ap.updated_at,
-                       ap.product_package_names,
-                       COUNT(ae.id) as execution_count,
-                       MAX(ae.start_time) as last_start_time,
-                       (SELECT status FROM automation_executions 
-                        WHERE project_id = ap.id 
-                        ORDER BY start_time DESC LIMIT 1) as last_status
+            # 获取符合过滤条件的自动化项目（默认摘要模式，不加载test_steps等大字段）
+            summary = is_summary_projection(request.args)
+            where_clause, filter_params = build_project_filters(request.args)
+            projects_query = adapt_query_placeholders(f'''
+                SELECT {build_project_list_columns(summary)}
                 FROM automation_projects ap
                 LEFT JOIN automation_executions ae ON ap.id = ae.project_id
+                {where_clause}
                 GROUP BY ap.id
-                ORDER BY ap.updated_at DESC
+                {build_project_order(request.args)}
             ''')
-            projects_results = execute_query_with_results(conn, projects_query)
+            projects_results = execute_query_with_results(conn, projects_query, tuple(filter_params))
             
             # 将项目分配到对应的产品分组中
             for row in projects_results:
-                project = {
-                    'id': row[0],
-                    'project_id': row[1],
-                    'process_name': row[2],
-                    'product_ids': json.loads(row[3]) if row[3] else [],
-                    'system': row[4],
-                    'product_type': row[5],
-                    'environment': row[6],
-                    'product_address': row[7],
-                    'test_steps': json.loads(row[8]) if row[8] else [],
-                    'status': row[9],
-                    'created_by': row[10],
-                    'created_at': row[11],
-                    'updated_at': row[12],
-                    'product_package_names': json.loads(row[13]) if row[13] else [],
-                    'execution_count': row[14],
-                    'last_start_time': row[15],
-                    'last_status': row[16]
-                }
+                project = project_list_row_to_dict(row, summary)
             
                 # 优先使用保存的产品包名信息进行分组
                 assigned = False
@@ -5123,6 +3389,9 @@ def get_grouped_automation_projects():
             # 构建最终结果
             result = []
             for package_name, project_list in grouped_projects.items():
+                # 有搜索或过滤条件时不返回没有匹配项目的分组
+                if where_clause and not project_list:
+                    continue
                 if package_name in product_details:  # 确保产品详细信息存在
                     product_info = product_details[package_name]
                     result.append({
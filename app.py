@@ -6,6 +6,8 @@ from api.auth_management import auth_bp
 from config.database import init_db
 from config.logger import setup_logger, log_info, log_error, log_warning
 from config.database_config import get_current_db_config
+from utils.thumbnail_manager import thumbnail_manager
+from utils.response_compression import response_compressor
 import os
 import secrets
 
@@ -51,6 +53,14 @@ def create_app():
     app.register_blueprint(automation_bp, url_prefix='/api/automation')
     log_info("所有蓝图已注册完成")
     
+    # 配置响应压缩（按蓝图配置，图片路由自动跳过）
+    app.config['COMPRESSION'] = {'min_size': 1024}
+    app.config['COMPRESSION_BLUEPRINTS'] = {
+        'automation': {'min_size': 512},
+        'auth': {'enabled': False},
+    }
+    response_compressor.init_app(app)
+    
     # 添加根路径重定向
     @app.route('/')
     def index():
@@ -108,7 +118,35 @@ def create_app():
         response.headers['Pragma'] = 'no-cache'
         response.headers['Expires'] = '0'
         return response
-    
+
+    # 添加缩略图路由（screenshot / assert / game），按需生成并缓存
+    @app.route('/thumb/<kind>/<filename>')
+    def thumbnail_img(kind, filename):
+        width = request.args.get('w', type=int)
+        # 浏览器支持WebP时优先返回WebP，否则返回JPEG
+        fmt = request.args.get('fmt')
+        if not fmt:
+            fmt = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+
+        # 返回路径后缩略图可能被其他请求的缓存淘汰删除，此时重新生成一次
+        for _ in range(2):
+            thumb_path, mimetype = thumbnail_manager.get_thumbnail(kind, filename, width, fmt)
+            if not thumb_path:
+                log_warning(f"缩略图不可用: {kind}/{filename}")
+                return Response('Not Found', status=404)
+            try:
+                response = send_file(thumb_path, mimetype=mimetype, conditional=True)
+                break
+            except FileNotFoundError:
+                log_warning(f"缩略图已被淘汰，重新生成: {kind}/{filename}")
+        else:
+            return Response('Not Found', status=404)
+
+        # 缩略图缓存键包含源文件修改时间，可以放心让浏览器做条件请求
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['Vary'] = 'Accept'
+        return response
+
     # 添加favicon路由
     @app.route('/favicon.ico')
     def favicon():
@@ -108,6 +108,51 @@ def get_db_connection_with_retry(max_retries=3, retry_delay=1):
         except Exception:
             pass
 
+# 项目列表查询（过滤/排序/最近执行记录）使用的索引: (索引名, 表名, 字段列表)
+QUERY_INDEXES = [
+    ('idx_ap_updated_at', 'automation_projects', ['updated_at']),
+    ('idx_ap_status', 'automation_projects', ['status']),
+    ('idx_ap_system', 'automation_projects', ['system']),
+    ('idx_ap_environment', 'automation_projects', ['environment']),
+    ('idx_ap_created_by', 'automation_projects', ['created_by']),
+    ('idx_ae_project_start', 'automation_executions', ['project_id', 'start_time']),
+]
+
+def create_query_indexes(cursor, db_type):
+    """创建查询索引（已存在则跳过）"""
+    for index_name, table_name, columns in QUERY_INDEXES:
+        column_sql = ', '.join(f'`{column}`' for column in columns)
+        if db_type == 'mysql':
+            # MySQL不支持 CREATE INDEX IF NOT EXISTS，重复创建时忽略1061错误
+            try:
+                cursor.execute(f'CREATE INDEX {index_name} ON {table_name} ({column_sql})')
+            except Exception as e:
+                if '1061' not in str(e):
+                    raise
+        else:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({column_sql})')
+
+# 后续版本新增的字段，对已有数据库补齐: (表名, 字段名, MySQL类型, SQLite类型)
+ADDED_COLUMNS = [
+    ('project_files', 'content_hash', 'VARCHAR(64) NULL', 'TEXT'),
+    ('automation_executions', 'address_results', 'TEXT NULL', 'TEXT'),
+]
+
+def add_missing_columns(cursor, db_type):
+    """为已有表补齐新增字段（已存在则跳过）"""
+    for table_name, column_name, mysql_type, sqlite_type in ADDED_COLUMNS:
+        if db_type == 'mysql':
+            # 字段已存在时MySQL返回1060错误，忽略即可
+            try:
+                cursor.execute(f'ALTER TABLE {table_name} ADD COLUMN `{column_name}` {mysql_type}')
+            except Exception as e:
+                if '1060' not in str(e):
+                    raise
+        else:
+            cursor.execute(f'PRAGMA table_info({table_name})')
+            if column_name not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute(f'ALTER TABLE {table_name} ADD COLUMN {column_name} {sqlite_type}')
+
 def init_mysql_database():
     """初始化MySQL数据库和表结构"""
     try:
@@ -218,6 +263,7 @@ def init_mysql_database():
                 file_path VARCHAR(500) NOT NULL,
                 file_type VARCHAR(20) DEFAULT 'py',
                 is_active BOOLEAN DEFAULT TRUE,
+                content_hash VARCHAR(64) NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 FOREIGN KEY (project_id) REFERENCES automation_projects (id) ON DELETE CASCADE,
@@ -244,10 +290,17 @@ def init_mysql_database():
                 detailed_log LONGTEXT,
                 executed_by VARCHAR(100) DEFAULT 'admin',
                 cancel_type VARCHAR(50) DEFAULT NULL,
+                address_results TEXT NULL,
                 FOREIGN KEY (project_id) REFERENCES automation_projects (id)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         ''')
         
+        # 7. 补齐新增字段并创建查询索引
+        print("   补齐新增字段...")
+        add_missing_columns(cursor, 'mysql')
+        print("   创建查询索引...")
+        create_query_indexes(cursor, 'mysql')
+        
         # 初始化默认枚举值
         print("   初始化默认枚举值...")
         default_enums = [
@@ -442,6 +495,7 @@ def init_sqlite_database():
             file_path TEXT NOT NULL,
             file_type TEXT DEFAULT 'py',
             is_active BOOLEAN DEFAULT 1,
+            content_hash TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (project_id) REFERENCES automation_projects (id) ON DELETE CASCADE,
@@ -467,6 +521,7 @@ def init_sqlite_database():
             detailed_log TEXT,
             executed_by TEXT DEFAULT 'admin',
             cancel_type TEXT DEFAULT NULL,
+            address_results TEXT,
             FOREIGN KEY (project_id) REFERENCES automation_projects (id)
         )
     ''')
@@ -507,6 +562,7 @@ def init_sqlite_database():
                 detailed_log TEXT,
                 executed_by TEXT DEFAULT 'admin',
                 cancel_type TEXT DEFAULT NULL,
+                address_results TEXT,
                 FOREIGN KEY (project_id) REFERENCES automation_projects (id)
             )
         ''')
@@ -551,6 +607,10 @@ def init_sqlite_database():
             conn.execute('ALTER TABLE automation_executions ADD COLUMN cancel_type TEXT DEFAULT NULL')
             print("cancel_type字段添加完成")
     
+    # 补齐新增字段并创建查询索引
+    add_missing_columns(conn.cursor(), 'sqlite')
+    create_query_indexes(conn.cursor(), 'sqlite')
+    
     # 初始化默认枚举值
     default_enums = [
         ('system_type', 'Android'),
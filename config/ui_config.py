@@ -12,7 +12,12 @@ class UIConfig:
     
     # 性能配置
     SCREENSHOT_CACHE_TIMEOUT = 1.0
+    SCREENSHOT_FORMAT = 'jpeg'  # 图片识别用截图格式：jpeg 编码更快，png 像素精确
+    SCREENSHOT_JPEG_QUALITY = 90
+    SCREENSHOT_CLIP_ENABLED = True  # 有位置提示时只截取提示区域
+    FRAME_MAX_AGE = 5.0  # 同一帧截图最长复用时间（秒），导航、输入、滚动和等待会提前使其失效
     TEMPLATE_CACHE_ENABLED = True
+    TEMPLATE_CACHE_MAX_MB = 128  # 进程内共享模板缓存（含预计算变体）的内存上限
     
     # 图片识别超时配置
     IMAGE_WAIT_TIMEOUT = 3  # 增加超时时间，给多尺度匹配更多时间
@@ -31,6 +36,33 @@ class UIConfig:
     SCALE_FACTORS = [1.0, 0.9, 0.8, 0.7, 0.6, 0.5]  # 支持缩放到50%
     CONFIDENCE_LEVELS = [0.7, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2, 0.15, 0.1]  # 更多置信度级别
     
+    # 金字塔搜索配置 - 先在缩小的截图上粗匹配，再在候选区域内按原尺寸精匹配
+    PYRAMID_SEARCH_ENABLED = True
+    PYRAMID_DOWNSCALE = 0.5  # 粗匹配时截图和模板的缩放比例
+    PYRAMID_MIN_TEMPLATE_SIZE = 16  # 缩小后模板边长低于该值时该尺度直接按原尺寸匹配
+    PYRAMID_CANDIDATES = 3  # 进入精匹配的候选区域数量
+    PYRAMID_ROI_MARGIN = 8  # 精匹配区域在候选位置四周扩展的像素
+    
+    # 位置提示配置 - 同一页面再次查找同一模板时，先在上次匹配位置附近按上次的尺度查找
+    LOCATION_HINTS_ENABLED = True
+    LOCATION_HINT_MARGIN = 24  # 提示区域在上次匹配位置四周扩展的像素
+    LOCATION_HINT_CONFIDENCE = 0.8  # 提示区域内的匹配得分达到该值才采用，否则回退到全图搜索
+    
+    # 特征点匹配配置 - 用 ORB/AKAZE 特征点一次匹配任意缩放比例的模板
+    MATCH_METHOD = 'template'  # template: 多尺度模板匹配, feature: 特征点匹配, auto: 按各模板实测的速度和准确率选择（前几次查找两种方式都运行）
+    FEATURE_DETECTOR = 'orb'  # orb / akaze
+    FEATURE_MAX_KEYPOINTS = 2000  # 截图上最多检测的特征点数量（仅ORB）
+    FEATURE_RATIO_TEST = 0.75  # 最近邻距离比阈值
+    FEATURE_MIN_INLIERS = 10  # 几何校验后至少需要的内点数量
+    FEATURE_MIN_INLIER_RATIO = 0.3  # 内点占有效匹配的最低比例，同时作为特征点匹配的置信度
+    MATCH_METHOD_PROBES = 3  # auto 模式下每个模板同时运行两种方式对比的次数
+    FEATURE_MIN_ACCURACY = 0.9  # auto 模式下选择特征点匹配所需的最低准确率
+    MATCH_POSITION_TOLERANCE = 10  # 对比时两种方式的匹配位置允许相差的像素
+    
+    # 图片识别执行器配置 - 截图解码和模板匹配放到线程池/进程池执行，避免阻塞事件循环
+    IMAGE_MATCH_MAX_WORKERS = 0  # 最大并发数，0 表示按当前进程可用的CPU核数
+    IMAGE_MATCH_USE_PROCESSES = False  # True: 多尺度搜索放到进程池执行，解码等轻量计算仍使用线程池
+    
     @classmethod
     def get_image_recognition_config(cls):
         """获取图片识别配置"""
@@ -43,9 +75,32 @@ class UIConfig:
             'hybrid_enabled': cls.HYBRID_RECOGNITION_ENABLED,
             'screenshot_first': cls.SCREENSHOT_FIRST,
             'screenshot_cache_timeout': cls.SCREENSHOT_CACHE_TIMEOUT,
+            'screenshot_format': cls.SCREENSHOT_FORMAT,
+            'screenshot_jpeg_quality': cls.SCREENSHOT_JPEG_QUALITY,
+            'screenshot_clip_enabled': cls.SCREENSHOT_CLIP_ENABLED,
+            'frame_max_age': cls.FRAME_MAX_AGE,
             'max_retry_attempts': cls.MAX_RETRY_ATTEMPTS,
             'retry_delay': cls.RETRY_DELAY,
             'multi_scale_enabled': cls.MULTI_SCALE_ENABLED,
             'scale_factors': cls.SCALE_FACTORS,
-            'confidence_levels': cls.CONFIDENCE_LEVELS
+            'confidence_levels': cls.CONFIDENCE_LEVELS,
+            'pyramid_enabled': cls.PYRAMID_SEARCH_ENABLED,
+            'pyramid_downscale': cls.PYRAMID_DOWNSCALE,
+            'pyramid_min_template_size': cls.PYRAMID_MIN_TEMPLATE_SIZE,
+            'pyramid_candidates': cls.PYRAMID_CANDIDATES,
+            'pyramid_roi_margin': cls.PYRAMID_ROI_MARGIN,
+            'location_hints_enabled': cls.LOCATION_HINTS_ENABLED,
+            'location_hint_margin': cls.LOCATION_HINT_MARGIN,
+            'location_hint_confidence': cls.LOCATION_HINT_CONFIDENCE,
+            'match_method': cls.MATCH_METHOD,
+            'feature_detector': cls.FEATURE_DETECTOR,
+            'feature_max_keypoints': cls.FEATURE_MAX_KEYPOINTS,
+            'feature_ratio_test': cls.FEATURE_RATIO_TEST,
+            'feature_min_inliers': cls.FEATURE_MIN_INLIERS,
+            'feature_min_inlier_ratio': cls.FEATURE_MIN_INLIER_RATIO,
+            'match_method_probes': cls.MATCH_METHOD_PROBES,
+            'feature_min_accuracy': cls.FEATURE_MIN_ACCURACY,
+            'match_position_tolerance': cls.MATCH_POSITION_TOLERANCE,
+            'match_max_workers': cls.IMAGE_MATCH_MAX_WORKERS,
+            'match_use_processes': cls.IMAGE_MATCH_USE_PROCESSES
         } 
\ No newline at end of file
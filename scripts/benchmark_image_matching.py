@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图片识别基准测试脚本
+用 Game_Img 目录下的模板合成 1920×1080 的页面截图（模板按不同比例缩放后贴入，
+其余模板作为干扰图），分别用逐尺度全图匹配、金字塔搜索和特征点匹配查找，对比命中率和耗时
+
+用法:
+    python scripts/benchmark_image_matching.py                # 默认每个模板 3 个缩放比例
+    python scripts/benchmark_image_matching.py --repeat 5     # 每个场景重复计时 5 次取中位数
+    python scripts/benchmark_image_matching.py --seed 7       # 更换随机场景
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.logger import get_logger
+from utils.image_recognition import ImageRecognition
+
+SCREEN_SIZE = (1080, 1920)
+# 模拟多任务平分窗口后页面内容的缩放
+PAGE_SCALES = [1.0, 0.8, 0.6]
+DISTRACTOR_COUNT = 6
+
+
+def print_banner():
+    """打印横幅"""
+    print("📊 图片识别基准测试")
+    print("=" * 30)
+
+
+def load_templates(image_dir):
+    """加载模板，内容相同的模板只保留一个"""
+    templates = {}
+    seen = set()
+    for path in sorted(Path(image_dir).rglob('*.png')):
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        digest = hash(image.tobytes())
+        if digest in seen:
+            continue
+        seen.add(digest)
+        templates[str(path)] = image
+    return templates
+
+
+def build_scene(rng, template, page_scale, distractors):
+    """
+    合成页面截图
+
+    Returns:
+        (截图, 模板中心坐标, 贴入后的模板尺寸)
+    """
+    h, w = SCREEN_SIZE
+    # 渐变背景加噪声，接近网页中的大面积纯色与阴影
+    gradient = np.linspace(40, 200, w, dtype=np.float32)[None, :, None]
+    scene = np.repeat(np.repeat(gradient, h, axis=0), 3, axis=2)
+    scene += rng.normal(0, 12, scene.shape).astype(np.float32)
+    scene = np.clip(scene, 0, 255).astype(np.uint8)
+
+    def paste(image, scale):
+        th, tw = int(image.shape[0] * scale), int(image.shape[1] * scale)
+        resized = cv2.resize(image, (tw, th), interpolation=cv2.INTER_AREA)
+        x = int(rng.integers(0, w - tw))
+        y = int(rng.integers(0, h - th))
+        scene[y:y + th, x:x + tw] = resized
+        return x, y, tw, th
+
+    for distractor in distractors:
+        paste(distractor, page_scale)
+    x, y, tw, th = paste(template, page_scale)
+    return scene, (x + tw // 2, y + th // 2), (tw, th)
+
+
+def create_recognizer(pyramid_enabled):
+    """创建关闭或开启金字塔搜索的识别器"""
+    recognizer = ImageRecognition(task_id=f"benchmark_{'pyramid' if pyramid_enabled else 'full'}")
+    recognizer.config['pyramid_enabled'] = pyramid_enabled
+    return recognizer
+
+
+def create_template_locator(recognizer, base_confidence):
+    """创建多尺度模板匹配的查找函数，按首次尝试的置信度阶梯判断是否找到"""
+    def locate(scene, path):
+        variants = recognizer._load_template_variants(path)
+        if variants is None:
+            return None
+        match = recognizer.matcher.find_best_match(scene, variants)
+        return recognizer._evaluate_match(match, path, base_confidence, 0)
+    return locate
+
+
+def create_feature_locator(recognizer):
+    """创建特征点匹配的查找函数，内点比例未达到阈值时视为未找到"""
+    def locate(scene, path):
+        features = recognizer._load_template_features(path)
+        match = recognizer.matcher.find_by_features(scene, features)
+        if match is None or match['score'] < recognizer.config['feature_min_inlier_ratio']:
+            return None
+        return match['position']
+    return locate
+
+
+def run_benchmark(image_dir, repeat, seed):
+    """执行基准测试，返回 {模式: {hits, total, latencies}}"""
+    templates = load_templates(image_dir)
+    if not templates:
+        print(f"❌ 未在 {image_dir} 找到模板图片")
+        return None
+
+    rng = np.random.default_rng(seed)
+    full, pyramid = create_recognizer(False), create_recognizer(True)
+    base_confidence = full.config['confidence']
+    locators = {
+        'full': create_template_locator(full, base_confidence),
+        'pyramid': create_template_locator(pyramid, base_confidence),
+        'feature': create_feature_locator(pyramid),
+    }
+    stats = {mode: {'hits': 0, 'total': 0, 'latencies': []} for mode in locators}
+
+    paths = list(templates)
+    print(f"模板 {len(paths)} 个，每个模板 {len(PAGE_SCALES)} 个缩放比例，每个场景计时 {repeat} 次\n")
+    for path in paths:
+        others = [templates[p] for p in paths if p != path]
+        picks = rng.choice(len(others), size=min(DISTRACTOR_COUNT, len(others)), replace=False)
+        distractors = [others[i] for i in picks]
+        for page_scale in PAGE_SCALES:
+            scene, expected, (tw, th) = build_scene(rng, templates[path], page_scale, distractors)
+            tolerance = max(4, min(tw, th) // 10)
+            row = []
+            for mode, locate in locators.items():
+                timings = []
+                position = None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    position = locate(scene, path)
+                    timings.append(time.perf_counter() - started)
+                hit = (position is not None and abs(position[0] - expected[0]) <= tolerance
+                       and abs(position[1] - expected[1]) <= tolerance)
+                latency = statistics.median(timings)
+                stats[mode]['total'] += 1
+                stats[mode]['hits'] += int(hit)
+                stats[mode]['latencies'].append(latency)
+                row.append(f"{mode}: {'命中' if hit else '未命中'} {latency * 1000:7.1f}ms")
+            print(f"   {Path(path).name[:40]:<40} 缩放 {page_scale:.1f}  " + "  ".join(row))
+    return stats
+
+
+def print_summary(stats):
+    """打印各模式的命中率和耗时"""
+    print("\n模式       命中率        中位耗时     平均耗时")
+    for mode, item in stats.items():
+        latencies = item['latencies']
+        print(f"{mode:<10} {item['hits']:>3}/{item['total']:<3} "
+              f"({item['hits'] / item['total']:.0%})  {statistics.median(latencies) * 1000:8.1f}ms  "
+              f"{statistics.mean(latencies) * 1000:8.1f}ms")
+    full = statistics.median(stats['full']['latencies'])
+    pyramid = statistics.median(stats['pyramid']['latencies'])
+    feature = statistics.median(stats['feature']['latencies'])
+    print(f"\n金字塔搜索中位耗时为全图匹配的 {pyramid / full:.1%}，特征点匹配为 {feature / full:.1%}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='对比全图匹配、金字塔搜索与特征点匹配的命中率和耗时')
+    parser.add_argument('--dir', default=str(project_root / 'Game_Img'), help='模板图片目录')
+    parser.add_argument('--repeat', type=int, default=3, help='每个场景的计时次数')
+    parser.add_argument('--seed', type=int, default=2024, help='合成场景的随机种子')
+    args = parser.parse_args()
+
+    # 基准测试期间只输出警告以上的日志，避免日志写入影响计时
+    get_logger().setLevel(logging.WARNING)
+
+    print_banner()
+    stats = run_benchmark(args.dir, args.repeat, args.seed)
+    if stats:
+        print_summary(stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -133,6 +133,7 @@ def create_mysql_tables(mysql_conn):
             file_path TEXT NOT NULL,
             file_type VARCHAR(10) DEFAULT 'py',
             is_active BOOLEAN DEFAULT TRUE,
+            content_hash VARCHAR(64) NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             FOREIGN KEY (project_id) REFERENCES automation_projects (id) ON DELETE CASCADE,
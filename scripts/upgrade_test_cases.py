@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试文件升级脚本
+将 Test_Case 目录下已生成的测试文件中异步函数里的 time.sleep 替换为 await asyncio.sleep，
+避免阻塞事件循环导致并发执行的浏览器实例互相等待
+
+用法:
+    python scripts/upgrade_test_cases.py              # 原地改写 Test_Case/*.py，保留手工修改
+    python scripts/upgrade_test_cases.py --dry-run    # 只检查不写入
+    python scripts/upgrade_test_cases.py --regenerate # 按数据库中的测试步骤重新生成项目文件（会覆盖手工修改）
+"""
+
+import argparse
+import ast
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.test_code_generator import TestCodeGenerator
+
+
+def print_banner():
+    """打印横幅"""
+    print("🔧 测试文件升级工具")
+    print("=" * 30)
+
+
+def find_blocking_sleeps(tree):
+    """查找异步函数体内（不含嵌套的同步函数）的 time.sleep 调用"""
+    calls = []
+
+    def visit(node, in_async):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.AsyncFunctionDef):
+                visit(child, True)
+            elif isinstance(child, (ast.FunctionDef, ast.Lambda, ast.ClassDef)):
+                visit(child, False)
+            else:
+                if (in_async and isinstance(child, ast.Call)
+                        and isinstance(child.func, ast.Attribute)
+                        and child.func.attr == 'sleep'
+                        and isinstance(child.func.value, ast.Name)
+                        and child.func.value.id == 'time'):
+                    calls.append(child.func)
+                visit(child, in_async)
+
+    visit(tree, False)
+    return calls
+
+
+def has_asyncio_import(tree):
+    """检查模块顶层是否已导入 asyncio"""
+    for node in tree.body:
+        if isinstance(node, ast.Import) and any(alias.name == 'asyncio' and alias.asname is None
+                                                for alias in node.names):
+            return True
+    return False
+
+
+def upgrade_source(source):
+    """
+    改写源码中的阻塞等待
+
+    Returns:
+        (新源码, 替换数量)
+    """
+    tree = ast.parse(source)
+    calls = find_blocking_sleeps(tree)
+    if not calls:
+        return source, 0
+
+    lines = source.splitlines(keepends=True)
+    # 从后往前替换，保证前面的偏移量不变；ast 的列偏移是UTF-8字节偏移
+    for func in sorted(calls, key=lambda f: (f.lineno, f.col_offset), reverse=True):
+        line_bytes = lines[func.lineno - 1].encode('utf-8')
+        start = len(line_bytes[:func.col_offset].decode('utf-8'))
+        end = len(line_bytes[:func.end_col_offset].decode('utf-8'))
+        line = lines[func.lineno - 1]
+        lines[func.lineno - 1] = line[:start] + 'await asyncio.sleep' + line[end:]
+
+    if not has_asyncio_import(tree):
+        first_import = next((node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))), None)
+        insert_at = first_import.lineno - 1 if first_import else 0
+        lines.insert(insert_at, 'import asyncio\n')
+
+    new_source = ''.join(lines)
+    # 改写后必须仍能编译
+    compile(new_source, '<upgraded>', 'exec')
+    return new_source, len(calls)
+
+
+def upgrade_files(test_dir, dry_run=False):
+    """原地升级目录下的所有测试文件"""
+    total = 0
+    for file_path in sorted(Path(test_dir).glob('*.py')):
+        try:
+            source = file_path.read_text(encoding='utf-8')
+            new_source, count = upgrade_source(source)
+        except SyntaxError as e:
+            print(f"⚠️  {file_path.name}: 语法错误，跳过 ({e})")
+            continue
+
+        if count == 0:
+            print(f"   {file_path.name}: 无需升级")
+            continue
+
+        total += count
+        if dry_run:
+            print(f"🔍 {file_path.name}: 发现 {count} 处 time.sleep")
+        else:
+            TestCodeGenerator.write_atomic(str(file_path), new_source)
+            print(f"✅ {file_path.name}: 已替换 {count} 处 time.sleep")
+    return total
+
+
+def regenerate_projects(dry_run=False):
+    """按数据库中的测试步骤重新生成所有已关联测试文件的项目（会覆盖手工修改）"""
+    import json
+    from config.database import get_db_connection_with_retry
+    from utils.db_adapter import adapt_query_placeholders, execute_query_with_results
+    from utils.file_manager import file_manager
+    from api.automation_management import write_project_test_code
+
+    count = 0
+    for mapping in file_manager.get_all_project_files():
+        project_id = mapping['project_id']
+        with get_db_connection_with_retry() as conn:
+            query = adapt_query_placeholders(
+                'SELECT product_ids, `system`, product_address, test_steps FROM automation_projects WHERE id=?')
+            results = execute_query_with_results(conn, query, (project_id,))
+        if not results:
+            print(f"⚠️  项目 {project_id}: 未找到项目数据，跳过")
+            continue
+
+        product_ids, system, product_address, test_steps = results[0]
+        data = {
+            'product_ids': json.loads(product_ids) if isinstance(product_ids, str) else product_ids,
+            'system': system,
+            'product_address': product_address,
+            'test_steps': json.loads(test_steps) if test_steps else []
+        }
+        if dry_run:
+            print(f"🔍 项目 {project_id}: 将重新生成 {mapping['file_name']}")
+        else:
+            write_project_test_code(project_id, data)
+            print(f"✅ 项目 {project_id}: 已重新生成 {mapping['file_name']}")
+        count += 1
+    return count
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='将测试文件中的阻塞等待升级为 await asyncio.sleep')
+    parser.add_argument('--dir', default=str(project_root / 'Test_Case'), help='测试文件目录')
+    parser.add_argument('--dry-run', action='store_true', help='只检查不写入')
+    parser.add_argument('--regenerate', action='store_true',
+                        help='按数据库中的测试步骤重新生成项目文件（会覆盖手工修改）')
+    args = parser.parse_args()
+
+    print_banner()
+    if args.regenerate:
+        count = regenerate_projects(args.dry_run)
+        print(f"\n共处理 {count} 个项目")
+    else:
+        total = upgrade_files(args.dir, args.dry_run)
+        print(f"\n共 {total} 处 time.sleep {'待替换' if args.dry_run else '已替换'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -132,11 +132,20 @@ const AutomationAPI = {
         });
     },
 
-    // 执行测试
-    async executeTest(projectId) {
-        return await apiRequest(`/automation/projects/${projectId}/execute`, {
-            method: 'POST'
-        });
+    // 执行测试（mode: file 生成测试文件执行，interpreter 直接解释执行测试步骤）
+    async executeTest(projectId, mode = null, failFast = null) {
+        const options = { method: 'POST' };
+        const body = {};
+        if (mode) {
+            body.mode = mode;
+        }
+        if (failFast !== null) {
+            body.fail_fast = failFast;
+        }
+        if (Object.keys(body).length > 0) {
+            options.body = JSON.stringify(body);
+        }
+        return await apiRequest(`/automation/projects/${projectId}/execute`, options);
     },
 
     // 取消测试
@@ -151,6 +160,15 @@ const AutomationAPI = {
         return await apiRequest(`/automation/projects/${projectId}/executions`, {
             method: 'GET'
         });
+    },
+
+    // 只重跑某次执行中失败的产品地址
+    async rerunFailed(executionId, mode = null) {
+        const options = { method: 'POST' };
+        if (mode) {
+            options.body = JSON.stringify({ mode });
+        }
+        return await apiRequest(`/automation/executions/${executionId}/rerun-failed`, options);
     }
 };
 
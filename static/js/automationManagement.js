@@ -30,7 +30,21 @@ class AutomationManagement {
         this.pageSize = 10;
         this.totalPages = 0;
         this.totalItems = 0;
+        // 项目列表的搜索、过滤和排序条件（由后端执行，前端只下载当前页）
+        this.listQuery = {
+            search: '',
+            status: '',
+            system: '',
+            environment: '',
+            sort: 'updated_at',
+            order: 'desc'
+        };
+        this.listSearchTimer = null;
         this.statusPollingInterval = null;
+        // 最近一次状态轮询的批量结果：项目ID -> 项目摘要（含 latest_execution）
+        this.polledProjects = new Map();
+        // 等待下一次状态轮询结果的调用方 [{projectId, resolve, reject}]
+        this.statusTickWaiters = [];
         this.lastEditTime = 0;
         this.stepCounter = 1;
         
@@ -164,7 +178,24 @@ class AutomationManagement {
                                 ).join('')}
                             </select>
                         </div>
-                        <button class="btn btn-primary" onclick="automationManagement.openAddProjectModal()" 
+                        <div class="grouping-method-selector project-filter-bar">
+                            <input type="text" id="project-list-search" class="grouping-select"
+                                   placeholder="搜索流程名称/产品ID" value="${this.escapeHtml(this.listQuery.search)}"
+                                   oninput="automationManagement.onListSearchInput(this.value)">
+                            <select id="project-list-status" class="grouping-select"
+                                    onchange="automationManagement.updateListQuery({ status: this.value })">
+                                ${[['', '全部状态'], ['待执行', '待执行'], ...['running', 'passed', 'failed', 'cancelled'].map(status => [status, this.getStatusText(status)])].map(([value, label]) =>
+                                    `<option value="${value}" ${value === this.listQuery.status ? 'selected' : ''}>${label}</option>`
+                                ).join('')}
+                            </select>
+                            <select id="project-list-sort" class="grouping-select"
+                                    onchange="automationManagement.updateListQuery(JSON.parse(this.value))">
+                                ${[['updated_at', 'desc', '最近更新'], ['created_at', 'desc', '最近创建'], ['process_name', 'asc', '名称 A-Z'], ['last_start_time', 'desc', '最近执行']].map(([sort, order, label]) =>
+                                    `<option value='${JSON.stringify({ sort, order })}' ${sort === this.listQuery.sort && order === this.listQuery.order ? 'selected' : ''}>${label}</option>`
+                                ).join('')}
+                            </select>
+                        </div>
+                        <button class="btn btn-primary" onclick="automationManagement.openAddProjectModal()"
                                 id="header-add-project-btn">
                             <i class="fas fa-plus"></i>
                             添加自动化项目
@@ -837,17 +868,49 @@ class AutomationManagement {
         }
     }
 
-    // 加载自动化项目列表
-    async loadProjects(page = 1, pageSize = null) {
+    // 构建项目列表查询参数（搜索、过滤和排序由后端执行）
+    buildProjectListParams(extra = {}) {
+        const params = new URLSearchParams();
+        Object.entries({ ...this.listQuery, ...extra }).forEach(([key, value]) => {
+            if (value !== '' && value !== null && value !== undefined) {
+                params.set(key, value);
+            }
+        });
+        // 添加时间戳避免缓存
+        params.set('_t', new Date().getTime());
+        return params.toString();
+    }
+
+    // 更新搜索/过滤/排序条件并从第一页重新加载
+    async updateListQuery(changes) {
+        Object.assign(this.listQuery, changes);
+        this.currentPage = 1;
+        if (this.showGroupedView) {
+            await this.renderGroupedProjects();
+            this.renderPagination();
+        } else {
+            await this.loadProjects(1);
+        }
+    }
+
+    // 搜索框输入防抖，避免每次按键都请求后端
+    onListSearchInput(value) {
+        clearTimeout(this.listSearchTimer);
+        this.listSearchTimer = setTimeout(() => {
+            this.updateListQuery({ search: value.trim() });
+        }, 300);
+    }
+
+    // 加载自动化项目列表（只下载当前页）
+    async loadProjects(page = null, pageSize = null) {
         try {
             showLoading(document.getElementById('automation-list'));
             
-            // 使用传入的pageSize或当前设置的pageSize
+            // 未指定页码时刷新当前页，使用传入的pageSize或当前设置的pageSize
+            page = page || this.currentPage || 1;
             const size = pageSize || this.pageSize;
             
-            // 添加时间戳避免缓存
-            const timestamp = new Date().getTime();
-            const response = await fetch(`/api/automation/projects?page=${page}&page_size=${size}&_t=${timestamp}`);
+            const response = await fetch(`/api/automation/projects?${this.buildProjectListParams({ page, page_size: size })}`);
             const result = await response.json();
             
             if (result.success) {
@@ -855,6 +918,12 @@ class AutomationManagement {
                 const projectsData = result.data.projects || result.data;
                 this.projects = Array.isArray(projectsData) ? projectsData : [];
                 
+                // 删除或过滤后当前页可能超出范围，回到最后一页
+                const pagination = result.data.pagination;
+                if (pagination && this.projects.length === 0 && page > 1 && pagination.total_pages > 0) {
+                    return await this.loadProjects(pagination.total_pages, size);
+                }
+                
                 console.log('加载项目数据完成，项目数量:', this.projects.length);
                 console.log('projects 类型:', typeof this.projects);
                 console.log('projects 是否为数组:', Array.isArray(this.projects));
@@ -886,7 +955,7 @@ class AutomationManagement {
                 if (this.runningProjects.size > 0) {
                     this.startStatusPolling();
                     console.log('页面加载时启动状态轮询，运行中项目数量:', this.runningProjects.size);
-                } else {
+                } else if (!this.hasPollingTargets()) {
                     this.stopStatusPolling();
                 }
                 
@@ -939,9 +1008,7 @@ class AutomationManagement {
         try {
             // 如果是按产品包名分组，使用原来的API
             if (this.groupingMethod === 'product_package_name') {
-            // 添加时间戳避免缓存
-            const timestamp = new Date().getTime();
-            const response = await fetch(`/api/automation/projects/grouped?_t=${timestamp}`);
+            const response = await fetch(`/api/automation/projects/grouped?${this.buildProjectListParams()}`);
             const result = await response.json();
             
             if (result.success) {
@@ -970,25 +1037,34 @@ class AutomationManagement {
         }
     }
 
-    // 加载所有项目并按指定方式分组
+    // 加载符合过滤条件的项目并按指定方式分组
     async loadAllProjectsAndGroup() {
         try {
-            // 加载所有项目（不分页）
-            const timestamp = new Date().getTime();
-            const response = await fetch(`/api/automation/projects?page=1&page_size=1000&_t=${timestamp}`);
-            const result = await response.json();
-            
-            if (result.success) {
-                const allProjects = result.data.projects || result.data || [];
-                console.log('加载所有项目完成，项目数量:', allProjects.length);
-                
-                // 根据当前分组方式进行分组
-                this.groupedProjects = this.groupProjectsByMethod(allProjects, this.groupingMethod);
-                console.log(`按${this.groupingMethod}分组完成，分组数量:`, this.groupedProjects.length);
-            } else {
-                console.error('加载项目失败:', result.message);
-                this.groupedProjects = [];
-            }
+            // 分组需要全部匹配项目，按后端单页上限逐页加载
+            const maxPageSize = 100;
+            // 仅按地址分组时需要product_address，其余分组使用摘要字段即可
+            const fields = this.groupingMethod === 'product_address' ? 'full' : 'summary';
+            const allProjects = [];
+            let page = 1;
+            let totalPages = 1;
+            do {
+                const params = this.buildProjectListParams({ page, page_size: maxPageSize, fields });
+                const response = await fetch(`/api/automation/projects?${params}`);
+                const result = await response.json();
+                if (!result.success) {
+                    console.error('加载项目失败:', result.message);
+                    this.groupedProjects = [];
+                    return;
+                }
+                allProjects.push(...(result.data.projects || []));
+                totalPages = result.data.pagination ? result.data.pagination.total_pages : page;
+                page += 1;
+            } while (page <= totalPages);
+            console.log('加载所有项目完成，项目数量:', allProjects.length);
+            
+            // 根据当前分组方式进行分组
+            this.groupedProjects = this.groupProjectsByMethod(allProjects, this.groupingMethod);
+            console.log(`按${this.groupingMethod}分组完成，分组数量:`, this.groupedProjects.length);
         } catch (error) {
             console.error('加载项目失败:', error);
             this.groupedProjects = [];
@@ -1139,9 +1215,8 @@ class AutomationManagement {
             this.renderGroupedProjects();
             this.renderPagination(); // 为分组视图添加分页控件
         } else {
-            await this.loadProjects();
-            this.renderProjectsList();
-            this.renderPagination();
+            // 分组视图的页码按分组计算，切换到列表视图时从第一页开始
+            await this.loadProjects(1);
         }
     }
 
@@ -2145,6 +2220,31 @@ class AutomationManagement {
         }
     }
 
+    // 加载项目完整数据（列表接口只返回摘要字段，编辑时需要test_steps和product_address）
+    async loadFullProject(projectId) {
+        const project = this.projects.find(p => p.id === projectId);
+        if (!project) {
+            return null;
+        }
+        if (Array.isArray(project.test_steps) && project.product_address !== undefined) {
+            return project;
+        }
+
+        const response = await fetch(`/api/automation/projects/${projectId}?_t=${Date.now()}`);
+        const result = await response.json();
+        if (!result.success || !result.data) {
+            throw new Error(result.message || '获取项目详情失败');
+        }
+
+        // 合并到内存中的项目对象，保留列表中的统计字段
+        Object.assign(project, {
+            product_address: result.data.product_address,
+            test_steps: result.data.test_steps || [],
+            product_package_names: result.data.product_package_names || project.product_package_names
+        });
+        return project;
+    }
+
     // 编辑项目
     async editProject(projectId) {
         try {
@@ -2183,7 +2283,7 @@ class AutomationManagement {
                 }
             }
             
-        const project = this.projects.find(p => p.id === projectId);
+        const project = await this.loadFullProject(projectId);
             if (!project) {
                 console.error('未找到项目:', projectId);
                 return;
@@ -2498,7 +2598,7 @@ class AutomationManagement {
                 </div>
             `;
             
-            // 获取产品分组数据
+            // 获取产品分组数据（摘要字段已包含步骤数量，选中项目后再加载完整步骤）
             const response = await fetch('/api/automation/projects/grouped');
             const result = await response.json();
             
@@ -2679,8 +2779,7 @@ class AutomationManagement {
         if (!projectsList) return;
         
         const html = projects.map(project => {
-            const steps = Array.isArray(project.test_steps) ? project.test_steps : (project.test_steps ? JSON.parse(project.test_steps) : []);
-            const testStepsCount = steps.length;
+            const testStepsCount = project.step_count || 0;
             return `
                 <div class="project-item" data-project-id="${project.id}" onclick="automationManagement.selectImportProject(${project.id})">
                     <div class="project-item-name">${this.escapeHtml(project.process_name)}</div>
@@ -2827,6 +2926,12 @@ class AutomationManagement {
                             <span class="step-detail-label">暂停时间</span>
                             <span class="step-detail-value">${step.pause_time || 1} 秒</span>
                         </div>
+                        ${(step.wait_strategy || 'fixed') !== 'fixed' ? `
+                        <div class="step-detail-item">
+                            <span class="step-detail-label">等待策略</span>
+                            <span class="step-detail-value">${step.wait_strategy}${step.wait_target ? ' (' + this.escapeHtml(step.wait_target) + ')' : ''}，超时 ${step.wait_timeout || 30} 秒</span>
+                        </div>
+                        ` : ''}
                         ${step.assertion_enabled === 'yes' ? `
                         <div class="step-detail-item">
                             <span class="step-detail-label">断言设置</span>
@@ -3825,6 +3930,10 @@ class AutomationManagement {
             operation_params: '',
             operation_count: 1,
             pause_time: 1,
+            // 等待策略：fixed为固定暂停，其余策略在页面就绪后立即继续
+            wait_strategy: 'fixed',
+            wait_target: '',
+            wait_timeout: 30,
             // 断言设置相关字段
             assertion_enabled: 'no',
             assertion_type: 'ui',
@@ -3934,6 +4043,19 @@ class AutomationManagement {
                                placeholder="1.0" 
                                onchange="automationManagement.updateTestStep(${index}, 'pause_time', this.value)">
                     </div>
+                    <div class="form-group">
+                        <label for="wait-strategy-${index}">等待策略</label>
+                        <select id="wait-strategy-${index}" onchange="automationManagement.updateTestStep(${index}, 'wait_strategy', this.value)">
+                            <option value="fixed" ${(step.wait_strategy || 'fixed') === 'fixed' ? 'selected' : ''}>固定暂停</option>
+                            <option value="selector" ${step.wait_strategy === 'selector' ? 'selected' : ''}>等待元素出现</option>
+                            <option value="load_state" ${step.wait_strategy === 'load_state' ? 'selected' : ''}>等待页面加载</option>
+                            <option value="networkidle" ${step.wait_strategy === 'networkidle' ? 'selected' : ''}>等待网络空闲</option>
+                            <option value="url" ${step.wait_strategy === 'url' ? 'selected' : ''}>等待URL匹配</option>
+                            <option value="image" ${step.wait_strategy === 'image' ? 'selected' : ''}>等待图片出现</option>
+                        </select>
+                        ${['selector', 'load_state', 'url', 'image'].includes(step.wait_strategy) ? `<input type="text" id="wait-target-${index}" value="${(step.wait_target || '').replace(/\"/g, '&quot;')}" placeholder="${this.getWaitTargetPlaceholder(step.wait_strategy)}" onchange="automationManagement.updateTestStep(${index}, 'wait_target', this.value)" style="margin-left: 8px;">` : ''}
+                        ${(step.wait_strategy || 'fixed') !== 'fixed' ? `<input type="number" id="wait-timeout-${index}" min="1" value="${step.wait_timeout || 30}" placeholder="超时(秒)" title="超时(秒)" onchange="automationManagement.updateTestStep(${index}, 'wait_timeout', this.value)" style="margin-left: 8px; width: 90px;">` : ''}
+                    </div>
                     
                     <!-- 标签页跳转功能 - 仅在Web操作时显示 -->
                     ${step.operation_type === 'web' ? `
@@ -4111,7 +4233,7 @@ class AutomationManagement {
                     </button>
                     ${hasImage ? `
                         <div class="image-preview-enhanced" id="image-preview-${index}">
-                            <img src="${imageSource}" 
+                            <img src="${this.toThumbnailUrl(imageSource)}" 
                                  alt="步骤图片预览">
                             <button type="button" class="remove-image-enhanced" 
                                     onclick="automationManagement.removeStepImage(${index})">
@@ -4124,6 +4246,17 @@ class AutomationManagement {
         }
     }
 
+    // 等待目标输入框提示，留空时selector/image使用步骤的操作参数
+    getWaitTargetPlaceholder(strategy) {
+        const placeholders = {
+            selector: '元素选择器，留空使用元素定位参数',
+            load_state: 'load / domcontentloaded / networkidle',
+            url: 'URL包含的片段，留空使用标签页跳转地址',
+            image: '图片路径，留空使用步骤图片'
+        };
+        return placeholders[strategy] || '';
+    }
+
     // 更新测试步骤
     updateTestStep(index, field, value) {
         if (this.testSteps[index]) {
@@ -4135,6 +4268,13 @@ class AutomationManagement {
                 if (this.isEditing && this.editingTestSteps) {
                     this.editingTestSteps[index][field] = numValue;
                 }
+            } else if (field === 'wait_timeout') {
+                const numValue = parseFloat(value) || 30;
+                this.testSteps[index][field] = numValue;
+                // 如果是编辑模式，同时更新编辑副本
+                if (this.isEditing && this.editingTestSteps) {
+                    this.editingTestSteps[index][field] = numValue;
+                }
             } else if (field === 'pause_time') {
                 const numValue = parseFloat(value) || 1;
                 this.testSteps[index][field] = numValue;
@@ -4199,6 +4339,11 @@ class AutomationManagement {
                 this.renderTestSteps();
             }
             
+            // 等待策略变化时重新渲染以显示/隐藏等待目标与超时输入框
+            if (field === 'wait_strategy') {
+                this.renderTestSteps();
+            }
+            
             // 如果是跳转相关字段变化，重新计算所有步骤的标签页索引
             if (field === 'tab_switch_action' || field === 'tab_target_url' || field === 'tab_switch_enabled') {
                 this.recalculateStepTabIndexes();
@@ -4634,7 +4779,7 @@ class AutomationManagement {
                         <h4>${assertion.name || `图片断言 ${index + 1}`}</h4>
                         <p>${assertion.description || '图片匹配验证'}</p>
                         <div class="image-preview">
-                            <img src="${assertion.image_path || ''}" alt="断言图片" />
+                            <img src="${this.toThumbnailUrl(assertion.image_path || '')}" alt="断言图片" />
                         </div>
                     </div>
                     <div class="assertion-actions">
@@ -5972,61 +6117,52 @@ class AutomationManagement {
                         return;
                     }
                     
-                    // 获取项目状态
-                    const response = await fetch(`/api/automation/projects/${projectId}`);
+                    // 获取项目状态（与状态轮询共用同一个批量请求）
+                    const project = await this.pollProjectStatus(projectId);
                     
-                    // 处理HTTP错误
-                    if (!response.ok) {
-                        if (response.status === 404) {
-                            console.warn(`⚠️ [批量执行] 项目 ${projectId} 不存在或已删除，跳过状态检查`);
-                            resolve(); // 404时直接认为项目完成
-                            return;
-                        }
-                        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+                    if (!project) {
+                        console.warn(`⚠️ [批量执行] 项目 ${projectId} 不存在或已删除，跳过状态检查`);
+                        resolve(); // 项目不存在时直接认为项目完成
+                        return;
                     }
                     
-                    const result = await response.json();
+                    const status = project.status;
+                    const lastStatus = project.last_status;
                     
-                    if (result.success) {
-                        const project = result.data;
-                        const status = project.status;
-                        const lastStatus = project.last_status;
-                        
-                        console.log(`📊 [批量执行] 项目 ${projectId} 状态检查: status=${status}, last_status=${lastStatus}`);
-                        
-                        // 检查是否真正完成
-                        const isCompleted = this.isProjectReallyCompleted(status, lastStatus);
+                    console.log(`📊 [批量执行] 项目 ${projectId} 状态检查: status=${status}, last_status=${lastStatus}`);
+                    
+                    // 检查是否真正完成
+                    const isCompleted = this.isProjectReallyCompleted(status, lastStatus);
+                    
+                    if (isCompleted) {
+                        consecutiveCompletedChecks++;
+                        console.log(`✅ [批量执行] 项目 ${projectId} 完成状态检查 ${consecutiveCompletedChecks}/${requiredConsecutiveChecks}`);
                         
-                        if (isCompleted) {
-                            consecutiveCompletedChecks++;
-                            console.log(`✅ [批量执行] 项目 ${projectId} 完成状态检查 ${consecutiveCompletedChecks}/${requiredConsecutiveChecks}`);
+                        // 需要连续检查到完成状态，确保不是状态闪烁
+                        if (consecutiveCompletedChecks >= requiredConsecutiveChecks) {
+                            // 从批量执行集合移除
+                            if (this.batchRunningProjects) {
+                                this.batchRunningProjects.delete(projectId);
+                            }
                             
-                            // 需要连续检查到完成状态，确保不是状态闪烁
-                            if (consecutiveCompletedChecks >= requiredConsecutiveChecks) {
-                                // 从批量执行集合移除
-                                if (this.batchRunningProjects) {
-                                    this.batchRunningProjects.delete(projectId);
-                                }
-                                
-                                console.log(`🏁 [批量执行] 项目 ${projectId} 确认完成，last_status: ${lastStatus}`);
-                                
-                                if (lastStatus === 'failed') {
-                                    reject(new Error('执行失败'));
-                                } else if (lastStatus === 'cancelled') {
-                                    reject(new Error('执行被取消'));
-                                } else {
-                                    resolve();
-                                }
-                                return;
+                            console.log(`🏁 [批量执行] 项目 ${projectId} 确认完成，last_status: ${lastStatus}`);
+                            
+                            if (lastStatus === 'failed') {
+                                reject(new Error('执行失败'));
+                            } else if (lastStatus === 'cancelled') {
+                                reject(new Error('执行被取消'));
+                            } else {
+                                resolve();
                             }
-                        } else {
-                            // 重置连续检查计数
-                            consecutiveCompletedChecks = 0;
+                            return;
                         }
-                        
-                        lastKnownStatus = lastStatus;
+                    } else {
+                        // 重置连续检查计数
+                        consecutiveCompletedChecks = 0;
                     }
                     
+                    lastKnownStatus = lastStatus;
+                    
                     // 继续等待
                     setTimeout(checkStatus, checkInterval);
                     
@@ -6066,12 +6202,11 @@ class AutomationManagement {
         
         // 额外检查执行记录是否完整
         try {
-            const response = await fetch(`/api/automation/projects/${projectId}/executions?page=1&page_size=1`);
-            const result = await response.json();
+            const project = await this.pollProjectStatus(projectId);
+            const latestRecord = project && project.latest_execution;
             
-            if (result.success && result.data && result.data.length > 0) {
-                const latestRecord = result.data[0];
-                const logContent = latestRecord.detailed_log || latestRecord.log_message || '';
+            if (latestRecord) {
+                const logContent = latestRecord.log_message || '';
                 console.log(`📋 [批量执行] 项目 ${projectId} 最新执行记录: ${latestRecord.status}, 日志长度: ${logContent.length}`);
                 
                 // 如果日志为空或状态还是running，再等待一下
@@ -6110,12 +6245,10 @@ class AutomationManagement {
                         return;
                     }
                     
-                    // 获取项目状态
-                    const response = await fetch(`/api/automation/projects/${projectId}`);
-                    const result = await response.json();
+                    // 获取项目状态（与状态轮询共用同一个批量请求）
+                    const project = await this.pollProjectStatus(projectId);
                     
-                    if (result.success) {
-                        const project = result.data;
+                    if (project) {
                         const status = project.status;
                         const lastStatus = project.last_status;
                         
@@ -7472,15 +7605,15 @@ class AutomationManagement {
             // 始终执行状态更新，确保执行记录状态同步
                 await this.updateProjectStatus();
             
-            // 如果没有运行中的项目，停止轮询
-            if (this.runningProjects.size === 0) {
+            // 如果没有需要轮询的项目，停止轮询
+            if (!this.hasPollingTargets()) {
                 console.log('没有运行中的项目，停止轮询');
                 this.stopStatusPolling();
             }
         }, 2000);
         
-        // 立即执行一次状态检查
-        this.updateProjectStatus();
+        // 立即执行一次状态检查（推迟到当前任务结束，同一时刻发起的状态等待合并到这一次请求）
+        setTimeout(() => this.updateProjectStatus(), 0);
     }
 
     // 停止状态轮询
@@ -7491,80 +7624,125 @@ class AutomationManagement {
         }
     }
 
-    // 更新项目状态
+    // 是否还有需要轮询的项目（运行中、批量执行中或正在等待状态的调用方）
+    hasPollingTargets() {
+        return this.runningProjects.size > 0 ||
+            (this.batchRunningProjects && this.batchRunningProjects.size > 0) ||
+            this.statusTickWaiters.length > 0;
+    }
+
+    // 收集本次轮询需要获取的项目ID：当前可见、运行中、批量执行中以及等待状态的项目
+    collectPollingProjectIds(waiters = []) {
+        const ids = new Set();
+        if (Array.isArray(this.projects)) {
+            this.projects.forEach(project => ids.add(project.id));
+        }
+        document.querySelectorAll('#automation-list [data-project-id]').forEach(element => {
+            const projectId = parseInt(element.getAttribute('data-project-id'), 10);
+            if (!isNaN(projectId)) {
+                ids.add(projectId);
+            }
+        });
+        this.runningProjects.forEach(projectId => ids.add(projectId));
+        if (this.batchRunningProjects) {
+            this.batchRunningProjects.forEach(projectId => ids.add(projectId));
+        }
+        waiters.forEach(waiter => ids.add(waiter.projectId));
+        return Array.from(ids);
+    }
+
+    // 获取项目在下一次状态轮询中的最新摘要（含 latest_execution），项目不存在时返回null
+    // 所有等待项目状态的调用方共用每次轮询的同一个批量请求
+    pollProjectStatus(projectId) {
+        return new Promise((resolve, reject) => {
+            this.statusTickWaiters.push({ projectId, resolve, reject });
+            if (!this.statusPollingInterval) {
+                this.startStatusPolling();
+            }
+        });
+    }
+
+    // 更新项目状态：每次轮询只发一次批量请求
     async updateProjectStatus() {
+        const waiters = this.statusTickWaiters;
+        this.statusTickWaiters = [];
         try {
             console.log('开始更新项目状态...');
-            const response = await fetch('/api/automation/projects');
-            const result = await response.json();
+            // 确保 this.projects 是数组
+            if (!Array.isArray(this.projects)) {
+                console.error('updateProjectStatus: this.projects 不是数组，当前类型:', typeof this.projects);
+                this.projects = [];
+            }
             
-            if (result.success) {
-                // 确保 this.projects 是数组
-                if (!Array.isArray(this.projects)) {
-                    console.error('updateProjectStatus: this.projects 不是数组，当前类型:', typeof this.projects);
-                    this.projects = [];
+            const projectIds = this.collectPollingProjectIds(waiters);
+            if (projectIds.length === 0) {
+                waiters.forEach(waiter => waiter.resolve(null));
+                return;
+            }
+            
+            const bulkData = await this.fetchProjectsBulk(projectIds);
+            const previousProjects = this.polledProjects;
+            this.polledProjects = new Map(bulkData.projects.map(project => [project.id, project]));
+            waiters.forEach(waiter => waiter.resolve(this.polledProjects.get(waiter.projectId) || null));
+            
+            // 本次获取的项目与其上一次的状态对比，首次获取的项目以当前页数据为准
+            const newProjects = bulkData.projects;
+            const oldProjects = newProjects.map(project =>
+                previousProjects.get(project.id) || this.projects.find(p => p.id === project.id) || project);
+            // 更新当前页的项目摘要，保持当前页的顺序
+            this.projects = this.projects.map(project =>
+                this.polledProjects.has(project.id) ? { ...project, ...this.polledProjects.get(project.id) } : project);
+            
+            // 更新运行中的项目集合
+            const oldRunningCount = this.runningProjects.size;
+            this.runningProjects.clear();
+            newProjects.forEach(project => {
+                // 使用 last_status 来判断项目是否在运行
+                if (project.last_status === 'running') {
+                    this.runningProjects.add(project.id);
                 }
+            });
+            
+            // 调试信息
+            console.log('状态轮询 - 运行中的项目:', Array.from(this.runningProjects));
+            console.log('状态轮询 - 项目状态:', newProjects.map(p => ({id: p.id, name: p.process_name, status: p.status, last_status: p.last_status})));
+            console.log('运行中项目数量变化:', oldRunningCount, '->', this.runningProjects.size);
+            
+            // 检查状态变化并立即更新UI
+            const hasStatusChanges = this.checkStatusChanges(oldProjects, newProjects);
+            
+            // 如果有状态变化，立即智能更新UI
+            if (hasStatusChanges) {
+                console.log('检测到状态变化，更新UI');
+                await this.smartUpdateProjects(oldProjects, newProjects);
                 
-                const oldProjects = [...this.projects];
-                
-                // 确保从API获取的数据是数组
-                const projectsData = result.data.projects || result.data;
-                this.projects = Array.isArray(projectsData) ? projectsData : [];
-                
-                console.log('状态轮询 - 获取到的项目数据:', this.projects);
-                console.log('状态轮询 - 项目数据类型:', typeof this.projects);
-                console.log('状态轮询 - 项目数据是否为数组:', Array.isArray(this.projects));
-                
-                // 更新运行中的项目集合
-                const oldRunningCount = this.runningProjects.size;
-                this.runningProjects.clear();
-                this.projects.forEach(project => {
-                    // 使用 last_status 来判断项目是否在运行
-                    if (project.last_status === 'running') {
-                        this.runningProjects.add(project.id);
-                    }
-                });
-                
-                // 调试信息
-                console.log('状态轮询 - 运行中的项目:', Array.from(this.runningProjects));
-                console.log('状态轮询 - 项目状态:', this.projects.map(p => ({id: p.id, name: p.process_name, status: p.status, last_status: p.last_status})));
-                console.log('运行中项目数量变化:', oldRunningCount, '->', this.runningProjects.size);
-                
-                // 检查状态变化并立即更新UI
-                const hasStatusChanges = this.checkStatusChanges(oldProjects, this.projects);
+                // 更新按钮状态和项目状态显示
+                this.updateButtonStatesAndStatus();
                 
-                // 如果有状态变化，立即智能更新UI
-                if (hasStatusChanges) {
-                    console.log('检测到状态变化，更新UI');
-                    await this.smartUpdateProjects(oldProjects, this.projects);
-                    
-                    // 更新按钮状态和项目状态显示
-                    this.updateButtonStatesAndStatus();
-                    
-                    // 如果有项目状态变为非运行状态，刷新执行记录
-                    for (const project of this.projects) {
-                        const oldProject = oldProjects.find(p => p.id === project.id);
-                        if (oldProject && oldProject.last_status === 'running' && project.last_status !== 'running') {
-                            console.log(`项目 ${project.process_name} 状态从 running 变为 ${project.last_status}`);
-                            if (this.expandedProjects.has(project.id)) {
-                                await this.loadRecentExecutions(project.id);
-                            }
+                // 如果有项目状态变为非运行状态，刷新执行记录
+                for (const project of newProjects) {
+                    const oldProject = oldProjects.find(p => p.id === project.id);
+                    if (oldProject && oldProject.last_status === 'running' && project.last_status !== 'running') {
+                        console.log(`项目 ${project.process_name} 状态从 running 变为 ${project.last_status}`);
+                        if (this.expandedProjects.has(project.id)) {
+                            await this.loadRecentExecutions(project.id);
                         }
                     }
-                } else {
-                    // 即使没有状态变化，也要更新已展开项目的执行记录状态
-                    // 确保执行记录的状态与项目状态保持一致
-                    for (const projectId of this.expandedProjects) {
-                        const project = this.projects.find(p => p.id === projectId);
-                        if (project && project.last_status !== 'running') {
-                            // 检查执行记录是否需要更新
-                            await this.refreshExecutionRecordsIfNeeded(projectId);
-                        }
+                }
+            } else {
+                // 即使没有状态变化，也要更新已展开项目的执行记录状态
+                // 确保执行记录的状态与项目状态保持一致
+                for (const projectId of this.expandedProjects) {
+                    const project = this.polledProjects.get(projectId);
+                    if (project && project.last_status !== 'running') {
+                        // 检查执行记录是否需要更新
+                        await this.refreshExecutionRecordsIfNeeded(projectId);
                     }
                 }
             }
         } catch (error) {
             console.error('更新项目状态失败:', error);
+            waiters.forEach(waiter => waiter.reject(error));
         }
     }
 
@@ -7615,8 +7793,8 @@ class AutomationManagement {
             }
         });
         
-        // 如果没有运行中的项目，停止轮询
-        if (this.runningProjects.size === 0) {
+        // 如果没有需要轮询的项目，停止轮询
+        if (!this.hasPollingTargets()) {
             this.stopStatusPolling();
         }
         
@@ -7770,34 +7948,51 @@ class AutomationManagement {
         }
     }
 
+    // 批量获取项目摘要及最近一次执行记录（一次请求代替逐个获取项目详情，超过单次上限时分批）
+    async fetchProjectsBulk(projectIds) {
+        const ids = Array.from(new Set(projectIds));
+        const batchSize = 100; // 与服务端 BULK_PROJECT_MAX_IDS 一致
+        const data = { projects: [], missing_ids: [] };
+        for (let i = 0; i < ids.length; i += batchSize) {
+            const batch = ids.slice(i, i + batchSize).join(',');
+            const response = await fetch(`/api/automation/projects/bulk?ids=${batch}&_t=${Date.now()}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            const result = await response.json();
+            if (!result.success) {
+                throw new Error(result.message || '批量获取项目失败');
+            }
+            data.projects.push(...result.data.projects);
+            data.missing_ids.push(...result.data.missing_ids);
+        }
+        return data;
+    }
+
     // 刷新单个项目状态
     async refreshSingleProjectStatus(projectId) {
         try {
             console.log(`刷新项目 ${projectId} 的状态`);
             
-            // 获取单个项目的最新状态
-            const response = await fetch(`/api/automation/projects?page=1&page_size=1000`);
-            const result = await response.json();
+            // 获取单个项目的最新状态（与状态轮询共用同一个批量请求）
+            const updatedProject = await this.pollProjectStatus(projectId);
             
-            if (result.success && result.data && result.data.projects) {
-                const updatedProject = result.data.projects.find(p => p.id === projectId);
-                if (updatedProject) {
-                    // 更新内存中的项目状态
-                    const projectIndex = this.projects.findIndex(p => p.id === projectId);
-                    if (projectIndex !== -1) {
-                        console.log(`项目 ${updatedProject.process_name} 状态更新: ${this.projects[projectIndex].last_status} -> ${updatedProject.last_status}`);
-                        this.projects[projectIndex] = updatedProject;
-                    }
-                    
-                    // 如果是分组视图，也更新分组数据
-                    if (this.showGroupedView && Array.isArray(this.groupedProjects)) {
-                        for (const group of this.groupedProjects) {
-                            if (group.projects) {
-                                const groupProjectIndex = group.projects.findIndex(p => p.id === projectId);
-                                if (groupProjectIndex !== -1) {
-                                    group.projects[groupProjectIndex] = updatedProject;
-                                    break;
-                                }
+            if (updatedProject) {
+                // 更新内存中的项目状态
+                const projectIndex = this.projects.findIndex(p => p.id === projectId);
+                if (projectIndex !== -1) {
+                    console.log(`项目 ${updatedProject.process_name} 状态更新: ${this.projects[projectIndex].last_status} -> ${updatedProject.last_status}`);
+                    this.projects[projectIndex] = updatedProject;
+                }
+                
+                // 如果是分组视图，也更新分组数据
+                if (this.showGroupedView && Array.isArray(this.groupedProjects)) {
+                    for (const group of this.groupedProjects) {
+                        if (group.projects) {
+                            const groupProjectIndex = group.projects.findIndex(p => p.id === projectId);
+                            if (groupProjectIndex !== -1) {
+                                group.projects[groupProjectIndex] = updatedProject;
+                                break;
                             }
                         }
                     }
@@ -7808,38 +8003,11 @@ class AutomationManagement {
         }
     }
 
-    // 刷新项目状态（立即获取最新状态并智能更新）
+    // 刷新项目状态（立即获取最新状态并智能更新，与状态轮询使用同一个批量请求）
     async refreshProjectStatus() {
-        try {
-            const response = await fetch('/api/automation/projects');
-            const result = await response.json();
-            
-            if (result.success) {
-                const oldProjects = [...this.projects];
-                const newProjects = result.data.projects || result.data;
-                
-                // 确保 newProjects 是数组
-                this.projects = Array.isArray(newProjects) ? newProjects : [];
-                
-                // 确保 this.projects 是数组
-                if (!Array.isArray(this.projects)) {
-                    console.error('refreshProjectStatus: this.projects 不是数组，当前类型:', typeof this.projects);
-                    this.projects = [];
-                    return;
-                }
-                
-                // 更新按钮状态和项目状态显示
-                this.updateButtonStatesAndStatus();
-                
-                // 检查状态变化
-                this.checkStatusChanges(oldProjects, newProjects);
-                
-                // 智能更新UI
-                await this.smartUpdateProjects(oldProjects, newProjects);
-            }
-        } catch (error) {
-            console.error('刷新项目状态失败:', error);
-        }
+        await this.updateProjectStatus();
+        // 更新按钮状态和项目状态显示
+        this.updateButtonStatesAndStatus();
     }
 
     // 添加取消按钮动画
@@ -8042,8 +8210,10 @@ class AutomationManagement {
         
         // 管理状态轮询
         if (this.runningProjects.size > 0) {
-            this.startStatusPolling();
-        } else {
+            if (!this.statusPollingInterval) {
+                this.startStatusPolling();
+            }
+        } else if (!this.hasPollingTargets()) {
             this.stopStatusPolling();
         }
     }
@@ -8065,12 +8235,11 @@ class AutomationManagement {
         try {
             console.log(`展开项目后同步状态: ${projectId}`);
             
-            // 获取最新的执行记录
-            const executionResponse = await fetch(`/api/automation/projects/${projectId}/executions?page=1&page_size=1`);
-            const executionResult = await executionResponse.json();
+            // 获取最新的执行记录（状态轮询批量结果中的 latest_execution）
+            const polledProject = await this.pollProjectStatus(projectId);
+            const latestExecution = polledProject && polledProject.latest_execution;
             
-            if (executionResult.success && executionResult.data.length > 0) {
-                const latestExecution = executionResult.data[0];
+            if (latestExecution) {
                 const project = this.projects.find(p => p.id === projectId);
                 
                 if (project) {
@@ -8103,38 +8272,28 @@ class AutomationManagement {
         }
     }
 
-    // 检查并刷新执行记录状态
+    // 检查并刷新执行记录状态（使用状态轮询批量结果中的 latest_execution，不再单独请求）
     async refreshExecutionRecordsIfNeeded(projectId) {
         try {
-            // 获取最新的执行记录
-            const response = await fetch(`/api/automation/projects/${projectId}/executions?page=1&page_size=5`);
-            const result = await response.json();
+            const polledProject = this.polledProjects.get(projectId);
+            const latestExecution = polledProject && polledProject.latest_execution;
+            if (!latestExecution) {
+                return;
+            }
             
-            if (result.success && result.data.length > 0) {
-                // 检查最新的执行记录状态
-                const latestExecution = result.data[0];
-                const project = this.projects.find(p => p.id === projectId);
+            const project = this.projects.find(p => p.id === projectId) || polledProject;
+            // 检查项目状态与最新执行记录状态是否一致
+            const projectStatus = project.last_status || project.status;
+            const executionStatus = latestExecution.status;
+            
+            if (projectStatus !== executionStatus) {
+                console.log(`项目 ${project.process_name} 状态不一致 - 项目状态: ${projectStatus}, 执行记录状态: ${executionStatus}`);
                 
-                if (project) {
-                    // 检查项目状态与最新执行记录状态是否一致
-                    const projectStatus = project.last_status || project.status;
-                    const executionStatus = latestExecution.status;
-                    
-                    if (projectStatus !== executionStatus) {
-                        console.log(`项目 ${project.process_name} 状态不一致 - 项目状态: ${projectStatus}, 执行记录状态: ${executionStatus}`);
-                        
-                        // 先刷新项目状态，再刷新执行记录
-                        await this.refreshSingleProjectStatus(projectId);
-                    await this.loadRecentExecutions(projectId);
-                        
-                        // 更新项目卡片状态显示
-                        this.updateProjectStatusDisplay(projectId, executionStatus);
-                    }
-                } else {
-                    // 如果找不到项目，直接刷新执行记录
-                    console.log(`项目 ${projectId} 在内存中未找到，直接刷新执行记录`);
-                    await this.loadRecentExecutions(projectId);
-                }
+                // 刷新执行记录
+                await this.loadRecentExecutions(projectId);
+                
+                // 更新项目卡片状态显示
+                this.updateProjectStatusDisplay(projectId, executionStatus);
             }
         } catch (error) {
             console.error('检查执行记录状态失败:', error);
@@ -8593,6 +8752,19 @@ class AutomationManagement {
         }
     }
     
+    // 定位编译错误所在的代码行
+    highlightCodeError(compileError) {
+        if (!this.codeEditor || !compileError.line) {
+            return;
+        }
+        const line = compileError.line - 1;
+        const ch = Math.max((compileError.column || 1) - 1, 0);
+        this.codeEditor.focus();
+        this.codeEditor.setCursor({ line, ch });
+        this.codeEditor.scrollIntoView({ line, ch }, 100);
+        this.codeEditor.setSelection({ line, ch: 0 }, { line, ch: this.codeEditor.getLine(line)?.length || 0 });
+    }
+    
     // 保存代码（不关闭弹框）
     async saveCode() {
         if (!this.currentCodeProjectId) {
@@ -8641,6 +8813,10 @@ class AutomationManagement {
                 }, 200);
                 
             } else {
+                // 编译失败时定位到出错的代码行
+                if (result.data && result.data.compile_error) {
+                    this.highlightCodeError(result.data.compile_error);
+                }
                 throw new Error(result.message || '保存失败');
             }
             
@@ -8699,6 +8875,10 @@ class AutomationManagement {
                 }, 1000); // 延迟1秒关闭，让用户看到保存成功的提示
                 
             } else {
+                // 编译失败时定位到出错的代码行
+                if (result.data && result.data.compile_error) {
+                    this.highlightCodeError(result.data.compile_error);
+                }
                 throw new Error(result.message || '保存失败');
             }
             
@@ -8894,7 +9074,7 @@ class AutomationManagement {
                 if (this.showGroupedView) {
                     this.renderGroupedProjects();
                 } else {
-                    this.renderProjectsList();
+                    this.loadProjects(1);
                 }
             });
         }
@@ -8908,11 +9088,11 @@ class AutomationManagement {
         
         this.currentPage = page;
         
-        // 根据当前视图模式调用相应的渲染函数
+        // 分组视图在本地对分组分页，列表视图向后端请求对应页
         if (this.showGroupedView) {
             this.renderGroupedProjects();
         } else {
-            this.renderProjectsList();
+            this.loadProjects(page);
         }
         
         // 滚动到列表顶部
@@ -9220,7 +9400,7 @@ class AutomationManagement {
     // 打开编辑项目弹窗
     async openEditProjectModal(projectId) {
         try {
-            const project = this.projects.find(p => p.id === projectId);
+            const project = await this.loadFullProject(projectId);
             if (!project) {
                 showToast('项目不存在', 'error');
                 return;
@@ -10630,6 +10810,22 @@ class AutomationManagement {
 
 
 
+    // 将图片路径转换为缩略图地址（仅处理服务端已保存的图片）
+    toThumbnailUrl(imagePath, width = 240) {
+        if (!imagePath) return imagePath;
+        const thumbDirs = [
+            ['/IMG_LOGS/IMA_ASSERT/', 'assert'],
+            ['/IMG_LOGS/', 'screenshot'],
+            ['/Game_Img/', 'game']
+        ];
+        for (const [prefix, kind] of thumbDirs) {
+            if (imagePath.startsWith(prefix) && !imagePath.slice(prefix.length).includes('/')) {
+                return `/thumb/${kind}/${imagePath.slice(prefix.length)}?w=${width}`;
+            }
+        }
+        return imagePath;
+    }
+
     // 查看截图
     viewScreenshot(imagePath) {
         // 创建图片查看模态框
@@ -0,0 +1,200 @@
+"""
+测试代码生成器测试套件
+验证模板渲染出的测试文件可以编译，且用户输入被安全转义
+"""
+import ast
+
+import pytest
+
+from utils.test_code_generator import TestCodeGenerator
+
+
+def build_project_data():
+    """构造覆盖网页/游戏操作、截图、标签页跳转和各类断言的项目数据"""
+    return {
+        'process_name': '登录流程',
+        'test_steps': [
+            {
+                'step_name': '点击 "登录"\n按钮',
+                'operation_type': 'web',
+                'operation_event': 'click',
+                'operation_params': '#login[name="submit"]',
+                'operation_count': '2',
+                'pause_time': 'x',
+                'screenshot_enabled': 'yes',
+                'screenshot_config': {'timing': 'both'},
+                'tab_switch_enabled': 'yes',
+                'tab_target_url': 'https://example.com/?q="1"',
+                'wait_strategy': 'selector',
+                'assertion_enabled': 'yes',
+                'assertion_config': {
+                    'ui_assertions': [
+                        {'type': 'text_contains', 'target_element': '#title', 'expected_value': 'he said "hi"'},
+                        {'type': 'element_count', 'target_element': 'li', 'expected_value': '3'},
+                    ],
+                    'custom_assertions': [{'name': '自定义', 'code': '    x = 1\n    assert x == 1'}],
+                },
+            },
+            {
+                'step_name': '输入用户名',
+                'operation_type': 'web',
+                'operation_event': 'input',
+                'operation_params': '#username',
+                'input_value': "a'b",
+                'screenshot_enabled': 'YES',
+                'screenshot_config': {'timing': 'on_failure'},
+                'wait_strategy': 'load_state',
+                'wait_target': 'networkidle',
+            },
+            {
+                'step_name': '点击游戏图标',
+                'operation_type': 'game',
+                'operation_event': 'double_click',
+                'operation_params': 'Game_Img\\icon.png',
+                'wait_strategy': 'image',
+            },
+        ],
+    }
+
+
+def string_constants(tree):
+    """收集语法树中的全部字符串常量"""
+    return {node.value for node in ast.walk(tree)
+            if isinstance(node, ast.Constant) and isinstance(node.value, str)}
+
+
+class TestCodeGeneratorRender:
+    """测试代码生成器渲染测试类"""
+
+    @pytest.fixture
+    def generator(self):
+        """生成器实例fixture"""
+        return TestCodeGenerator()
+
+    @pytest.mark.parametrize('product_addresses, expected_functions', [
+        ([('P-1', 'http://a.example.com')], ['test_P_1', 'test_concurrent_independent_browsers']),
+        ([('P-1', 'http://a.example.com'), ('P-2', 'http://b.example.com')],
+         ['test_P_1_1', 'test_P_2_2', 'test_concurrent_independent_browsers']),
+    ])
+    def test_render_compiles(self, generator, product_addresses, expected_functions):
+        """测试单地址和多地址渲染的源码均可编译，每个地址生成一个测试函数并附带并发执行入口"""
+        source = generator.render(build_project_data(), product_addresses)
+
+        compile(source, 'generated_test.py', 'exec')
+        tree = ast.parse(source)
+        functions = [node.name for node in tree.body
+                     if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        assert functions == expected_functions
+        assert f"生成器版本 {generator.GENERATOR_VERSION}" in source.splitlines()[0]
+
+    def test_render_escapes_user_input(self, generator):
+        """测试引号、换行等用户输入以原值出现在生成的字符串常量中"""
+        source = generator.render(build_project_data(), [('P-1', 'http://a.example.com')])
+
+        constants = string_constants(ast.parse(source))
+        assert '#login[name="submit"]' in constants
+        assert 'he said "hi"' in constants
+        assert "a'b" in constants
+        assert 'https://example.com/?q="1"' in constants
+        # 游戏模板路径统一为正斜杠
+        assert 'Game_Img/icon.png' in constants
+
+    def test_render_empty_steps_compiles(self, generator):
+        """测试没有测试步骤时仍生成可编译的测试函数"""
+        source = generator.render({'test_steps': []}, [('P-1', '')])
+
+        compile(source, 'generated_test.py', 'exec')
+
+    def test_render_without_addresses_raises(self, generator):
+        """测试没有产品地址时拒绝生成"""
+        with pytest.raises(ValueError):
+            generator.render(build_project_data(), [])
+
+
+class TestInputHash:
+    """生成输入哈希与跳过重新生成测试类"""
+
+    @pytest.fixture
+    def generator(self):
+        """生成器实例fixture"""
+        return TestCodeGenerator()
+
+    @pytest.fixture
+    def project_data(self):
+        """带产品ID和地址的项目数据fixture"""
+        data = build_project_data()
+        data.update({'product_ids': ['P-1'], 'system': 'web', 'product_address': 'http://a.example.com'})
+        return data
+
+    def test_hash_ignores_fields_outside_generated_code(self, generator, project_data):
+        """测试项目名称等不影响生成代码的字段不改变哈希"""
+        addresses = [('P-1', 'http://a.example.com')]
+        original = generator.compute_input_hash(project_data, addresses)
+
+        project_data['process_name'] = '改名后的流程'
+        project_data['description'] = '新的描述'
+        assert generator.compute_input_hash(project_data, addresses) == original
+
+    def test_hash_changes_with_generator_inputs(self, generator, project_data):
+        """测试步骤、产品地址或生成器版本变化时哈希改变"""
+        addresses = [('P-1', 'http://a.example.com')]
+        original = generator.compute_input_hash(project_data, addresses)
+
+        assert generator.compute_input_hash(project_data, [('P-1', 'http://b.example.com')]) != original
+
+        changed_steps = build_project_data()
+        changed_steps['test_steps'][1]['input_value'] = 'other'
+        assert generator.compute_input_hash(changed_steps, addresses) != original
+
+        generator.GENERATOR_VERSION = f"{TestCodeGenerator.GENERATOR_VERSION}-next"
+        assert generator.compute_input_hash(project_data, addresses) != original
+
+    def test_write_skipped_when_inputs_unchanged(self, monkeypatch, tmp_path, generator, project_data):
+        """测试输入哈希与文件映射一致且文件存在时不重新生成"""
+        import api.automation_management as automation_management
+        from utils.file_manager import file_manager
+
+        file_path = tmp_path / 'P_1_web_test.py'
+        file_path.write_text('# existing', encoding='utf-8')
+        addresses = automation_management.resolve_test_product_addresses(project_data)
+        mapping = {
+            'file_name': file_path.name,
+            'file_path': str(file_path),
+            'content_hash': generator.compute_input_hash(project_data, addresses),
+        }
+        writes, hash_updates = [], []
+        monkeypatch.setattr(automation_management, 'test_code_generator', generator)
+        monkeypatch.setattr(generator, 'write', lambda *args: writes.append(args) or str(file_path))
+        monkeypatch.setattr(file_manager, 'get_project_file_mapping', lambda project_id: mapping)
+        monkeypatch.setattr(file_manager, 'update_content_hash',
+                            lambda project_id, content_hash: hash_updates.append(content_hash))
+
+        assert automation_management.write_project_test_code(1, project_data) == str(file_path)
+        assert writes == []
+        assert hash_updates == []
+
+        # 测试步骤变化后重新生成并记录新的哈希
+        project_data['test_steps'][0]['operation_params'] = '#logout'
+        automation_management.write_project_test_code(1, project_data)
+        assert len(writes) == 1
+        assert hash_updates == [generator.compute_input_hash(project_data, addresses)]
+
+    def test_write_when_file_missing(self, monkeypatch, tmp_path, generator, project_data):
+        """测试哈希一致但测试文件已被删除时仍重新生成"""
+        import api.automation_management as automation_management
+        from utils.file_manager import file_manager
+
+        addresses = automation_management.resolve_test_product_addresses(project_data)
+        mapping = {
+            'file_name': 'P_1_web_test.py',
+            'file_path': str(tmp_path / 'P_1_web_test.py'),
+            'content_hash': generator.compute_input_hash(project_data, addresses),
+        }
+        writes = []
+        monkeypatch.setattr(automation_management, 'test_code_generator', generator)
+        monkeypatch.setattr(generator, 'write', lambda *args: writes.append(args) or mapping['file_path'])
+        monkeypatch.setattr(file_manager, 'get_project_file_mapping', lambda project_id: mapping)
+        monkeypatch.setattr(file_manager, 'update_content_hash', lambda project_id, content_hash: True)
+
+        automation_management.write_project_test_code(1, project_data)
+        assert len(writes) == 1
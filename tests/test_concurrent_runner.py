@@ -0,0 +1,150 @@
+"""
+多地址并发执行器测试套件
+验证失败即停开启与关闭时各地址任务的执行结果
+"""
+import asyncio
+
+import pytest
+
+from utils.concurrent_runner import ConcurrentRunner
+
+
+async def passing(delay, finished):
+    """延迟后成功完成，并记录已完成的任务"""
+    await asyncio.sleep(delay)
+    finished.append('passing')
+
+
+async def failing(delay):
+    """延迟后抛出断言错误"""
+    await asyncio.sleep(delay)
+    raise AssertionError('元素不存在')
+
+
+async def slow(delay, finished, cleaned):
+    """长时间运行的任务，被取消时仍执行清理"""
+    try:
+        await asyncio.sleep(delay)
+        finished.append('slow')
+    finally:
+        cleaned.append('slow')
+
+
+class TestConcurrentRunnerFailFast:
+    """并发执行器失败即停测试类"""
+
+    @pytest.fixture
+    def runner(self, monkeypatch):
+        """不受外部环境变量影响的执行器fixture"""
+        monkeypatch.delenv(ConcurrentRunner.FAIL_FAST_ENV, raising=False)
+        monkeypatch.delenv(ConcurrentRunner.ONLY_FUNCTIONS_ENV, raising=False)
+        return ConcurrentRunner()
+
+    async def test_fail_fast_cancels_remaining_tasks(self, runner):
+        """测试开启失败即停时任一任务失败立即取消其余任务，且被取消的任务完成清理"""
+        finished, cleaned = [], []
+        outcomes = await runner.run({
+            'test_a': passing(0, finished),
+            'test_b': failing(0.01),
+            'test_c': slow(5, finished, cleaned),
+        }, fail_fast=True)
+
+        by_function = {outcome['function']: outcome for outcome in outcomes}
+        assert [outcome['function'] for outcome in outcomes] == ['test_a', 'test_b', 'test_c']
+        assert by_function['test_a']['success'] is True
+        assert by_function['test_b'] == {'function': 'test_b', 'success': False,
+                                         'cancelled': False, 'error': '元素不存在'}
+        assert by_function['test_c']['cancelled'] is True
+        assert by_function['test_c']['success'] is False
+        assert finished == ['passing']
+        assert cleaned == ['slow']
+
+    async def test_without_fail_fast_waits_for_all_tasks(self, runner):
+        """测试关闭失败即停（默认）时任务失败后其余任务仍执行完毕"""
+        finished, cleaned = [], []
+        outcomes = await runner.run({
+            'test_a': failing(0),
+            'test_b': slow(0.05, finished, cleaned),
+        })
+
+        assert [(outcome['success'], outcome['cancelled']) for outcome in outcomes] == [
+            (False, False), (True, False)]
+        assert finished == ['slow']
+
+    @pytest.mark.parametrize('env_value, expected', [
+        (None, False), ('', False), ('1', True), ('true', True), ('0', False), ('off', False),
+    ])
+    def test_resolve_fail_fast_from_env(self, monkeypatch, runner, env_value, expected):
+        """测试默认关闭失败即停，只有 TEST_FAIL_FAST 开启时才启用"""
+        if env_value is not None:
+            monkeypatch.setenv(ConcurrentRunner.FAIL_FAST_ENV, env_value)
+        assert runner.resolve_fail_fast() is expected
+
+    def test_explicit_flag_overrides_env(self, monkeypatch, runner):
+        """测试显式传入的开关优先于环境变量"""
+        monkeypatch.setenv(ConcurrentRunner.FAIL_FAST_ENV, '1')
+        assert runner.resolve_fail_fast(False) is False
+
+        monkeypatch.setenv(ConcurrentRunner.FAIL_FAST_ENV, '0')
+        assert runner.resolve_fail_fast(True) is True
+
+    @pytest.mark.parametrize('request_data, expected', [
+        ({}, False), ({'fail_fast': None}, False), ({'fail_fast': ''}, False),
+        ({'fail_fast': True}, True), ({'fail_fast': '1'}, True), ({'fail_fast': 'false'}, False),
+    ])
+    def test_request_fail_fast_defaults_to_off(self, request_data, expected):
+        """测试请求中未传入、null 或空字符串的 fail_fast 使用默认策略（关闭）"""
+        from api.automation_management import get_request_fail_fast
+
+        assert get_request_fail_fast(request_data) is expected
+
+    async def test_env_enables_fail_fast_in_run(self, monkeypatch, runner):
+        """测试未显式指定时 TEST_FAIL_FAST=1 使 run 失败即停"""
+        monkeypatch.setenv(ConcurrentRunner.FAIL_FAST_ENV, '1')
+        finished, cleaned = [], []
+        outcomes = await runner.run({
+            'test_a': failing(0),
+            'test_b': slow(5, finished, cleaned),
+        })
+
+        assert outcomes[1]['cancelled'] is True
+        assert finished == []
+
+
+class TestConcurrentRunnerSelection:
+    """并发执行器只执行指定函数测试类"""
+
+    @pytest.fixture
+    def runner(self, monkeypatch):
+        """不受外部环境变量影响的执行器fixture"""
+        monkeypatch.delenv(ConcurrentRunner.FAIL_FAST_ENV, raising=False)
+        monkeypatch.delenv(ConcurrentRunner.ONLY_FUNCTIONS_ENV, raising=False)
+        return ConcurrentRunner()
+
+    async def test_only_runs_selected_functions(self, runner):
+        """测试只执行指定的测试函数"""
+        finished = []
+        outcomes = await runner.run({
+            'test_a': passing(0, finished),
+            'test_b': failing(0),
+        }, only=['test_a'])
+
+        assert [outcome['function'] for outcome in outcomes] == ['test_a']
+        assert outcomes[0]['success'] is True
+
+    @pytest.mark.parametrize('only', [[], ['test_missing']])
+    async def test_empty_selection_fails(self, runner, only):
+        """测试指定的函数一个都不存在时抛出错误，而不是按 0/0 视为通过"""
+        finished = []
+        with pytest.raises(ValueError):
+            await runner.run({'test_a': passing(0, finished)}, only=only)
+        assert finished == []
+
+    def test_selection_from_env(self, monkeypatch, runner):
+        """测试未显式指定时读取 TEST_ONLY_FUNCTIONS"""
+        monkeypatch.setenv(ConcurrentRunner.ONLY_FUNCTIONS_ENV, 'test_b, test_c')
+        assert runner.select_functions(['test_a', 'test_b']) == ['test_b']
+
+        monkeypatch.setenv(ConcurrentRunner.ONLY_FUNCTIONS_ENV, 'test_c')
+        with pytest.raises(ValueError):
+            runner.select_functions(['test_a', 'test_b'])
@@ -0,0 +1,115 @@
+"""
+测试文件名索引测试套件
+验证 Test_Case 目录和文件映射的文件名查找、序号查询与文件名分配
+"""
+import os
+
+import pytest
+
+from utils.test_file_index import TestFileIndex
+
+
+def bump_mtime(directory):
+    """推进目录修改时间，避免文件系统时间精度导致连续修改的时间相同"""
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestFileIndexLookups:
+    """测试文件名索引查找测试类"""
+
+    @pytest.fixture
+    def test_case_dir(self, tmp_path):
+        """包含若干测试文件的临时 Test_Case 目录fixture"""
+        for name in ('SC_Web_test.py', 'SC_Web_test_3.py', 'SC_Web_test_5.py',
+                     'SC_Web_4_test.py', 'notes.txt'):
+            (tmp_path / name).write_text('', encoding='utf-8')
+        return tmp_path
+
+    @pytest.fixture
+    def db_names(self):
+        """project_files 表中的文件名（可在测试中修改）"""
+        return {'SC_Web_test_2.py', 'SC_App_test.py'}
+
+    @pytest.fixture
+    def index(self, monkeypatch, test_case_dir, db_names):
+        """读取临时目录和给定文件映射的索引fixture，记录文件映射的加载次数"""
+        index = TestFileIndex(str(test_case_dir))
+        index.db_loads = 0
+
+        def load_db_names():
+            index.db_loads += 1
+            return set(db_names)
+
+        monkeypatch.setattr(index, '_load_db_names', load_db_names)
+        return index
+
+    def test_contains_disk_and_db_names(self, index):
+        """测试目录文件和文件映射中的文件名都视为已占用，只有目录文件存在于磁盘"""
+        assert index.contains('SC_Web_test.py')
+        assert index.contains('SC_App_test.py')
+        assert not index.contains('notes.txt')
+        assert index.exists_on_disk('SC_Web_test_3.py')
+        assert not index.exists_on_disk('SC_App_test.py')
+        assert not index.contains('SC_Other_test.py')
+
+    def test_lowest_number_only_counts_files_on_disk(self, index):
+        """测试序号查询返回目录中存在的最小序号，文件映射中的序号不参与"""
+        assert index.lowest_number('suffix', 'SC_Web_test') == 3
+        assert index.lowest_number('infix', 'SC_Web') == 4
+        assert index.lowest_number('suffix', 'SC_Web_test', start=4) == 5
+        assert index.lowest_number('suffix', 'SC_App_test') is None
+
+    def test_allocate_skips_used_numbers(self, index):
+        """测试分配文件名时避开目录、文件映射和已分配的文件名"""
+        assert index.allocate('SC_New_test.py', 'suffix', 'SC_New_test') == 'SC_New_test.py'
+        assert index.allocate('SC_New_test.py', 'suffix', 'SC_New_test') == 'SC_New_test_2.py'
+        assert index.allocate('SC_Web_test.py', 'suffix', 'SC_Web_test') == 'SC_Web_test_6.py'
+        assert index.allocate('SC_Web_test.py', 'suffix', 'SC_Web_test') == 'SC_Web_test_7.py'
+        assert index.allocate('SC_App_test.py', 'suffix', 'SC_App_test') == 'SC_App_test_2.py'
+
+    def test_directory_change_triggers_rescan(self, index, test_case_dir):
+        """测试目录修改时间变化后重新扫描目录，文件映射不重新查询"""
+        assert not index.exists_on_disk('SC_Late_test.py')
+
+        (test_case_dir / 'SC_Late_test.py').write_text('', encoding='utf-8')
+        bump_mtime(test_case_dir)
+
+        assert index.exists_on_disk('SC_Late_test.py')
+        assert index.db_loads == 1
+
+    def test_invalidate_reloads_db_names(self, index, db_names):
+        """测试失效后重新加载文件映射，未失效时只加载一次"""
+        assert not index.contains('SC_Renamed_test.py')
+        index.contains('SC_Web_test.py')
+        assert index.db_loads == 1
+
+        db_names.add('SC_Renamed_test.py')
+        assert not index.contains('SC_Renamed_test.py')
+
+        index.invalidate()
+        assert index.contains('SC_Renamed_test.py')
+        assert index.db_loads == 2
+
+    def test_find_existing_test_file_prefers_project_file(self, monkeypatch, index, test_case_dir):
+        """测试查找已有测试文件时按项目文件、基础文件、带序号文件的顺序返回磁盘上存在的文件"""
+        import api.automation_management as automation_management
+        import utils.test_file_index as test_file_index_module
+
+        monkeypatch.setattr(test_file_index_module, 'test_file_index', index)
+
+        assert automation_management.find_existing_test_file('SC', 'Web') == 'SC_Web_test.py'
+
+        (test_case_dir / 'SC_Web_9_test.py').write_text('', encoding='utf-8')
+        bump_mtime(test_case_dir)
+        assert automation_management.find_existing_test_file('SC', 'Web', project_id=9) == 'SC_Web_9_test.py'
+
+        (test_case_dir / 'SC_Web_test.py').unlink()
+        bump_mtime(test_case_dir)
+        assert automation_management.find_existing_test_file('SC', 'Web') == 'SC_Web_test_3.py'
+
+        (test_case_dir / 'SC_Web_test_3.py').unlink()
+        (test_case_dir / 'SC_Web_test_5.py').unlink()
+        bump_mtime(test_case_dir)
+        assert automation_management.find_existing_test_file('SC', 'Web') == 'SC_Web_4_test.py'
+        assert automation_management.find_existing_test_file('SC', 'App') is None
@@ -0,0 +1,53 @@
+"""
+图片识别测试套件
+验证位置提示命中时使用调用方置信度与位置提示置信度中较高的阈值
+"""
+import numpy as np
+import pytest
+
+from utils.image_recognition import ImageRecognition
+
+TEMPLATE_PATH = 'Game_Img/icon.png'
+
+
+class TestLocationHint:
+    """位置提示命中阈值测试类"""
+
+    @pytest.fixture
+    def recognizer(self, monkeypatch):
+        """上次匹配位置附近得分为 0.85 的识别器fixture"""
+        recognizer = ImageRecognition(task_id='test_location_hint')
+        recognizer.config = dict(recognizer.config, location_hints_enabled=True, location_hint_confidence=0.8)
+        page = object()
+        recognizer.page = page
+        recognizer.location_hints[(id(page), TEMPLATE_PATH)] = {'position': (100, 100), 'scale': 1.0}
+
+        variant = {'template': np.zeros((10, 10, 3), dtype=np.uint8), 'scale': 1.0}
+        frame = np.zeros((200, 200, 3), dtype=np.uint8)
+
+        async def get_frame(page, exact=False, fresh=False):
+            return frame
+
+        monkeypatch.setattr(recognizer, '_load_template_variants', lambda template_path: [variant])
+        monkeypatch.setattr(recognizer.matcher, 'hint_region',
+                            lambda variants, hint, frame_size: (variant, (80, 80, 120, 120)))
+        monkeypatch.setattr(recognizer.matcher, 'find_template_at_scale',
+                            lambda roi, template, scale, origin: {'score': 0.85, 'position': (100, 100), 'scale': scale})
+        monkeypatch.setattr(recognizer.frames, 'has_frame', lambda page: True)
+        monkeypatch.setattr(recognizer.frames, 'get_frame', get_frame)
+        return recognizer
+
+    @pytest.mark.parametrize('confidence', [0.5, 0.8, 0.85])
+    async def test_hint_hit_at_or_above_both_thresholds(self, recognizer, confidence):
+        """测试得分不低于调用方置信度和位置提示置信度时命中"""
+        position = await recognizer._find_by_hint(recognizer.page, TEMPLATE_PATH, confidence)
+
+        assert position == (100, 100)
+        assert recognizer.hint_stats == {'hits': 1, 'misses': 0}
+
+    async def test_hint_rejected_below_caller_confidence(self, recognizer):
+        """测试调用方置信度高于位置提示置信度时，得分未达到调用方置信度不命中"""
+        position = await recognizer._find_by_hint(recognizer.page, TEMPLATE_PATH, 0.9)
+
+        assert position is None
+        assert recognizer.hint_stats == {'hits': 0, 'misses': 1}
@@ -0,0 +1,134 @@
+"""
+测试步骤解释执行器测试套件
+验证自定义断言代码在解释执行模式和生成文件模式下可用的名称和行为一致
+"""
+import ast
+import os
+import textwrap
+
+import pytest
+
+from utils.step_interpreter import StepInterpreter
+from utils.test_code_generator import TestCodeGenerator
+
+# 使用生成文件头部导入的模块、Base_ENV.config 导出的名称以及测试函数中的局部变量
+CUSTOM_CODE = """
+ui_operations.seen.append({
+    'task_id': task_id,
+    'page': page,
+    'base_dir': BASE_DIR,
+    'shape': numpy.zeros((2, 3)).shape,
+    'sep': os.sep,
+    'platform': sys.platform,
+    'has_time': callable(time.time),
+    'names': [name for name in ('pyautogui', 'allure', 'pytest', 'asyncio', 'log_info', 'UIOperations')
+              if name in globals()],
+})
+assert task_id == 'test_P_1'
+"""
+
+
+class FakeUIOperations:
+    """只提供自定义断言所需属性的 UIOperations 替身"""
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self.page = object()
+        self.seen = []
+
+
+def build_step():
+    """构造只包含一条自定义断言的网页步骤"""
+    return {
+        'step_name': '自定义断言步骤',
+        'operation_type': 'web',
+        'operation_event': 'click',
+        'operation_params': '#submit',
+        'assertion_enabled': 'yes',
+        'assertion_config': {'custom_assertions': [{'name': '检查运行环境', 'code': CUSTOM_CODE}]},
+    }
+
+
+def header_bound_names(source):
+    """收集生成文件在模块级绑定的名称，星号导入展开为对应模块导出的名称"""
+    names = set()
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            break
+        if isinstance(node, ast.Import):
+            names.update((alias.asname or alias.name).split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == '*':
+                    module = __import__(node.module, fromlist=['*'])
+                    names.update(getattr(module, '__all__', None)
+                                 or [name for name in vars(module) if not name.startswith('_')])
+                else:
+                    names.add(alias.asname or alias.name)
+        elif isinstance(node, ast.Assign):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+    return names
+
+
+async def run_in_file_mode(source, assertion, ui_operations):
+    """在生成文件的模块全局变量中执行自定义断言代码，局部变量与生成的测试函数一致"""
+    module_globals = {'__name__': 'generated_test',
+                      '__file__': os.path.join(os.getcwd(), 'Test_Case', 'generated_test.py')}
+    exec(compile(source, 'generated_test.py', 'exec'), module_globals)
+    wrapper = "async def _file_assertion(ui_operations, page, task_id):\n" + textwrap.indent(
+        '\n'.join(assertion['lines']), '    ')
+    exec(compile(wrapper, 'generated_test.py', 'exec'), module_globals)
+    await module_globals['_file_assertion'](ui_operations, ui_operations.page, ui_operations.task_id)
+
+
+class TestCustomAssertionNamespace:
+    """自定义断言运行环境测试类"""
+
+    @pytest.fixture
+    def assertion(self):
+        """生成器构造的自定义断言fixture"""
+        return TestCodeGenerator().build_steps([build_step()])[0]['assertions'][0]
+
+    @pytest.fixture
+    def source(self):
+        """包含该自定义断言的生成文件源码fixture"""
+        return TestCodeGenerator().render({'test_steps': [build_step()]}, [('P-1', 'http://a.example.com')])
+
+    def test_interpreter_binds_header_names(self, source):
+        """测试解释执行模式提供生成文件头部绑定的全部名称"""
+        expected = header_bound_names(source) - {'project_root', 'async_playwright'}
+        assert expected <= set(StepInterpreter.custom_assertion_globals()) | {'UIOperations'}
+
+    async def test_interpreter_mode(self, assertion):
+        """测试解释执行模式下自定义断言可使用 numpy、Base_ENV.config 导出的名称和 task_id"""
+        from Base_ENV.config import BASE_DIR
+
+        ui_operations = FakeUIOperations('test_P_1')
+        await StepInterpreter().run_assertion(ui_operations, assertion)
+
+        seen = ui_operations.seen[0]
+        assert seen['task_id'] == 'test_P_1'
+        assert seen['page'] is ui_operations.page
+        assert seen['base_dir'] == BASE_DIR
+        assert seen['shape'] == (2, 3)
+        assert seen['has_time'] is True
+        assert seen['names'] == ['pyautogui', 'allure', 'pytest', 'asyncio', 'log_info', 'UIOperations']
+
+    async def test_interpreter_assertion_failure_raises(self, assertion):
+        """测试自定义断言失败时抛出断言错误"""
+        with pytest.raises(AssertionError):
+            await StepInterpreter().run_assertion(FakeUIOperations('test_P_2'), assertion)
+
+    async def test_same_result_in_both_modes(self, source, assertion):
+        """测试同一段自定义断言代码在两种模式下得到相同的结果"""
+        for module in ('playwright', 'allure', 'pyautogui'):
+            pytest.importorskip(module)
+
+        file_ops, interpreter_ops = FakeUIOperations('test_P_1'), FakeUIOperations('test_P_1')
+        await run_in_file_mode(source, assertion, file_ops)
+        await StepInterpreter().run_assertion(interpreter_ops, assertion)
+
+        file_seen, interpreter_seen = file_ops.seen[0], interpreter_ops.seen[0]
+        assert file_seen.pop('page') is file_ops.page
+        assert interpreter_seen.pop('page') is interpreter_ops.page
+        assert file_seen == interpreter_seen
@@ -0,0 +1,133 @@
+"""
+模板图片缓存测试套件
+验证LRU淘汰、文件修改后的失效重载以及变体的内存计算
+"""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from utils.template_cache import TemplateCache
+
+# 20×20 的BGR模板占用 1200 字节，灰度变体占用 400 字节
+IMAGE_BYTES = 20 * 20 * 3
+GRAY_BYTES = 20 * 20
+
+
+def write_image(path, value):
+    """写入纯色模板图片"""
+    cv2.imwrite(str(path), np.full((20, 20, 3), value, dtype=np.uint8))
+    return str(path)
+
+
+def bump_mtime(path):
+    """推进文件修改时间，避免文件系统时间精度导致重写后的时间相同"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestTemplateCache:
+    """模板图片缓存测试类"""
+
+    @pytest.fixture
+    def templates(self, tmp_path):
+        """三个内容不同的模板图片路径"""
+        return [write_image(tmp_path / f"{name}.png", value)
+                for name, value in (('a', 10), ('b', 120), ('c', 240))]
+
+    def test_lru_evicts_least_recently_used(self, templates):
+        """测试超过内存上限时淘汰最近最少使用的模板"""
+        a, b, c = templates
+        cache = TemplateCache(max_bytes=IMAGE_BYTES * 2, enabled=True)
+
+        cache.get(a)
+        cache.get(b)
+        # 访问a后b成为最近最少使用的模板
+        assert cache.get(a) is cache.get(a)
+        cache.get(c)
+
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 2
+        assert stats['bytes'] == IMAGE_BYTES * 2
+
+        hits = stats['hits']
+        cache.get(a)
+        cache.get(c)
+        assert cache.get_stats()['hits'] == hits + 2
+        misses = cache.get_stats()['misses']
+        cache.get(b)
+        assert cache.get_stats()['misses'] == misses + 1
+
+    def test_variants_count_towards_limit(self, templates):
+        """测试变体计入缓存内存，超过上限时同样触发淘汰"""
+        a, b, _ = templates
+        cache = TemplateCache(max_bytes=IMAGE_BYTES * 2 + GRAY_BYTES, enabled=True)
+
+        cache.get(a)
+        gray = cache.get_variant(a, 'gray')
+        assert gray.shape == (20, 20)
+        assert cache.get_variant(a, 'gray') is gray
+        assert cache.get_stats()['bytes'] == IMAGE_BYTES + GRAY_BYTES
+
+        cache.get(b)
+        cache.get_variant(b, 'gray')
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 1
+        assert stats['bytes'] == IMAGE_BYTES + GRAY_BYTES
+
+    def test_oversized_entry_is_kept(self, templates):
+        """测试单个模板超过上限时仍保留刚加载的模板"""
+        a, b, _ = templates
+        cache = TemplateCache(max_bytes=IMAGE_BYTES // 2, enabled=True)
+
+        cache.get(a)
+        entry = cache.get(b)
+
+        assert cache.get(b) is entry
+        assert cache.get_stats()['entries'] == 1
+
+    def test_modified_file_is_reloaded(self, templates):
+        """测试文件修改时间或大小变化后丢弃旧模板和变体并重新加载"""
+        a, _, _ = templates
+        cache = TemplateCache(max_bytes=IMAGE_BYTES * 4, enabled=True)
+
+        old_entry = cache.get(a)
+        old_gray = cache.get_variant(a, 'gray')
+        assert int(old_entry.image[0, 0, 0]) == 10
+
+        write_image(a, 200)
+        bump_mtime(a)
+        new_entry = cache.get(a)
+
+        assert new_entry is not old_entry
+        assert int(new_entry.image[0, 0, 0]) == 200
+        assert cache.get_variant(a, 'gray') is not old_gray
+        stats = cache.get_stats()
+        assert stats['invalidations'] == 1
+        assert stats['entries'] == 1
+        assert stats['bytes'] == IMAGE_BYTES + GRAY_BYTES
+
+    def test_deleted_file_is_discarded(self, templates):
+        """测试文件被删除后返回None并移除缓存"""
+        a, _, _ = templates
+        cache = TemplateCache(max_bytes=IMAGE_BYTES * 4, enabled=True)
+
+        cache.get(a)
+        os.remove(a)
+
+        assert cache.get(a) is None
+        stats = cache.get_stats()
+        assert stats['invalidations'] == 1
+        assert stats['entries'] == 0
+        assert stats['bytes'] == 0
+
+    def test_disabled_cache_does_not_store(self, templates):
+        """测试关闭缓存时每次都从磁盘加载"""
+        a, _, _ = templates
+        cache = TemplateCache(max_bytes=IMAGE_BYTES * 4, enabled=False)
+
+        assert cache.get(a) is not cache.get(a)
+        assert cache.get_stats()['entries'] == 0
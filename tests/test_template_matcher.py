@@ -0,0 +1,98 @@
+"""
+模板匹配器测试套件
+在合成的页面截图上验证金字塔搜索与逐尺度全图匹配找到相同的位置
+"""
+import cv2
+import numpy as np
+import pytest
+
+from config.ui_config import UIConfig
+from utils.template_matcher import TemplateMatcher
+
+SCENE_SIZE = (720, 1280)
+
+
+def create_template(rng, width=160, height=100):
+    """生成带色块、圆形和线条的按钮状模板"""
+    template = np.full((height, width, 3), rng.integers(60, 200, 3), dtype=np.uint8)
+    for _ in range(6):
+        x0, y0 = int(rng.integers(0, width - 20)), int(rng.integers(0, height - 20))
+        x1, y1 = x0 + int(rng.integers(10, 40)), y0 + int(rng.integers(10, 30))
+        cv2.rectangle(template, (x0, y0), (x1, y1), rng.integers(0, 255, 3).tolist(), -1)
+    cv2.circle(template, (width // 3, height // 2), height // 4, (250, 250, 250), -1)
+    cv2.line(template, (0, height - 1), (width - 1, 0), (20, 20, 20), 3)
+    return template
+
+
+def create_scene(rng, template, page_scale, position):
+    """
+    合成页面截图：渐变背景加噪声，贴入干扰模板和按比例缩放的目标模板
+
+    Returns:
+        (截图, 目标模板中心坐标)
+    """
+    h, w = SCENE_SIZE
+    gradient = np.linspace(40, 200, w, dtype=np.float32)[None, :, None]
+    scene = np.repeat(np.repeat(gradient, h, axis=0), 3, axis=2)
+    scene += rng.normal(0, 10, scene.shape).astype(np.float32)
+    scene = np.clip(scene, 0, 255).astype(np.uint8)
+
+    for _ in range(4):
+        distractor = create_template(rng)
+        x, y = int(rng.integers(0, w - 160)), int(rng.integers(0, h // 2 - 100))
+        scene[y:y + 100, x:x + 160] = distractor
+
+    th, tw = int(template.shape[0] * page_scale), int(template.shape[1] * page_scale)
+    resized = cv2.resize(template, (tw, th), interpolation=cv2.INTER_AREA)
+    x, y = position
+    scene[y:y + th, x:x + tw] = resized
+    return scene, (x + tw // 2, y + th // 2)
+
+
+class TestPyramidSearch:
+    """金字塔搜索与全图匹配一致性测试类"""
+
+    def create_matcher(self, pyramid_enabled):
+        """创建关闭或开启金字塔搜索的匹配器"""
+        config = dict(UIConfig.get_image_recognition_config())
+        config['pyramid_enabled'] = pyramid_enabled
+        return TemplateMatcher(config, config['scale_factors'], task_id='test_matcher')
+
+    @pytest.mark.parametrize('page_scale, position', [
+        (1.0, (900, 500)),
+        (0.8, (137, 481)),
+        (0.6, (611, 603)),
+    ])
+    def test_pyramid_matches_full_search(self, page_scale, position):
+        """测试金字塔搜索与全图匹配在同一尺度找到同一位置，且得分一致"""
+        rng = np.random.default_rng(42)
+        template = create_template(rng)
+        scene, expected = create_scene(rng, template, page_scale, position)
+
+        full, pyramid = self.create_matcher(False), self.create_matcher(True)
+        full_match = full.find_best_match(scene, full.build_variants(template))
+        pyramid_match = pyramid.find_best_match(scene, pyramid.build_variants(template))
+
+        assert full_match is not None and pyramid_match is not None
+        assert pyramid_match['scale'] == full_match['scale']
+        assert pyramid_match['position'] == full_match['position']
+        assert pyramid_match['score'] == pytest.approx(full_match['score'], abs=1e-3)
+        tolerance = max(4, int(min(template.shape[:2]) * page_scale) // 10)
+        assert abs(full_match['position'][0] - expected[0]) <= tolerance
+        assert abs(full_match['position'][1] - expected[1]) <= tolerance
+
+    def test_small_template_falls_back_to_full_scale(self):
+        """测试缩小后过小的模板尺度不生成粗匹配模板，仍能按原尺寸找到"""
+        rng = np.random.default_rng(7)
+        template = create_template(rng, width=40, height=28)
+        scene, expected = create_scene(rng, template, 1.0, (320, 450))
+
+        pyramid = self.create_matcher(True)
+        variants = pyramid.build_variants(template)
+        assert all(variant['coarse'] is None for variant in variants)
+
+        match = pyramid.find_best_match(scene, variants)
+        full = self.create_matcher(False)
+        assert match == full.find_best_match(scene, full.build_variants(template))
+        assert abs(match['position'][0] - expected[0]) <= 4
+        assert abs(match['position'][1] - expected[1]) <= 4
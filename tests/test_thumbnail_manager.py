@@ -0,0 +1,50 @@
+"""
+缩略图管理器测试套件
+验证缓存命中、以及缓存文件在检查后被淘汰时重新生成
+"""
+import os
+
+import pytest
+from PIL import Image
+
+from utils.thumbnail_manager import ThumbnailManager
+
+
+class TestThumbnailCache:
+    """缩略图缓存测试类"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """源图片目录和缓存目录均在临时目录中的管理器fixture"""
+        source_dir = tmp_path / 'Game_Img'
+        source_dir.mkdir()
+        Image.new('RGB', (640, 480), (200, 30, 30)).save(source_dir / 'icon.png')
+        manager = ThumbnailManager(cache_dir=str(tmp_path / '.thumbs'))
+        manager.SOURCE_DIRS = {'game': source_dir}
+        return manager
+
+    def test_cache_hit_returns_same_file(self, manager):
+        """测试第二次请求直接返回已生成的缩略图"""
+        path, mimetype = manager.get_thumbnail('game', 'icon.png', 100)
+        assert mimetype == 'image/webp'
+        with Image.open(path) as img:
+            assert img.size == (100, 75)
+
+        assert manager.get_thumbnail('game', 'icon.png', 100) == (path, mimetype)
+
+    def test_evicted_between_check_and_touch_is_rendered(self, monkeypatch, manager):
+        """测试缓存文件在存在检查后被淘汰时重新生成，而不是返回 (None, None)"""
+        path, _ = manager.get_thumbnail('game', 'icon.png', 100)
+        real_utime = os.utime
+
+        def utime_after_eviction(target, *args, **kwargs):
+            # 模拟其他线程在 exists() 与 utime() 之间淘汰了该缓存文件
+            if os.path.exists(target):
+                os.remove(target)
+            return real_utime(target, *args, **kwargs)
+
+        monkeypatch.setattr(os, 'utime', utime_after_eviction)
+        result_path, mimetype = manager.get_thumbnail('game', 'icon.png', 100)
+
+        assert (result_path, mimetype) == (path, 'image/webp')
+        assert os.path.isfile(result_path)
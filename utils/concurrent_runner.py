@@ -0,0 +1,160 @@
+"""
+多地址并发执行器
+生成的测试文件和解释执行模式共用：每个产品地址一个任务，支持失败即停（fail-fast），
+执行结果写入执行进程的结果文件，由服务端在进程结束后读取
+"""
+import asyncio
+import json
+import os
+from typing import Any, Coroutine, Dict, Iterable, List, Optional
+from config.logger import log_info
+
+
+class ConcurrentRunner:
+    """多地址并发执行器"""
+
+    # 结果文件路径，由 run_pytest_file 通过环境变量传给pytest子进程
+    RESULT_FILE_ENV = 'TEST_RESULT_FILE'
+    # 失败即停开关，'1' 表示任一地址失败时取消其余地址，未设置时等待所有地址执行完毕
+    FAIL_FAST_ENV = 'TEST_FAIL_FAST'
+    # 只执行指定的测试函数（逗号分隔），用于重跑失败的产品地址
+    ONLY_FUNCTIONS_ENV = 'TEST_ONLY_FUNCTIONS'
+
+    def __init__(self, default_fail_fast: bool = False):
+        """初始化执行器"""
+        self.default_fail_fast = default_fail_fast
+
+    @staticmethod
+    def parse_flag(value: Any) -> Optional[bool]:
+        """解析请求参数或环境变量中的开关，None 和空字符串表示未指定，返回None"""
+        if value is None or isinstance(value, bool):
+            return value
+        value = str(value).strip().lower()
+        if not value:
+            return None
+        return value not in ('0', 'false', 'no', 'off')
+
+    def resolve_fail_fast(self, fail_fast: Any = None) -> bool:
+        """未显式指定时读取环境变量，环境变量未设置时使用默认策略"""
+        for value in (fail_fast, os.environ.get(self.FAIL_FAST_ENV)):
+            flag = self.parse_flag(value)
+            if flag is not None:
+                return flag
+        return self.default_fail_fast
+
+    def resolve_only_functions(self, only: Optional[Iterable[str]] = None) -> Optional[List[str]]:
+        """未显式指定时读取环境变量，返回None表示执行全部测试函数"""
+        if only is not None:
+            return list(only)
+        value = os.environ.get(self.ONLY_FUNCTIONS_ENV, '').strip()
+        if not value:
+            return None
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def select_functions(self, names: Iterable[str], only: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        按 only（未指定时按环境变量）筛选要执行的测试函数名
+
+        Raises:
+            ValueError: 指定了要执行的函数但一个都不存在，避免按 0/0 视为通过
+        """
+        names = list(names)
+        only = self.resolve_only_functions(only)
+        if only is None:
+            return names
+        selected = [name for name in names if name in only]
+        if not selected:
+            raise ValueError(f"指定的测试函数均不存在: {', '.join(only) or '（空）'}")
+        return selected
+
+    async def run(self, coroutines: Dict[str, Coroutine], fail_fast: Optional[bool] = None,
+                  only: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        并发执行测试函数
+
+        Args:
+            coroutines: {测试函数名: 协程}，按地址顺序排列
+            fail_fast: 任一任务失败时是否立即取消其余任务，None 表示按环境变量决定
+            only: 只执行其中的测试函数，None 表示按环境变量决定
+
+        Returns:
+            [{function, success, cancelled, error}, ...]，cancelled 表示因其他任务失败被取消
+
+        Raises:
+            ValueError: 指定了 only 但没有匹配的测试函数
+        """
+        fail_fast = self.resolve_fail_fast(fail_fast)
+        try:
+            selected = self.select_functions(coroutines, only)
+        except ValueError:
+            for coroutine in coroutines.values():
+                coroutine.close()
+            raise
+        skipped = [name for name in coroutines if name not in selected]
+        for name in skipped:
+            # 未执行的协程需要关闭，避免 "never awaited" 警告
+            coroutines[name].close()
+        coroutines = {name: coroutine for name, coroutine in coroutines.items() if name in selected}
+        if skipped:
+            log_info(f"只执行指定的测试函数: {', '.join(coroutines)}，跳过 {len(skipped)} 个")
+        tasks = {name: asyncio.create_task(coroutine) for name, coroutine in coroutines.items()}
+        log_info(f"创建了 {len(tasks)} 个独立浏览器实例的测试任务，失败即停: {'是' if fail_fast else '否'}")
+
+        pending = set(tasks.values())
+        while pending:
+            return_when = asyncio.FIRST_EXCEPTION if fail_fast else asyncio.ALL_COMPLETED
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            if fail_fast and pending and any(not t.cancelled() and t.exception() for t in done):
+                log_info(f"有测试任务失败，立即取消其余 {len(pending)} 个任务")
+                for task in pending:
+                    task.cancel()
+                # 等待被取消的任务执行完 finally 中的浏览器清理
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+
+        outcomes = []
+        for i, (name, task) in enumerate(tasks.items(), 1):
+            if task.cancelled():
+                outcome = {'function': name, 'success': False, 'cancelled': True,
+                           'error': '其他地址失败，任务已被取消'}
+                log_info(f"测试 {i} ({name}) 已取消")
+            elif task.exception() is not None:
+                error = task.exception()
+                outcome = {'function': name, 'success': False, 'cancelled': False, 'error': str(error)}
+                if "EPIPE" in str(error):
+                    log_info(f"测试 {i} ({name}) 因管道通信中断而失败，这可能是由于浏览器被手动关闭")
+                else:
+                    log_info(f"测试 {i} ({name}) 失败: {error}")
+            else:
+                outcome = {'function': name, 'success': True, 'cancelled': False, 'error': None}
+                log_info(f"测试 {i} ({name}) 成功完成")
+            outcomes.append(outcome)
+
+        success_count = sum(1 for outcome in outcomes if outcome['success'])
+        log_info(f"并发执行结果: {success_count}/{len(outcomes)} 个测试成功")
+        return outcomes
+
+    def report_results(self, outcomes: List[Dict[str, Any]]) -> Optional[str]:
+        """将执行结果写入结果文件（未通过环境变量指定路径时跳过），返回文件路径"""
+        result_file = os.environ.get(self.RESULT_FILE_ENV)
+        if not result_file:
+            return None
+        tmp_path = f"{result_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'results': outcomes}, f, ensure_ascii=False)
+        os.replace(tmp_path, result_file)
+        return result_file
+
+    @staticmethod
+    def read_results(result_file: str) -> Optional[List[Dict[str, Any]]]:
+        """读取执行进程写入的结果，文件不存在或格式错误时返回None"""
+        try:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('results')
+        except (OSError, ValueError) as e:
+            log_info(f"读取执行结果文件失败: {result_file}, {e}")
+            return None
+
+
+# 创建全局实例
+concurrent_runner = ConcurrentRunner()
@@ -12,6 +12,7 @@ from datetime import datetime
 from config.database import get_db_connection, get_db_connection_with_retry
 from utils.db_adapter import adapt_query_placeholders, execute_query, execute_query_with_results
 from config.logger import log_info
+from utils.test_file_index import test_file_index
 
 
 class ProjectFileManager:
@@ -107,25 +108,10 @@ class ProjectFileManager:
             base_file_name: 基础文件名（如：SC_Web_test.py）
             
         Returns:
-            唯一的文件名
+            唯一的文件名（同时避开目录中的文件和已有的文件映射）
         """
-        # 如果基础文件名不存在，直接返回
-        file_path = os.path.join(self.test_case_dir, base_file_name)
-        if not os.path.exists(file_path):
-            return base_file_name
-        
-        # 如果文件存在，查找下一个可用的序号
-        name_without_ext = base_file_name.replace('.py', '')
-        counter = 2
-        
-        while True:
-            new_file_name = f"{name_without_ext}_{counter}.py"
-            new_file_path = os.path.join(self.test_case_dir, new_file_name)
-            
-            if not os.path.exists(new_file_path):
-                return new_file_name
-            
-            counter += 1
+        name_without_ext = base_file_name[:-len('.py')] if base_file_name.endswith('.py') else base_file_name
+        return test_file_index.allocate(base_file_name, 'suffix', name_without_ext)
     
     def get_project_file_mapping(self, project_id: int) -> Optional[Dict[str, any]]:
         """
@@ -140,7 +126,7 @@ class ProjectFileManager:
         try:
             with get_db_connection_with_retry() as conn:
                 query = adapt_query_placeholders('''
-                    SELECT id, project_id, project_name, file_name, file_path, file_type, is_active, created_at, updated_at
+                    SELECT id, project_id, project_name, file_name, file_path, file_type, is_active, created_at, updated_at, content_hash
                     FROM project_files 
                     WHERE project_id = ? AND is_active = 1
                     ORDER BY created_at DESC
@@ -152,7 +138,7 @@ class ProjectFileManager:
                 
                 if result:
                     # 正确地将元组转换为字典
-                    columns = ['id', 'project_id', 'project_name', 'file_name', 'file_path', 'file_type', 'is_active', 'created_at', 'updated_at']
+                    columns = ['id', 'project_id', 'project_name', 'file_name', 'file_path', 'file_type', 'is_active', 'created_at', 'updated_at', 'content_hash']
                     return dict(zip(columns, result))
                 return None
                 
@@ -173,7 +159,7 @@ class ProjectFileManager:
         try:
             with get_db_connection_with_retry() as conn:
                 query = adapt_query_placeholders('''
-                    SELECT id, project_id, project_name, file_name, file_path, file_type, is_active, created_at, updated_at
+                    SELECT id, project_id, project_name, file_name, file_path, file_type, is_active, created_at, updated_at, content_hash
                     FROM project_files 
                     WHERE project_name = ? AND is_active = 1
                     ORDER BY created_at DESC
@@ -185,7 +171,7 @@ class ProjectFileManager:
                 
                 if result:
                     # 正确地将元组转换为字典
-                    columns = ['id', 'project_id', 'project_name', 'file_name', 'file_path', 'file_type', 'is_active', 'created_at', 'updated_at']
+                    columns = ['id', 'project_id', 'project_name', 'file_name', 'file_path', 'file_type', 'is_active', 'created_at', 'updated_at', 'content_hash']
                     return dict(zip(columns, result))
                 return None
                 
@@ -233,6 +219,8 @@ class ProjectFileManager:
                     
                     query = adapt_query_placeholders(query)
                     execute_query(conn, query, update_values)
+                    if file_name:
+                        test_file_index.invalidate()
                     return True
                 
                 return False
@@ -327,6 +315,31 @@ class ProjectFileManager:
             log_info(f"保存文件内容失败: {str(e)}")
             return False, None
     
+    def update_content_hash(self, project_id: int, content_hash: Optional[str]) -> bool:
+        """
+        更新项目文件对应的生成输入哈希
+        
+        Args:
+            project_id: 项目ID
+            content_hash: 影响生成代码的输入哈希，None表示清除
+            
+        Returns:
+            更新是否成功
+        """
+        try:
+            with get_db_connection_with_retry() as conn:
+                query = adapt_query_placeholders('''
+                    UPDATE project_files 
+                    SET content_hash = ?, updated_at = ?
+                    WHERE project_id = ? AND is_active = 1
+                ''')
+                execute_query(conn, query, (content_hash, datetime.now().isoformat(), project_id))
+            return True
+            
+        except Exception as e:
+            log_info(f"更新项目文件哈希失败: {str(e)}")
+            return False
+    
     def delete_project_file_mapping(self, project_id: int) -> bool:
         """
         删除项目文件映射（软删除）
@@ -346,6 +359,7 @@ class ProjectFileManager:
                 ''')
                 execute_query(conn, query, (datetime.now().isoformat(), project_id))
             
+            test_file_index.invalidate()
             return True
             
         except Exception as e:
@@ -464,7 +478,9 @@ class ProjectFileManager:
                 update_sql = adapt_query_placeholders(update_sql)
                 execute_query(conn, update_sql, update_values)
                 
-                return True
+            if file_name is not None:
+                test_file_index.invalidate()
+            return True
                 
         except Exception as e:
             log_info(f"更新项目文件映射失败: {str(e)}")
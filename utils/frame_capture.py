@@ -0,0 +1,158 @@
+"""
+页面帧捕获服务
+同一测试步骤内的图片查找和图片断言共用一张页面截图，
+导航、输入、滚动或等待后失效，下次使用时重新截图
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+import cv2
+import numpy as np
+from config.ui_config import UIConfig
+from config.logger import log_info
+from utils.image_match_executor import image_match_executor
+
+
+class FrameCapture:
+    """页面帧捕获服务 - 每个任务一个实例，缓存当前页面的最新一帧"""
+
+    def __init__(self, task_id: str = None, config: Dict[str, Any] = None):
+        """初始化帧缓存"""
+        self.task_id = task_id or f"frame_{id(self)}"
+        self.config = config or UIConfig.get_image_recognition_config()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_page_id = None
+        self._frame_exact = False
+        self._frame_time = 0.0
+        # 已注册导航监听的页面
+        self._watched_pages = set()
+        # 最近一次整页截图的 (宽, 高)
+        self.frame_size: Optional[Tuple[int, int]] = None
+        self.stats = {'captures': 0, 'reuses': 0, 'invalidations': 0}
+        # 各阶段耗时统计：阶段 -> {count, total, max}（秒）
+        self.latency_stats = {}
+
+    async def get_frame(self, page, exact: bool = False, fresh: bool = False) -> np.ndarray:
+        """
+        获取页面当前帧（BGR图像）
+
+        Args:
+            page: Playwright页面对象
+            exact: 是否要求像素精确（PNG），图片比对断言需要，模板识别不需要
+            fresh: 是否忽略缓存强制重新截图（轮询等待时使用）
+        """
+        if not fresh and self._is_reusable(page, exact):
+            self.stats['reuses'] += 1
+            log_info(f"[{self.task_id}] 复用当前帧截图")
+            return self._frame
+
+        self._watch(page)
+        frame = await self.capture(page, exact=exact)
+        self._frame = frame
+        self._frame_page_id = id(page)
+        self._frame_exact = exact or self.config['screenshot_format'] == 'png'
+        self._frame_time = time.monotonic()
+        self.frame_size = (frame.shape[1], frame.shape[0])
+        return frame
+
+    async def get_region(self, page, area: Dict[str, int], exact: bool = False) -> np.ndarray:
+        """获取页面当前帧中的区域 {x, y, width, height}"""
+        frame = await self.get_frame(page, exact=exact)
+        x, y = max(0, int(area['x'])), max(0, int(area['y']))
+        region = frame[y:y + int(area['height']), x:x + int(area['width'])]
+        if region.size == 0:
+            raise ValueError(f"截图区域超出页面范围: {area}")
+        return region
+
+    def has_frame(self, page) -> bool:
+        """是否有该页面可复用的帧"""
+        return self._is_reusable(page, exact=False)
+
+    def invalidate(self, reason: str = ''):
+        """使当前帧失效（导航、输入、滚动或等待后调用）"""
+        if self._frame is not None:
+            self._frame = None
+            self.stats['invalidations'] += 1
+            if reason:
+                log_info(f"[{self.task_id}] 当前帧已失效: {reason}")
+
+    async def capture(self, page, clip: Tuple[int, int, int, int] = None, exact: bool = False) -> np.ndarray:
+        """
+        截图并解码为OpenCV图像，不要求像素精确时使用编码更快的JPEG
+
+        Args:
+            page: Playwright页面对象
+            clip: 只截取的区域 (x, y, 宽, 高)，None 表示整页
+            exact: 是否要求像素精确（PNG）
+        """
+        options = {'type': 'png' if exact else self.config['screenshot_format']}
+        if options['type'] == 'jpeg':
+            options['quality'] = self.config['screenshot_jpeg_quality']
+        if clip:
+            options['clip'] = {'x': clip[0], 'y': clip[1], 'width': clip[2], 'height': clip[3]}
+
+        started = time.perf_counter()
+        screenshot_bytes = await page.screenshot(**options)
+        captured = time.perf_counter()
+        screenshot_cv = await image_match_executor.run(self.decode, screenshot_bytes)
+        decoded = time.perf_counter()
+
+        self.stats['captures'] += 1
+        self.record_latency('capture', captured - started)
+        self.record_latency('decode', decoded - captured)
+        log_info(f"[{self.task_id}] 截图完成: {'区域' if clip else '整页'} {screenshot_cv.shape[1]}x{screenshot_cv.shape[0]}, "
+                 f"截图 {(captured - started) * 1000:.1f}ms, 解码 {(decoded - captured) * 1000:.1f}ms")
+        return screenshot_cv
+
+    @staticmethod
+    def decode(screenshot_bytes: bytes) -> np.ndarray:
+        """将截图字节直接解码为OpenCV的BGR图像"""
+        screenshot_cv = cv2.imdecode(np.frombuffer(screenshot_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if screenshot_cv is None:
+            raise ValueError("截图解码失败")
+        return screenshot_cv
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取截图次数与复用次数"""
+        return dict(self.stats)
+
+    def record_latency(self, stage: str, seconds: float):
+        """记录某阶段的耗时"""
+        item = self.latency_stats.setdefault(stage, {'count': 0, 'total': 0.0, 'max': 0.0})
+        item['count'] += 1
+        item['total'] += seconds
+        item['max'] = max(item['max'], seconds)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各阶段耗时统计（毫秒）"""
+        return {
+            stage: {
+                'count': item['count'],
+                'avg_ms': item['total'] / item['count'] * 1000,
+                'max_ms': item['max'] * 1000
+            }
+            for stage, item in self.latency_stats.items()
+        }
+
+    def reset_stats(self):
+        """重置统计信息"""
+        self.stats = {'captures': 0, 'reuses': 0, 'invalidations': 0}
+        self.latency_stats = {}
+
+    def _is_reusable(self, page, exact: bool) -> bool:
+        """缓存的帧是否属于该页面、未过期且满足精度要求"""
+        if self._frame is None or self._frame_page_id != id(page):
+            return False
+        if exact and not self._frame_exact:
+            return False
+        return time.monotonic() - self._frame_time < self.config['frame_max_age']
+
+    def _watch(self, page):
+        """首次使用页面时注册主框架导航监听，页面导航后当前帧自动失效"""
+        if id(page) in self._watched_pages or not hasattr(page, 'on'):
+            return
+        self._watched_pages.add(id(page))
+        try:
+            page.on('framenavigated',
+                    lambda frame: self.invalidate('页面导航') if frame == page.main_frame else None)
+        except Exception as e:
+            log_info(f"[{self.task_id}] 注册页面导航监听失败: {e}")
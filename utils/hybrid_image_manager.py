@@ -1,10 +1,11 @@
-import pyautogui
 import time
 import asyncio
 from typing import Optional, Tuple, Dict, Any
 from config.ui_config import UIConfig
 from config.logger import log_info
 from utils.image_recognition import ImageRecognition
+from utils.template_cache import template_cache
+from utils.match_method_selector import match_method_selector
 from Base_ENV.config import BASE_DIR
 import os
 
@@ -35,6 +36,7 @@ class HybridImageManager:
         """
         混合图片识别 - 优先使用截图识别，失败时回退到pyautogui
         使用任务隔离和锁机制确保并发安全，支持重试机制
+        截图识别的匹配方式（模板匹配或特征点匹配）由 match_method_selector 按模板实测结果选择
         
         Args:
             page: Playwright页面对象
@@ -65,7 +67,8 @@ class HybridImageManager:
                     if self.config['use_screenshot'] and self.config['screenshot_first']:
                         try:
                             position = await self.image_recognition.find_image(
-                                page, image_path, confidence, timeout
+                                page, image_path, confidence, timeout,
+                                method=match_method_selector.choose(image_path)
                             )
                             if position:
                                 self.stats['screenshot_success'] += 1
@@ -92,7 +95,8 @@ class HybridImageManager:
                         self.config['use_pyautogui_fallback']):
                         try:
                             position = await self.image_recognition.find_image(
-                                page, image_path, confidence, timeout
+                                page, image_path, confidence, timeout,
+                                method=match_method_selector.choose(image_path)
                             )
                             if position:
                                 self.stats['screenshot_success'] += 1
@@ -132,6 +136,7 @@ class HybridImageManager:
             try:
                 # 使用锁机制确保点击操作的原子性
                 async with self._lock:
+                    self.image_recognition.frames.invalidate('图片点击')
                     await page.mouse.click(position[0], position[1])
                     log_info(f"[{self.task_id}] 点击图片成功: {image_path} at {position}")
                     return True
@@ -154,7 +159,12 @@ class HybridImageManager:
             'screenshot_success': self.stats['screenshot_success'],
             'pyautogui_success': self.stats['pyautogui_success'],
             'total_attempts': total_attempts,
-            'success_rate': success_rate
+            'success_rate': success_rate,
+            'location_hints': self.image_recognition.get_hint_stats(),
+            'latency': self.image_recognition.get_latency_stats(),
+            'frames': self.image_recognition.frames.get_stats(),
+            'template_cache': template_cache.get_stats(),
+            'match_methods': match_method_selector.get_stats()
         }
     
     def reset_stats(self):
@@ -168,6 +178,7 @@ class HybridImageManager:
             'total_failures': 0,
             'task_id': self.task_id
         }
+        self.image_recognition.reset_stats()
         log_info(f"[{self.task_id}] 统计信息已重置")
     
     async def _find_with_screenshot(self, page, image_path: str, confidence: float, 
@@ -186,6 +197,7 @@ class HybridImageManager:
         try:
             # 使用任务特定的日志标识
             log_info(f"[{self.task_id}] 使用pyautogui查找图片: {image_path}")
+            import pyautogui
             position = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
             if position:
                 log_info(f"[{self.task_id}] pyautogui找到图片: {image_path} at {position}")
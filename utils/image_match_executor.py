@@ -0,0 +1,119 @@
+"""
+图片识别执行器
+截图解码、模板缩放和模板匹配都是同步的CPU计算，直接在协程中执行会阻塞同一事件循环中
+其他浏览器的Playwright调用；这里统一提交到线程池（OpenCV计算会释放GIL），
+开启进程池时多尺度搜索提交到进程池执行
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import cv2
+from config.ui_config import UIConfig
+from config.logger import log_info
+
+
+def _init_process_worker(opencv_threads: int):
+    """进程池工作进程初始化：限制OpenCV内部线程数，避免总线程数超过CPU上限"""
+    cv2.setNumThreads(opencv_threads)
+
+
+class ImageMatchExecutor:
+    """图片识别执行器 - 进程内共享的线程池与进程池"""
+
+    # 单次执行的并发上限，由执行进程的环境变量指定时优先于配置
+    MAX_WORKERS_ENV = 'IMAGE_MATCH_MAX_WORKERS'
+
+    def __init__(self):
+        """初始化执行器，线程池和进程池在首次使用时创建"""
+        config = UIConfig.get_image_recognition_config()
+        self.configured_workers = config.get('match_max_workers', 0)
+        self.use_processes = config.get('match_use_processes', False)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available_cpus() -> int:
+        """当前进程可用的CPU核数（受CPU亲和性限制）"""
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+
+    @property
+    def max_workers(self) -> int:
+        """并发数：环境变量 > 配置 > 可用CPU核数，且不超过可用CPU核数"""
+        cpus = self.available_cpus()
+        value = os.environ.get(self.MAX_WORKERS_ENV, '').strip()
+        try:
+            workers = int(value) if value else int(self.configured_workers or 0)
+        except ValueError:
+            workers = 0
+        if workers <= 0:
+            workers = cpus
+        return max(1, min(workers, cpus))
+
+    @property
+    def opencv_threads(self) -> int:
+        """每个工作线程/进程中OpenCV可用的内部线程数"""
+        return max(1, self.available_cpus() // self.max_workers)
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        """获取线程池，首次调用时创建"""
+        with self._lock:
+            if self._thread_pool is None:
+                workers = self.max_workers
+                cv2.setNumThreads(self.opencv_threads)
+                self._thread_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-match')
+                log_info(f"图片识别线程池已创建: 并发数 {workers}, OpenCV线程数 {self.opencv_threads}")
+            return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """获取进程池，首次调用时创建"""
+        with self._lock:
+            if self._process_pool is None:
+                workers = self.max_workers
+                self._process_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker,
+                                                         initargs=(self.opencv_threads,))
+                log_info(f"图片识别进程池已创建: 并发数 {workers}")
+            return self._process_pool
+
+    async def run(self, func: Callable, *args, cpu_bound: bool = False, **kwargs) -> Any:
+        """
+        在执行器中运行同步计算
+
+        Args:
+            func: 同步函数，提交到进程池时函数和参数必须可序列化
+            cpu_bound: 是否为重计算（多尺度搜索），开启进程池时提交到进程池，否则提交到线程池
+        """
+        pool = self._get_process_pool() if cpu_bound and self.use_processes else self._get_thread_pool()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self):
+        """关闭线程池和进程池"""
+        with self._lock:
+            if self._thread_pool is not None:
+                self._thread_pool.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+
+    def get_info(self) -> Dict[str, Any]:
+        """获取执行器配置信息"""
+        return {
+            'max_workers': self.max_workers,
+            'available_cpus': self.available_cpus(),
+            'opencv_threads': self.opencv_threads,
+            'use_processes': self.use_processes,
+            'thread_pool_started': self._thread_pool is not None,
+            'process_pool_started': self._process_pool is not None
+        }
+
+
+# 创建全局实例
+image_match_executor = ImageMatchExecutor()
@@ -1,34 +1,40 @@
 import cv2
 import numpy as np
-from PIL import Image
-import io
 import time
 import asyncio
 from typing import Optional, Tuple, Dict, Any, List
 from config.ui_config import UIConfig
 from config.logger import log_info
+from utils.template_matcher import TemplateMatcher
+from utils.image_match_executor import image_match_executor
+from utils.template_cache import template_cache
+from utils.frame_capture import FrameCapture
+from utils.match_method_selector import match_method_selector
 
 class ImageRecognition:
     """图片识别核心模块 - 基于Playwright截图的图片识别，支持任务隔离和多尺度匹配"""
     
     def __init__(self, task_id: str = None):
         self.task_id = task_id or f"img_rec_{id(self)}"
-        # 为每个实例创建独立的缓存
-        self.template_cache = {}
-        self.screenshot_cache = {}
-        self.last_screenshot_time = 0
         self.config = UIConfig.get_image_recognition_config()
+        # 页面帧按实例隔离（UIOperations 的图片断言共用同一帧），模板缓存在进程内共享
+        self.frames = FrameCapture(task_id=self.task_id, config=self.config)
         # 为每个实例创建独立的锁，避免并发冲突
         self._lock = asyncio.Lock()
         
         # 多尺度匹配配置
-        self.scale_factors = [1.0, 0.9, 0.8, 0.7, 0.6, 0.5]  # 支持缩放到50%
+        self.scale_factors = list(self.config['scale_factors'])
         self.confidence_levels = [0.7, 0.6, 0.5, 0.4, 0.3, 0.25, 0.2]  # 置信度级别
+        self.matcher = TemplateMatcher(self.config, self.scale_factors, task_id=self.task_id)
+        # 位置提示：(页面, 模板路径) -> 上次的匹配结果 {position, scale}
+        self.location_hints = {}
+        self.hint_stats = {'hits': 0, 'misses': 0}
         
         log_info(f"创建ImageRecognition实例: {self.task_id}")
     
     async def find_image(self, page, template_path: str, confidence: float = None, 
-                        timeout: int = None, use_cache: bool = True) -> Optional[Tuple[int, int]]:
+                        timeout: int = None, use_cache: bool = True,
+                        method: str = 'template') -> Optional[Tuple[int, int]]:
         """
         在页面中查找图片，支持多尺度匹配和动态置信度调整
         
@@ -38,6 +44,7 @@ class ImageRecognition:
             confidence: 匹配置信度，如果为None则使用配置中的默认值
             timeout: 超时时间，如果为None则使用配置中的默认值
             use_cache: 是否使用缓存
+            method: 全图搜索的匹配方式 template / feature / probe，见 MatchMethodSelector
             
         Returns:
             Optional[Tuple[int, int]]: 图片中心坐标 (x, y)，未找到返回None
@@ -56,6 +63,13 @@ class ImageRecognition:
                 try:
                     log_info(f"[{self.task_id}] 第{attempt + 1}次尝试查找图片: {template_path}")
                     
+                    # 第一次尝试先只截取并匹配上次匹配位置附近的区域
+                    if attempt == 0:
+                        position = await self._find_by_hint(page, template_path, confidence, use_cache)
+                        if position:
+                            log_info(f"[{self.task_id}] 图片查找成功: {template_path}, 位置: {position}")
+                            return position
+                    
                     # 获取页面截图
                     screenshot = await self._get_page_screenshot(page, use_cache)
                     if screenshot is None:
@@ -65,8 +79,9 @@ class ImageRecognition:
                             continue
                         return None
                     
-                    # 智能多尺度匹配
-                    position = self._smart_template_matching(screenshot, template_path, confidence, attempt)
+                    # 按匹配方式全图搜索，在执行器中计算以免阻塞其他浏览器的协程
+                    position = await self._match_by_method(screenshot, template_path, confidence,
+                                                           attempt, page, method)
                     if position:
                         log_info(f"[{self.task_id}] 图片查找成功: {template_path}, 位置: {position}")
                         return position
@@ -75,9 +90,8 @@ class ImageRecognition:
                     if attempt < max_attempts - 1:
                         log_info(f"[{self.task_id}] 第{attempt + 1}次尝试失败，等待{retry_delay}秒后重试")
                         await asyncio.sleep(retry_delay)
-                        # 清除截图缓存，强制获取新截图
-                        self.screenshot_cache.clear()
-                        self.last_screenshot_time = 0
+                        # 当前帧失效，强制获取新截图
+                        self.frames.invalidate('图片查找重试')
                     else:
                         log_info(f"[{self.task_id}] 所有{max_attempts}次尝试都失败，无法找到图片: {template_path}")
                         
@@ -93,81 +107,242 @@ class ImageRecognition:
             return None
     
     async def _get_page_screenshot(self, page, use_cache: bool = True) -> Optional[np.ndarray]:
-        """获取页面截图，使用任务隔离的缓存"""
+        """获取页面截图，use_cache 时复用当前帧"""
         try:
-            current_time = time.time()
-            
-            # 检查缓存
-            if use_cache and current_time - self.last_screenshot_time < self.config['screenshot_cache_timeout']:
-                if 'last_screenshot' in self.screenshot_cache:
-                    log_info(f"[{self.task_id}] 使用缓存的截图")
-                    return self.screenshot_cache['last_screenshot']
+            return await self.frames.get_frame(page, fresh=not use_cache)
+        except Exception as e:
+            log_info(f"[{self.task_id}] 获取页面截图失败: {e}")
+            return None
+    
+    async def _find_by_hint(self, page, template_path: str, confidence: float,
+                            use_cache: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        在该页面上次匹配到该模板的位置附近查找，开启区域截图时只截取该区域
+        得分需同时达到调用方的置信度和位置提示置信度才视为命中
+        
+        Returns:
+            Optional[Tuple[int, int]]: 匹配位置，没有位置提示或未命中时返回None
+        """
+        if not self.config.get('location_hints_enabled'):
+            return None
+        hint_key = (id(page), template_path)
+        hint = self.location_hints.get(hint_key)
+        if not hint:
+            return None
+        
+        try:
+            variants = await image_match_executor.run(self._load_template_variants, template_path)
+            region = self.matcher.hint_region(variants, hint, self.frames.frame_size) if variants else None
+            if region is None:
+                return None
+            variant, (x0, y0, x1, y1) = region
             
-            # 获取新截图
-            log_info(f"[{self.task_id}] 获取新的页面截图")
-            screenshot_bytes = await page.screenshot()
-            screenshot_array = np.array(Image.open(io.BytesIO(screenshot_bytes)))
-            screenshot_cv = cv2.cvtColor(screenshot_array, cv2.COLOR_RGB2BGR)
+            if use_cache and self.frames.has_frame(page):
+                # 当前帧仍有效时直接裁剪，不再截图
+                roi = (await self.frames.get_frame(page))[y0:y1, x0:x1]
+            elif self.config.get('screenshot_clip_enabled'):
+                roi = await self.frames.capture(page, clip=(x0, y0, x1 - x0, y1 - y0))
+            else:
+                screenshot = await self._get_page_screenshot(page, use_cache)
+                roi = screenshot[y0:y1, x0:x1] if screenshot is not None else None
+            if roi is None:
+                return None
             
-            # 更新缓存
-            if use_cache:
-                self.screenshot_cache['last_screenshot'] = screenshot_cv
-                self.last_screenshot_time = current_time
-                log_info(f"[{self.task_id}] 截图已缓存")
+            started = time.perf_counter()
+            match = await image_match_executor.run(self.matcher.find_template_at_scale, roi, variant['template'],
+                                                   variant['scale'], (x0, y0))
+            self.frames.record_latency('hint_match', time.perf_counter() - started)
+        except Exception as e:
+            log_info(f"[{self.task_id}] 位置提示查找时发生错误: {e}")
+            match = None
+        
+        if match and match['score'] >= max(confidence, self.config['location_hint_confidence']):
+            self.hint_stats['hits'] += 1
+            self.location_hints[hint_key] = {'position': match['position'], 'scale': match['scale']}
+            log_info(f"[{self.task_id}] 位置提示命中: {template_path}, 置信度: {match['score']:.3f}, "
+                     f"位置: {match['position']}")
+            return match['position']
+        
+        self.hint_stats['misses'] += 1
+        log_info(f"[{self.task_id}] 位置提示未命中，回退到全图搜索: {template_path}")
+        return None
+    
+    async def _match_by_method(self, screenshot: np.ndarray, template_path: str, base_confidence: float,
+                               attempt: int, page=None, method: str = 'template') -> Optional[Tuple[int, int]]:
+        """
+        按匹配方式全图搜索，并把耗时和结果记录到匹配方式选择器
+        feature: 特征点匹配未命中时回退到模板匹配；probe: 依次运行两种方式，以模板匹配的结果为准
+        """
+        if method == 'template':
+            return await self._smart_template_matching_async(screenshot, template_path, base_confidence,
+                                                             attempt, page)
+        
+        started = time.perf_counter()
+        match = await self._search_features(screenshot, template_path)
+        elapsed = time.perf_counter() - started
+        accepted = self._accept_feature_match(match, template_path)
+        
+        if method == 'feature':
+            if accepted:
+                match_method_selector.record(template_path, 'feature', elapsed, True)
+                self._remember_location(page, template_path, await self._snap_to_variant_scale(template_path, match))
+                return match['position']
+            position = await self._smart_template_matching_async(screenshot, template_path, base_confidence,
+                                                                 attempt, page)
+            # 模板匹配找到而特征点匹配没找到才算错误，两者都没找到时图片可能确实不在页面上
+            match_method_selector.record(template_path, 'feature', elapsed, False if position else None)
+            return position
+        
+        position = await self._smart_template_matching_async(screenshot, template_path, base_confidence,
+                                                             attempt, page)
+        if position:
+            tolerance = self.config['match_position_tolerance']
+            correct = (accepted and abs(match['position'][0] - position[0]) <= tolerance
+                       and abs(match['position'][1] - position[1]) <= tolerance)
+        else:
+            correct = False if accepted else None
+        match_method_selector.record(template_path, 'feature', elapsed, correct, probe=True)
+        log_info(f"[{self.task_id}] 匹配方式对比: {template_path}, 特征点匹配 {elapsed * 1000:.1f}ms, "
+                 f"结果{'一致' if correct else '不一致' if correct is False else '无法判断'}")
+        return position
+    
+    async def _smart_template_matching_async(self, screenshot: np.ndarray, template_path: str,
+                                             base_confidence: float, attempt: int,
+                                             page=None) -> Optional[Tuple[int, int]]:
+        """
+        智能模板匹配的异步版本：模板加载和多尺度搜索在执行器中运行
+        传入页面时记录匹配位置，作为该页面下次查找该模板的位置提示
+        """
+        try:
+            started = time.perf_counter()
+            match = await self._search_template(screenshot, template_path)
+            position = self._evaluate_match(match, template_path, base_confidence, attempt)
+            match_method_selector.record(template_path, 'template', time.perf_counter() - started,
+                                         True if position else None)
+            if position:
+                self._remember_location(page, template_path, match)
+            return position
             
-            return screenshot_cv
+        except Exception as e:
+            log_info(f"[{self.task_id}] 智能模板匹配过程中发生错误: {e}")
+            return None
+    
+    async def _search_template(self, screenshot: np.ndarray, template_path: str) -> Optional[Dict[str, Any]]:
+        """在执行器中加载模板并做多尺度搜索，返回得分最高的结果（不判断阈值）"""
+        variants = await image_match_executor.run(self._load_template_variants, template_path)
+        if variants is None:
+            return None
+        
+        started = time.perf_counter()
+        match = await image_match_executor.run(self.matcher.find_best_match, screenshot, variants,
+                                               cpu_bound=True)
+        self.frames.record_latency('match', time.perf_counter() - started)
+        return match
+    
+    async def _search_features(self, screenshot: np.ndarray, template_path: str) -> Optional[Dict[str, Any]]:
+        """在执行器中加载模板特征并做特征点匹配，返回几何校验通过的结果（不判断阈值）"""
+        try:
+            features = await image_match_executor.run(self._load_template_features, template_path)
+            if features is None:
+                return None
             
+            started = time.perf_counter()
+            match = await image_match_executor.run(self.matcher.find_by_features, screenshot, features,
+                                                   cpu_bound=True)
+            self.frames.record_latency('feature_match', time.perf_counter() - started)
+            return match
         except Exception as e:
-            log_info(f"[{self.task_id}] 获取页面截图失败: {e}")
+            log_info(f"[{self.task_id}] 特征点匹配过程中发生错误: {e}")
             return None
     
-    def _smart_template_matching(self, screenshot: np.ndarray, template_path: str, 
-                                base_confidence: float, attempt: int) -> Optional[Tuple[int, int]]:
+    async def _snap_to_variant_scale(self, template_path: str, match: Dict[str, Any]) -> Dict[str, Any]:
+        """特征点匹配的缩放比例是连续值，位置提示需要记录最接近的模板变体尺度，hint_region 才能找到对应模板"""
+        variants = await image_match_executor.run(self._load_template_variants, template_path)
+        scale = self.matcher.nearest_variant_scale(variants, match['scale'])
+        return {**match, 'scale': scale} if scale is not None else match
+    
+    def _accept_feature_match(self, match: Optional[Dict[str, Any]], template_path: str) -> bool:
+        """特征点匹配的内点比例达到阈值才视为找到（与模板匹配的置信度不可比，单独配置）"""
+        if match is None:
+            log_info(f"[{self.task_id}] 特征点匹配失败: {template_path}, 有效匹配或内点不足")
+            return False
+        if match['score'] < self.config['feature_min_inlier_ratio']:
+            log_info(f"[{self.task_id}] 特征点匹配失败: {template_path}, 内点比例: {match['score']:.3f}")
+            return False
+        log_info(f"[{self.task_id}] 特征点匹配成功: {template_path}, 内点 {match['inliers']} 个, "
+                 f"内点比例: {match['score']:.3f}, 缩放: {match['scale']}")
+        return True
+    
+    def _remember_location(self, page, template_path: str, match: Dict[str, Any]):
+        """记录匹配位置，作为该页面下次查找该模板的位置提示"""
+        if page is not None and self.config.get('location_hints_enabled'):
+            self.location_hints[(id(page), template_path)] = {'position': match['position'],
+                                                             'scale': match['scale']}
+    
+    async def find_images(self, page, template_paths: List[str], confidence: float = None,
+                          use_cache: bool = True) -> List[Dict[str, Any]]:
         """
-        智能模板匹配 - 结合多尺度匹配和动态置信度调整
+        在同一张截图中查找多个模板，各模板的搜索并行提交到执行器，只做一轮识别不重试
         
         Args:
-            screenshot: 页面截图
-            template_path: 模板图片路径
-            base_confidence: 基础置信度
-            attempt: 当前尝试次数
+            page: Playwright页面对象
+            template_paths: 模板图片路径列表
+            confidence: 匹配置信度，得分不低于该值才算找到，如果为None则使用配置中的默认值
+            use_cache: 是否复用当前帧
             
         Returns:
-            Optional[Tuple[int, int]]: 匹配位置，未找到返回None
+            List[Dict[str, Any]]: 找到的模板 [{image, position, score, scale}, ...]，按得分从高到低排列
         """
-        try:
-            # 加载模板图片
-            template = self._load_template(template_path)
-            if template is None:
-                return None
+        if confidence is None:
+            confidence = self.config['confidence']
+        template_paths = list(dict.fromkeys(template_paths))
+        
+        async with self._lock:
+            log_info(f"[{self.task_id}] 批量查找图片: {', '.join(template_paths)}")
+            screenshot = await self._get_page_screenshot(page, use_cache)
+            if screenshot is None:
+                return []
             
-            # 根据尝试次数调整置信度策略
-            confidence_strategy = self._get_confidence_strategy(base_confidence, attempt)
+            matches = await asyncio.gather(*(self._search_template(screenshot, path) for path in template_paths),
+                                           return_exceptions=True)
             
-            # 多尺度匹配
-            for scale_factor in self.scale_factors:
-                # 缩放模板
-                if scale_factor != 1.0:
-                    h, w = template.shape[:2]
-                    new_h, new_w = int(h * scale_factor), int(w * scale_factor)
-                    if new_h < 10 or new_w < 10:  # 避免模板过小
-                        continue
-                    scaled_template = cv2.resize(template, (new_w, new_h))
-                else:
-                    scaled_template = template
-                
-                # 使用不同置信度级别进行匹配
-                for confidence_level in confidence_strategy:
-                    position = self._find_template_at_scale(screenshot, scaled_template, 
-                                                         template_path, confidence_level, scale_factor)
-                    if position:
-                        return position
+            hits = []
+            for template_path, match in zip(template_paths, matches):
+                if isinstance(match, Exception):
+                    log_info(f"[{self.task_id}] 批量查找时匹配出错: {template_path}, {match}")
+                    continue
+                # 批量查找用于判断页面上出现了哪些图片，只按置信度直接比较，不逐级降低阈值
+                if match is None or match['score'] < confidence:
+                    score = f"{match['score']:.3f}" if match else '-'
+                    log_info(f"[{self.task_id}] 未找到: {template_path}, 最佳置信度: {score}, 阈值: {confidence}")
+                    continue
+                self._remember_location(page, template_path, match)
+                hits.append({'image': template_path, 'position': match['position'],
+                             'score': match['score'], 'scale': match['scale']})
             
+            hits.sort(key=lambda hit: hit['score'], reverse=True)
+            log_info(f"[{self.task_id}] 批量查找完成: {len(hits)}/{len(template_paths)} 个模板找到")
+            return hits
+    
+    def _evaluate_match(self, match: Optional[Dict[str, Any]], template_path: str,
+                        base_confidence: float, attempt: int) -> Optional[Tuple[int, int]]:
+        """按置信度策略判断最佳匹配是否有效，得分达到任一阈值即视为匹配成功"""
+        if match is None:
+            log_info(f"[{self.task_id}] 模板匹配失败: {template_path}, 没有可用的匹配尺度")
             return None
-            
-        except Exception as e:
-            log_info(f"[{self.task_id}] 智能模板匹配过程中发生错误: {e}")
+        
+        # 根据尝试次数调整置信度策略
+        confidence_strategy = self._get_confidence_strategy(base_confidence, attempt)
+        scale_info = f" (缩放: {match['scale']:.1f})" if match['scale'] != 1.0 else ""
+        threshold = next((level for level in confidence_strategy if match['score'] >= level), None)
+        if threshold is None:
+            log_info(f"[{self.task_id}] 模板匹配失败: {template_path}, 最佳置信度: {match['score']:.3f}, "
+                     f"最低阈值: {min(confidence_strategy)}{scale_info}")
             return None
+        
+        log_info(f"[{self.task_id}] 模板匹配成功: {template_path}, 置信度: {match['score']:.3f}, "
+                 f"阈值: {threshold}{scale_info}")
+        return match['position']
     
     def _get_confidence_strategy(self, base_confidence: float, attempt: int) -> List[float]:
         """
@@ -192,79 +367,61 @@ class ImageRecognition:
             # 后续尝试：使用最低置信度
             return [max(0.1, base_confidence - 0.4), 0.08, 0.05]
     
-    def _find_template_at_scale(self, screenshot: np.ndarray, template: np.ndarray, 
-                               template_path: str, confidence: float, scale_factor: float) -> Optional[Tuple[int, int]]:
-        """
-        在指定尺度下查找模板
-        
-        Args:
-            screenshot: 页面截图
-            template: 模板图片
-            template_path: 模板路径（用于日志）
-            confidence: 匹配置信度
-            scale_factor: 缩放因子
-            
-        Returns:
-            Optional[Tuple[int, int]]: 匹配位置，未找到返回None
-        """
+    def _load_template_variants(self, template_path: str) -> Optional[List[Dict[str, Any]]]:
+        """加载模板的各尺度缩放变体，每个模板只生成一次并随模板缓存"""
         try:
-            # 模板匹配
-            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            if max_val >= confidence:
-                # 计算中心位置
-                h, w = template.shape[:2]
-                center_x = max_loc[0] + w // 2
-                center_y = max_loc[1] + h // 2
-                
-                scale_info = f" (缩放: {scale_factor:.1f})" if scale_factor != 1.0 else ""
-                log_info(f"[{self.task_id}] 模板匹配成功: {template_path}, 置信度: {max_val:.3f}, 阈值: {confidence}{scale_info}")
-                return (center_x, center_y)
-            else:
-                scale_info = f" (缩放: {scale_factor:.1f})" if scale_factor != 1.0 else ""
-                log_info(f"[{self.task_id}] 模板匹配失败: {template_path}, 置信度: {max_val:.3f}, 阈值: {confidence}{scale_info}")
+            entry = template_cache.get(template_path)
+            if entry is None:
+                log_info(f"[{self.task_id}] 无法加载模板: {template_path}")
                 return None
+            return template_cache.get_entry_variant(entry, self.matcher.variant_key(), self.matcher.build_variants)
                 
         except Exception as e:
-            log_info(f"[{self.task_id}] 指定尺度模板匹配过程中发生错误: {e}")
+            log_info(f"[{self.task_id}] 加载模板时发生错误: {e}")
             return None
     
-    def _load_template(self, template_path: str) -> Optional[np.ndarray]:
-        """加载模板图片，使用任务隔离的缓存"""
+    def _load_template_features(self, template_path: str) -> Optional[Dict[str, Any]]:
+        """加载模板的特征点和描述子，每个模板只计算一次并随模板缓存"""
         try:
-            # 检查缓存
-            if template_path in self.template_cache:
-                log_info(f"[{self.task_id}] 使用缓存的模板: {template_path}")
-                return self.template_cache[template_path]
-            
-            # 加载新模板
-            log_info(f"[{self.task_id}] 加载新模板: {template_path}")
-            template = cv2.imread(template_path)
-            if template is not None:
-                self.template_cache[template_path] = template
-                log_info(f"[{self.task_id}] 模板已缓存: {template_path}")
-                return template
-            else:
+            entry = template_cache.get(template_path)
+            if entry is None:
                 log_info(f"[{self.task_id}] 无法加载模板: {template_path}")
                 return None
+            return template_cache.get_entry_variant(entry, self.matcher.feature_key(), self.matcher.build_features)
                 
         except Exception as e:
-            log_info(f"[{self.task_id}] 加载模板时发生错误: {e}")
+            log_info(f"[{self.task_id}] 加载模板特征时发生错误: {e}")
             return None
     
+    def get_hint_stats(self) -> Dict[str, Any]:
+        """获取位置提示统计信息"""
+        lookups = self.hint_stats['hits'] + self.hint_stats['misses']
+        return {
+            'hits': self.hint_stats['hits'],
+            'misses': self.hint_stats['misses'],
+            'hit_rate': self.hint_stats['hits'] / lookups if lookups else 0.0,
+            'hint_count': len(self.location_hints)
+        }
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各阶段耗时统计（毫秒）：capture 截图、decode 解码、hint_match 提示区域匹配、match 全图匹配、
+        feature_match 特征点匹配"""
+        return self.frames.get_latency_stats()
+    
+    def reset_stats(self):
+        """重置位置提示、截图和耗时统计信息（保留已记录的位置）"""
+        self.hint_stats = {'hits': 0, 'misses': 0}
+        self.frames.reset_stats()
+    
     def clear_cache(self):
-        """清理缓存"""
-        self.template_cache.clear()
-        self.screenshot_cache.clear()
-        self.last_screenshot_time = 0
+        """使当前帧失效（共享模板缓存按文件修改时间自动失效，无需清理）"""
+        self.frames.invalidate()
         log_info(f"[{self.task_id}] 缓存已清理")
     
     def get_cache_info(self) -> Dict[str, Any]:
         """获取缓存信息"""
         return {
             'task_id': self.task_id,
-            'template_cache_size': len(self.template_cache),
-            'screenshot_cache_size': len(self.screenshot_cache),
-            'last_screenshot_time': self.last_screenshot_time
-        } 
\ No newline at end of file
+            'template_cache': template_cache.get_stats(),
+            'frames': self.frames.get_stats()
+        }
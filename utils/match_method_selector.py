@@ -0,0 +1,103 @@
+"""
+匹配方式选择器
+按模板记录多尺度模板匹配和特征点匹配的实测耗时与准确率：auto 模式下每个模板先同时运行两种方式
+对比若干次（以模板匹配的结果为准判断特征点匹配是否正确），之后选择准确率达标且更快的方式；
+进程内所有图片识别实例共享，线程安全
+"""
+import threading
+from typing import Any, Dict, Optional
+from config.ui_config import UIConfig
+from config.logger import log_info
+
+
+class MatchMethodSelector:
+    """匹配方式选择器 - 按模板选择 template / feature"""
+
+    METHODS = ('template', 'feature')
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """初始化选择器"""
+        self.config = config or UIConfig.get_image_recognition_config()
+        # 模板路径 -> {probes, template: {...}, feature: {...}}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def choose(self, template_path: str) -> str:
+        """
+        选择该模板的匹配方式
+
+        Returns:
+            str: template / feature，auto 模式下对比次数不足时返回 probe（两种方式都运行）
+        """
+        mode = self.config['match_method']
+        if mode != 'auto':
+            return mode
+        with self._lock:
+            stats = self._stats.get(template_path)
+            if stats is None or stats['probes'] < self.config['match_method_probes']:
+                return 'probe'
+
+            feature, template = stats['feature'], stats['template']
+            if not feature['judged'] or not template['runs']:
+                return 'template'
+            accuracy = feature['correct'] / feature['judged']
+            if accuracy < self.config['feature_min_accuracy']:
+                return 'template'
+            if feature['total'] / feature['runs'] >= template['total'] / template['runs']:
+                return 'template'
+            return 'feature'
+
+    def record(self, template_path: str, method: str, seconds: float, correct: Optional[bool] = None,
+               probe: bool = False):
+        """
+        记录一次匹配结果
+
+        Args:
+            template_path: 模板路径
+            method: template / feature
+            seconds: 匹配耗时
+            correct: 结果是否正确，无法判断时为None（如图片确实不在页面上）
+            probe: 是否为两种方式的对比运行
+        """
+        with self._lock:
+            stats = self._stats.setdefault(template_path, {
+                'probes': 0,
+                **{name: {'runs': 0, 'total': 0.0, 'judged': 0, 'correct': 0} for name in self.METHODS}
+            })
+            before = self.choose(template_path)
+            item = stats[method]
+            item['runs'] += 1
+            item['total'] += seconds
+            if correct is not None:
+                item['judged'] += 1
+                item['correct'] += int(correct)
+            if probe and method == 'feature':
+                stats['probes'] += 1
+            after = self.choose(template_path)
+
+        if after != before and after != 'probe':
+            log_info(f"模板 {template_path} 的匹配方式切换为 {after}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各模板当前选择的匹配方式及两种方式的平均耗时（毫秒）和准确率"""
+        result = {}
+        with self._lock:
+            for template_path, stats in self._stats.items():
+                result[template_path] = {'method': self.choose(template_path), 'probes': stats['probes']}
+                for name in self.METHODS:
+                    item = stats[name]
+                    result[template_path][name] = {
+                        'runs': item['runs'],
+                        'avg_ms': item['total'] / item['runs'] * 1000 if item['runs'] else 0.0,
+                        'accuracy': item['correct'] / item['judged'] if item['judged'] else None
+                    }
+        return result
+
+    def reset(self):
+        """清空所有模板的实测数据，auto 模式下重新对比"""
+        with self._lock:
+            self._stats = {}
+
+
+# 创建全局实例
+match_method_selector = MatchMethodSelector()
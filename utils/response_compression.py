@@ -0,0 +1,126 @@
+"""
+响应压缩中间件
+对JSON等文本响应按Accept-Encoding协商进行gzip/brotli压缩
+"""
+import gzip
+from typing import Dict, Optional
+from config.logger import log_info
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+
+class ResponseCompressor:
+    """响应压缩器"""
+
+    # 默认配置
+    DEFAULT_CONFIG = {
+        'enabled': True,
+        'min_size': 1024,          # 小于该字节数的响应不压缩
+        'gzip_level': 6,
+        'brotli_quality': 4,       # 动态内容使用较低的质量等级，兼顾速度
+        'mimetypes': (
+            'application/json',
+            'text/html',
+            'text/plain',
+            'text/css',
+            'application/javascript',
+            'text/javascript',
+        ),
+    }
+
+    # 已压缩的图片等路由前缀，直接跳过
+    SKIP_PATH_PREFIXES = ('/Game_Img/', '/IMG_LOGS/', '/thumb/', '/favicon.ico')
+
+    def __init__(self, app=None):
+        self.config = dict(self.DEFAULT_CONFIG)
+        # 按蓝图覆盖的配置，如 {'automation': {'min_size': 512}, 'auth': {'enabled': False}}
+        self.blueprint_config: Dict[str, dict] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """注册到Flask应用"""
+        self.config.update(app.config.get('COMPRESSION', {}))
+        self.blueprint_config.update(app.config.get('COMPRESSION_BLUEPRINTS', {}))
+        app.after_request(self.compress_response)
+        encodings = 'br, gzip' if BROTLI_AVAILABLE else 'gzip'
+        log_info(f"响应压缩已启用: {encodings}, 阈值 {self.config['min_size']} 字节")
+
+    def configure_blueprint(self, blueprint_name: str, **options):
+        """为指定蓝图设置压缩配置"""
+        self.blueprint_config.setdefault(blueprint_name, {}).update(options)
+
+    def _get_config(self, blueprint_name: Optional[str]) -> dict:
+        """合并全局配置与蓝图配置"""
+        if blueprint_name and blueprint_name in self.blueprint_config:
+            merged = dict(self.config)
+            merged.update(self.blueprint_config[blueprint_name])
+            return merged
+        return self.config
+
+    @staticmethod
+    def _choose_encoding(accept_encoding: str) -> Optional[str]:
+        """根据Accept-Encoding选择编码，优先brotli"""
+        accepted = {}
+        for part in accept_encoding.lower().split(','):
+            token, _, params = part.strip().partition(';')
+            if not token:
+                continue
+            q = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    q = 0.0
+            accepted[token] = q
+
+        if BROTLI_AVAILABLE and accepted.get('br', 0) > 0:
+            return 'br'
+        if accepted.get('gzip', 0) > 0 or accepted.get('*', 0) > 0:
+            return 'gzip'
+        return None
+
+    def compress_response(self, response):
+        """after_request钩子：按需压缩响应体"""
+        from flask import request
+
+        config = self._get_config(request.blueprint)
+        if not config.get('enabled', True):
+            return response
+
+        if (response.direct_passthrough
+                or response.status_code < 200 or response.status_code >= 300
+                or 'Content-Encoding' in response.headers
+                or request.path.startswith(self.SKIP_PATH_PREFIXES)
+                or response.mimetype not in config['mimetypes']):
+            return response
+
+        encoding = self._choose_encoding(request.headers.get('Accept-Encoding', ''))
+        # 无论是否压缩，都声明响应随Accept-Encoding变化
+        response.vary.add('Accept-Encoding')
+        if not encoding:
+            return response
+
+        data = response.get_data()
+        if len(data) < config['min_size']:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=config['brotli_quality'])
+        else:
+            compressed = gzip.compress(data, compresslevel=config['gzip_level'])
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Content-Length'] = str(len(compressed))
+        return response
+
+
+# 创建全局实例
+response_compressor = ResponseCompressor()
@@ -1,4 +1,3 @@
-import pyautogui
 from typing import Tuple, List, Dict
 import asyncio
 import math
@@ -12,13 +11,24 @@ class ScreenManager:
         self.used_positions = []
         self.max_browsers = None  # 不再限制为固定数量，支持任意正整数
         self.margin = 0  # 网格模式下无间距
+        self.full_screen_width = 0
+        self.full_screen_height = 0
+        # 显示器尺寸在首次计算布局时才检测，导入模块时不访问显示器
+        self._screen_detected = False
+    
+    def _ensure_screen_info(self):
+        """首次使用时检测显示器尺寸并计算浏览器尺寸"""
+        if self._screen_detected:
+            return
         self._init_screen_info()
         # 动态设置浏览器尺寸，基于实际屏幕分辨率
         self._calculate_browser_sizes()
+        self._screen_detected = True
     
     def _init_screen_info(self):
         """初始化屏幕信息"""
         try:
+            import pyautogui
             # 获取主显示器尺寸
             self.screen_width = pyautogui.size().width
             self.screen_height = pyautogui.size().height
@@ -51,6 +61,7 @@ class ScreenManager:
     
     def _get_cell_size(self, cols: int, rows: int) -> Tuple[int, int]:
         """根据列数和行数计算每个单元格（浏览器）的宽高。"""
+        self._ensure_screen_info()
         # 采用整除确保所有窗口尺寸一致，剩余像素作为边缘空白，避免重叠
         width = self.screen_width // cols
         height = self.screen_height // rows
@@ -69,6 +80,7 @@ class ScreenManager:
         """
         if browser_count <= 0:
             raise ValueError("浏览器数量必须为正整数")
+        self._ensure_screen_info()
         
         positions = []
         
@@ -105,6 +117,7 @@ class ScreenManager:
             List[str]: 浏览器启动参数列表
         """
         x, y = position
+        self._ensure_screen_info()
         
         # 根据浏览器数量确定窗口尺寸
         if browser_count == 1:
@@ -0,0 +1,304 @@
+"""
+测试步骤解释执行器
+直接读取项目的 test_steps 配置并调用 UIOperations 执行，无需生成和编译测试文件
+"""
+import asyncio
+import importlib
+import os
+import sys
+import textwrap
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy
+from config.logger import log_info, log_error
+from utils.test_code_generator import test_code_generator
+from utils.concurrent_runner import concurrent_runner
+
+
+class StepExecutionCancelled(Exception):
+    """测试执行被取消"""
+
+
+class _LazyModule:
+    """首次访问属性时才导入的模块，pyautogui 等导入时依赖图形界面的模块不在执行器中提前导入"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+class StepInterpreter:
+    """测试步骤解释执行器 - 每个产品地址使用独立的浏览器实例并发执行"""
+
+    # 浏览器连接异常关键字，命中时视为用户关闭了浏览器
+    BROWSER_CLOSED_KEYWORDS = ('target closed', 'browser has been closed', 'disconnected', 'session closed')
+
+    # 自定义断言代码的全局变量，首次执行自定义断言时构建
+    _custom_assertion_globals: Optional[Dict[str, Any]] = None
+
+    def __init__(self, headless: bool = False):
+        """初始化解释执行器"""
+        self.headless = headless
+
+    @classmethod
+    def custom_assertion_globals(cls) -> Dict[str, Any]:
+        """
+        自定义断言代码可用的全局变量，与生成的测试文件头部导入的名称保持一致，
+        使同一段代码在文件模式和解释执行模式下行为相同
+        """
+        if cls._custom_assertion_globals is None:
+            namespace = {
+                'sys': sys,
+                'os': os,
+                'asyncio': asyncio,
+                'time': time,
+                'numpy': numpy,
+                'log_info': log_info,
+                'pytest': _LazyModule('pytest'),
+                'allure': _LazyModule('allure'),
+                'pyautogui': _LazyModule('pyautogui'),
+            }
+            # 对应测试文件中的 from Base_ENV.config import *
+            base_env = importlib.import_module('Base_ENV.config')
+            exported = getattr(base_env, '__all__', None) or [name for name in vars(base_env) if not name.startswith('_')]
+            namespace.update({name: getattr(base_env, name) for name in exported})
+            cls._custom_assertion_globals = namespace
+        return cls._custom_assertion_globals
+
+    def run(self, test_steps: List[Dict[str, Any]], product_addresses: List[Tuple[str, str]],
+            is_cancelled: Optional[Callable[[], bool]] = None,
+            fail_fast: Optional[bool] = None,
+            only_functions: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        同步执行测试步骤（在后台线程中调用，内部创建独立的事件循环）
+
+        Args:
+            test_steps: 项目的测试步骤配置
+            product_addresses: [(product_id, address), ...]，每个地址一个浏览器实例
+            is_cancelled: 返回是否已取消的回调，在步骤和重试之间检查
+            fail_fast: 任一地址失败时是否立即取消其余地址，None 表示使用默认策略
+            only_functions: 只执行其中的测试函数（重跑失败的地址），None 表示全部执行
+
+        Returns:
+            执行结果，包含 success 与每个地址的 results
+        """
+        return asyncio.run(self.run_async(test_steps, product_addresses, is_cancelled, fail_fast, only_functions))
+
+    async def run_async(self, test_steps: List[Dict[str, Any]], product_addresses: List[Tuple[str, str]],
+                        is_cancelled: Optional[Callable[[], bool]] = None,
+                        fail_fast: Optional[bool] = None,
+                        only_functions: Optional[List[str]] = None) -> Dict[str, Any]:
+        """并发执行所有产品地址的测试步骤"""
+        from utils.screen_manager import screen_manager
+
+        steps = test_code_generator.build_steps(test_steps)
+        functions = test_code_generator.build_functions(product_addresses)
+        if only_functions is not None:
+            # 函数名与全量执行时保持一致，只筛选需要执行的地址；没有匹配的函数时抛出ValueError
+            selected = concurrent_runner.select_functions([fn['name'] for fn in functions], only_functions)
+            functions = [fn for fn in functions if fn['name'] in selected]
+        is_cancelled = is_cancelled or (lambda: False)
+
+        browser_count = len(functions)
+        log_info(f"解释执行模式: 开始并发执行 {browser_count} 个独立浏览器实例, 共 {len(steps)} 个步骤")
+        browser_positions = screen_manager.get_browser_positions(browser_count)
+        browser_args_list = [screen_manager.get_browser_args(position, browser_count)
+                             for position in browser_positions]
+
+        outcomes = await concurrent_runner.run({
+            fn['name']: self.run_function(fn, steps, browser_args_list[i], is_cancelled)
+            for i, fn in enumerate(functions)
+        }, fail_fast=fail_fast, only=only_functions)
+
+        results = [dict(outcome, address=fn['address']) for fn, outcome in zip(functions, outcomes)]
+        return {
+            'success': all(r['success'] for r in results),
+            'cancelled': is_cancelled(),
+            'results': results,
+        }
+
+    async def run_function(self, fn: Dict[str, str], steps: List[Dict[str, Any]],
+                           browser_args: List[str], is_cancelled: Callable[[], bool]):
+        """在独立的浏览器实例中执行一个产品地址的全部步骤"""
+        from playwright.async_api import async_playwright
+        from utils.ui_operations import UIOperations
+
+        task_id = fn['name']
+        async with async_playwright() as p:
+            browser = None
+            context = None
+            page = None
+            try:
+                browser = await p.chromium.launch(headless=self.headless, args=browser_args)
+                context = await browser.new_context(no_viewport=True)
+                page = await context.new_page()
+                ui_operations = UIOperations(page, task_id=task_id)
+
+                await ui_operations.navigate_to(fn['address'])
+                await self._check_browser(ui_operations, task_id)
+
+                for step in steps:
+                    if is_cancelled():
+                        raise StepExecutionCancelled(f"[{task_id}] 测试在步骤{step['index']}前被取消")
+                    log_info(f"[{task_id}] 开始测试步骤{step['index']} {step['name']} 的操作==============")
+                    if step['type'] == 'web':
+                        await self.run_web_step(ui_operations, fn, step, is_cancelled)
+                    else:
+                        await self.run_game_step(ui_operations, fn, step, is_cancelled)
+
+                await self._check_browser(ui_operations, task_id)
+                await ui_operations.page_screenshot(task_id, f"over_test_test_step_{len(steps)}")
+
+                stats = ui_operations.get_image_stats()
+                log_info(f"[{task_id}] 图片识别统计: 截图识别成功 {stats['screenshot_success']} 次, "
+                         f"pyautogui成功 {stats['pyautogui_success']} 次, "
+                         f"总成功率 {stats['success_rate']:.2%}, "
+                         f"位置提示命中率 {stats['location_hints']['hit_rate']:.2%}")
+                log_info(f"[{task_id}] {task_id} 完成")
+            except Exception as e:
+                log_info(f"[{task_id}] {task_id} 失败: {e}")
+                raise
+            finally:
+                if page:
+                    await page.close()
+                if context:
+                    await context.close()
+                if browser:
+                    await browser.close()
+
+    async def run_web_step(self, ui_operations, fn: Dict[str, str], step: Dict[str, Any],
+                           is_cancelled: Callable[[], bool]):
+        """执行Web元素操作步骤"""
+        task_id = fn['name']
+        if step['screenshot_before']:
+            await ui_operations.page_screenshot(task_id, f"step_{step['index']}_before")
+
+        if step['tab_target_url']:
+            log_info(f"[{task_id}] 正在打开新标签页: {step['tab_target_url']}")
+            await ui_operations.open_new_tab_and_navigate(step['tab_target_url'])
+            await ui_operations.get_all_tabs()
+            await ui_operations.url_assert_exists(step['tab_target_url'])
+            if self._is_fixed_wait(step):
+                await asyncio.sleep(1)
+            else:
+                await ui_operations.wait_for_load_state('load')
+
+        # 等待页面就绪后再断言和操作
+        await self._wait_step_ready(ui_operations, step)
+        await ui_operations.elem_assert_exists(step['params'])
+        for assertion in step['assertions']:
+            await self.run_assertion(ui_operations, assertion)
+
+        operation = self._resolve_operation(ui_operations, step)
+        for attempt in range(step['count']):
+            if is_cancelled():
+                raise StepExecutionCancelled(f"[{task_id}] 测试在步骤{step['index']}执行中被取消")
+            await self._check_browser(ui_operations, task_id)
+            try:
+                log_info(f"[{task_id}] 执行第{attempt + 1}次操作: {step['event']} on {step['params']}")
+                await operation()
+                if self._is_fixed_wait(step):
+                    await asyncio.sleep(1)
+            except Exception as e:
+                if any(keyword in str(e).lower() for keyword in self.BROWSER_CLOSED_KEYWORDS):
+                    log_info(f"[{task_id}] 检测到浏览器连接异常，可能被用户关闭")
+                    raise Exception("BROWSER_CLOSED_BY_USER")
+                log_info(f"[{task_id}] 第{attempt + 1}次操作失败: {e}")
+                if attempt == step['count'] - 1:
+                    log_info(f"[{task_id}] 所有操作均失败！")
+                    if step['screenshot_on_failure']:
+                        await ui_operations.page_screenshot(task_id, f"step_{step['index']}_failure")
+        if self._is_fixed_wait(step):
+            await asyncio.sleep(1)
+
+        if step['screenshot_after']:
+            await ui_operations.page_screenshot(task_id, f"step_{step['index']}_after")
+
+    async def run_game_step(self, ui_operations, fn: Dict[str, str], step: Dict[str, Any],
+                            is_cancelled: Callable[[], bool]):
+        """执行游戏图片操作步骤"""
+        task_id = fn['name']
+        if step['screenshot_before']:
+            await ui_operations.page_screenshot(task_id, f"step_{step['index']}_before")
+
+        # 游戏操作前先滚动页面确保图片可见
+        if self._is_fixed_wait(step):
+            await asyncio.sleep(1)
+        await ui_operations.page_mouse_scroll(delta_x=0, delta_y=1500)
+
+        for attempt in range(step['count']):
+            if is_cancelled():
+                raise StepExecutionCancelled(f"[{task_id}] 测试在步骤{step['index']}执行中被取消")
+            await self._check_browser(ui_operations, task_id)
+            log_info(f"[{task_id}] 执行第{attempt + 1}次图片操作: {step['event']} on {step['params']}")
+            await self._wait_step_ready(ui_operations, step)
+            success = await ui_operations.click_image_with_fallback(step['params'], confidence=0.5, timeout=10)
+            if not success:
+                log_info(f"[{task_id}] 第{attempt + 1}次图片定位失败")
+                if step['screenshot_on_failure']:
+                    await ui_operations.page_screenshot(task_id, f"step_{step['index']}_failure")
+                raise Exception(f"图片定位失败：无法找到图片 {step['params']}")
+            log_info(f"[{task_id}] 第{attempt + 1}次操作完成")
+            if self._is_fixed_wait(step):
+                await asyncio.sleep(1)
+
+        if step['screenshot_after']:
+            await ui_operations.page_screenshot(task_id, f"step_{step['index']}_after")
+
+    async def run_assertion(self, ui_operations, assertion: Dict[str, Any]):
+        """执行一条断言，自定义脚本断言在与生成的测试函数相同的 ui_operations/page/task_id 上下文中运行"""
+        log_info(f"[{ui_operations.task_id}] {assertion['title']}")
+        if assertion['method']:
+            method = getattr(ui_operations, assertion['method'])
+            await method(*assertion['args'], **assertion['kwargs'])
+            return
+
+        source = "async def _custom_assertion(ui_operations, page, task_id):\n" + textwrap.indent(assertion['code'], '    ')
+        namespace = dict(self.custom_assertion_globals(), UIOperations=type(ui_operations))
+        try:
+            exec(compile(source, f"<{assertion['title']}>", 'exec'), namespace)
+        except SyntaxError as e:
+            log_error(f"自定义断言代码语法错误: {assertion['title']}, {e}")
+            raise
+        await namespace['_custom_assertion'](ui_operations, ui_operations.page, ui_operations.task_id)
+
+    @staticmethod
+    def _is_fixed_wait(step: Dict[str, Any]) -> bool:
+        """步骤是否使用固定暂停（旧行为）"""
+        return step['wait']['strategy'] == 'fixed'
+
+    @classmethod
+    async def _wait_step_ready(cls, ui_operations, step: Dict[str, Any]):
+        """按步骤的等待策略等待页面就绪"""
+        if cls._is_fixed_wait(step):
+            await asyncio.sleep(step['pause'])
+            return
+        wait = step['wait']
+        await ui_operations.wait_until(wait['strategy'], wait['target'], timeout=wait['timeout'])
+
+    @staticmethod
+    def _resolve_operation(ui_operations, step: Dict[str, Any]):
+        """根据操作事件解析 UIOperations 方法"""
+        if step['event'] == 'input':
+            return lambda: ui_operations.elem_input(step['params'], step['input_value'])
+
+        method = getattr(ui_operations, f"elem_{step['event']}", None)
+        if method is None:
+            raise ValueError(f"不支持的操作事件: {step['event']}")
+        return lambda: method(step['params'])
+
+    @staticmethod
+    async def _check_browser(ui_operations, task_id: str):
+        """检查浏览器是否已被用户关闭"""
+        if await ui_operations.is_browser_closed():
+            log_info(f"[{task_id}] 检测到浏览器已关闭，测试被用户中断")
+            raise Exception("BROWSER_CLOSED_BY_USER")
+
+
+# 创建全局实例
+step_interpreter = StepInterpreter()
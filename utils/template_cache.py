@@ -0,0 +1,190 @@
+"""
+模板图片缓存
+进程内所有图片识别实例共享，按 路径+修改时间+大小 判断是否命中，
+图片在磁盘上被修改后自动重新加载；同时缓存灰度图、缩放图等预计算变体，
+总内存超过上限时按最近最少使用淘汰
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import cv2
+import numpy as np
+from config.ui_config import UIConfig
+from config.logger import log_info
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """生成灰度图变体"""
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _estimate_size(value: Any) -> int:
+    """估算变体占用的内存（字节），支持数组及数组组成的列表/元组/字典"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(item) for item in value)
+    return 0
+
+
+class CachedTemplate:
+    """缓存中的一个模板及其预计算变体"""
+
+    def __init__(self, path: str, key: Tuple[int, int], image: np.ndarray):
+        self.path = path
+        self.key = key
+        self.image = image
+        self.variants: Dict[str, Any] = {}
+        self.nbytes = image.nbytes
+
+
+class TemplateCache:
+    """模板图片缓存 - 线程安全，LRU淘汰，修改时间失效"""
+
+    # 内置的变体生成函数，其他变体由调用方传入生成函数
+    VARIANT_BUILDERS: Dict[str, Callable[[np.ndarray], Any]] = {
+        'gray': _to_gray,
+    }
+
+    def __init__(self, max_bytes: int = None, enabled: bool = None):
+        """初始化缓存"""
+        self.max_bytes = max_bytes or UIConfig.TEMPLATE_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = UIConfig.TEMPLATE_CACHE_ENABLED if enabled is None else enabled
+        self._entries: 'OrderedDict[str, CachedTemplate]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, template_path: str) -> Optional[CachedTemplate]:
+        """
+        获取模板，未缓存或文件已变化时从磁盘加载
+
+        Returns:
+            CachedTemplate，文件不存在或无法解码时返回None
+        """
+        path = os.path.abspath(template_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._discard(path)
+            log_info(f"模板文件不存在: {template_path}")
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                if entry.key == key:
+                    self._entries.move_to_end(path)
+                    self._stats['hits'] += 1
+                    return entry
+                # 文件已被修改，丢弃旧的模板和变体
+                self._remove(path)
+                self._stats['invalidations'] += 1
+                log_info(f"模板文件已变化，重新加载: {template_path}")
+            self._stats['misses'] += 1
+
+        image = cv2.imread(path)
+        if image is None:
+            log_info(f"无法加载模板: {template_path}")
+            return None
+
+        entry = CachedTemplate(path, key, image)
+        if not self.enabled:
+            return entry
+        with self._lock:
+            if path in self._entries:
+                # 其他线程已加载同一文件
+                self._remove(path)
+            self._entries[path] = entry
+            self._total_bytes += entry.nbytes
+            self._evict(keep=path)
+        return entry
+
+    def get_image(self, template_path: str) -> Optional[np.ndarray]:
+        """获取模板原图"""
+        entry = self.get(template_path)
+        return entry.image if entry is not None else None
+
+    def get_variant(self, template_path: str, name: str, builder: Callable[[np.ndarray], Any] = None) -> Any:
+        """
+        获取模板的预计算变体，首次获取时生成并计入缓存内存
+
+        Args:
+            template_path: 模板路径
+            name: 变体名称，如 gray；同名变体必须由相同参数生成
+            builder: 变体生成函数，参数为模板原图；未传入时使用内置生成函数
+        """
+        entry = self.get(template_path)
+        if entry is None:
+            return None
+        return self.get_entry_variant(entry, name, builder)
+
+    def get_entry_variant(self, entry: CachedTemplate, name: str,
+                          builder: Callable[[np.ndarray], Any] = None) -> Any:
+        """获取已加载模板的变体"""
+        with self._lock:
+            if name in entry.variants:
+                return entry.variants[name]
+
+        builder = builder or self.VARIANT_BUILDERS[name]
+        value = builder(entry.image)
+        size = _estimate_size(value)
+        with self._lock:
+            if name in entry.variants:
+                return entry.variants[name]
+            entry.variants[name] = value
+            entry.nbytes += size
+            if self._entries.get(entry.path) is entry:
+                self._total_bytes += size
+                self._evict(keep=entry.path)
+        return value
+
+    def clear(self):
+        """清空缓存（统计信息保留）"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        log_info("模板缓存已清空")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _discard(self, path: str):
+        """文件已不存在时移除缓存"""
+        with self._lock:
+            if path in self._entries:
+                self._remove(path)
+                self._stats['invalidations'] += 1
+
+    def _remove(self, path: str):
+        """移除缓存项（调用方持有锁）"""
+        entry = self._entries.pop(path)
+        self._total_bytes -= entry.nbytes
+
+    def _evict(self, keep: str):
+        """超过内存上限时淘汰最近最少使用的模板（调用方持有锁），刚使用的模板不淘汰"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            path = next(iter(self._entries))
+            if path == keep:
+                self._entries.move_to_end(path)
+                continue
+            self._remove(path)
+            self._stats['evictions'] += 1
+            log_info(f"模板缓存超过上限，淘汰: {path}")
+
+
+# 创建全局实例
+template_cache = TemplateCache()
@@ -0,0 +1,299 @@
+"""
+模板匹配器
+多尺度模板匹配与金字塔搜索的纯计算部分，不持有锁和事件循环相关状态，
+可以在线程池或进程池中执行
+"""
+import cv2
+import numpy as np
+from typing import Optional, Tuple, Dict, Any, List
+from config.logger import log_info
+
+
+class TemplateMatcher:
+    """模板匹配器 - 逐尺度全图匹配或金字塔搜索，返回得分最高的结果"""
+    
+    def __init__(self, config: Dict[str, Any], scale_factors: List[float], task_id: str = None):
+        """
+        Args:
+            config: 图片识别配置（UIConfig.get_image_recognition_config）
+            scale_factors: 模板缩放比例列表
+            task_id: 任务ID（用于日志）
+        """
+        self.config = config
+        self.scale_factors = scale_factors
+        self.task_id = task_id or f"matcher_{id(self)}"
+    
+    def variant_key(self) -> str:
+        """预计算变体在模板缓存中的名称，尺度列表或金字塔参数变化时使用新的变体"""
+        if self.config.get('pyramid_enabled'):
+            pyramid = f"{self.config['pyramid_downscale']}/{self.config['pyramid_min_template_size']}"
+        else:
+            pyramid = 'off'
+        return f"scaled:{','.join(str(scale) for scale in self.scale_factors)}:{pyramid}"
+    
+    def build_variants(self, template: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        按尺度列表预先生成缩放后的模板，跳过过小的尺度；启用金字塔搜索时同时生成粗匹配用的缩小模板
+        
+        Args:
+            template: 原始尺寸的模板图片
+            
+        Returns:
+            List[Dict[str, Any]]: [{scale, template, coarse}, ...]，coarse 为None表示该尺度按原尺寸匹配
+        """
+        pyramid_enabled = self.config.get('pyramid_enabled')
+        downscale = self.config.get('pyramid_downscale')
+        min_size = self.config.get('pyramid_min_template_size')
+        
+        variants = []
+        h, w = template.shape[:2]
+        for scale_factor in self.scale_factors:
+            # 缩放模板
+            if scale_factor != 1.0:
+                new_h, new_w = int(h * scale_factor), int(w * scale_factor)
+                if new_h < 10 or new_w < 10:  # 避免模板过小
+                    continue
+                scaled_template = cv2.resize(template, (new_w, new_h))
+            else:
+                scaled_template = template
+            
+            coarse_template = None
+            if pyramid_enabled:
+                coarse_h = int(scaled_template.shape[0] * downscale)
+                coarse_w = int(scaled_template.shape[1] * downscale)
+                # 模板缩小后细节不足时，该尺度直接按原尺寸匹配
+                if coarse_h >= min_size and coarse_w >= min_size:
+                    coarse_template = cv2.resize(scaled_template, (coarse_w, coarse_h), interpolation=cv2.INTER_AREA)
+            variants.append({'scale': scale_factor, 'template': scaled_template, 'coarse': coarse_template})
+        return variants
+    
+    def find_best_match(self, screenshot: np.ndarray, variants: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        在所有尺度下匹配模板，返回得分最高的结果
+        启用金字塔搜索时先粗匹配再在候选区域内精匹配，否则逐尺度按原尺寸全图匹配
+        
+        Args:
+            screenshot: 页面截图
+            variants: build_variants 生成的各尺度模板
+            
+        Returns:
+            Optional[Dict[str, Any]]: {score, position, scale}，没有可用尺度时返回None
+        """
+        if self.config.get('pyramid_enabled'):
+            return self.find_best_match_pyramid(screenshot, variants)
+        
+        best = None
+        for variant in variants:
+            match = self.find_template_at_scale(screenshot, variant['template'], variant['scale'])
+            if match and (best is None or match['score'] > best['score']):
+                best = match
+        return best
+    
+    def find_best_match_pyramid(self, screenshot: np.ndarray, variants: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        金字塔搜索：在缩小的截图上匹配缩小的模板找出候选位置，
+        再只在候选位置附近的小区域内按原尺寸精匹配，返回精匹配得分最高的结果
+        
+        Args:
+            screenshot: 页面截图
+            variants: build_variants 生成的各尺度模板（含粗匹配用的缩小模板）
+            
+        Returns:
+            Optional[Dict[str, Any]]: {score, position, scale}，没有可用尺度时返回None
+        """
+        downscale = self.config['pyramid_downscale']
+        max_candidates = self.config['pyramid_candidates']
+        coarse_screenshot = cv2.resize(screenshot, None, fx=downscale, fy=downscale,
+                                       interpolation=cv2.INTER_AREA)
+        
+        best = None
+        candidates = []
+        for variant in variants:
+            scale_factor, scaled_template, coarse_template = variant['scale'], variant['template'], variant['coarse']
+            if coarse_template is None:
+                match = self.find_template_at_scale(screenshot, scaled_template, scale_factor)
+                if match and (best is None or match['score'] > best['score']):
+                    best = match
+                continue
+            coarse_h, coarse_w = coarse_template.shape[:2]
+            if coarse_h > coarse_screenshot.shape[0] or coarse_w > coarse_screenshot.shape[1]:
+                continue
+            
+            result = cv2.matchTemplate(coarse_screenshot, coarse_template, cv2.TM_CCOEFF_NORMED)
+            for score, loc in self._top_peaks(result, max_candidates, coarse_w, coarse_h):
+                candidates.append((score, scale_factor, scaled_template, loc))
+        
+        # 只对粗匹配得分最高的几个候选区域做原尺寸精匹配
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        for _, scale_factor, scaled_template, loc in candidates[:max_candidates]:
+            match = self._refine_match(screenshot, scaled_template, scale_factor, loc, downscale)
+            if match and (best is None or match['score'] > best['score']):
+                best = match
+        return best
+    
+    def hint_region(self, variants: List[Dict[str, Any]], hint: Dict[str, Any],
+                    frame_size: Optional[Tuple[int, int]] = None) -> Optional[Tuple[Dict[str, Any], Tuple[int, int, int, int]]]:
+        """
+        计算位置提示的查找区域：上次匹配位置按上次尺度的模板大小向四周扩展
+        
+        Args:
+            variants: build_variants 生成的各尺度模板
+            hint: 上次的匹配结果 {position, scale}
+            frame_size: 整张截图的 (宽, 高)，用于裁剪区域
+            
+        Returns:
+            (该尺度的模板变体, (x0, y0, x1, y1))，该尺度已不可用或区域为空时返回None
+        """
+        variant = next((v for v in variants if v['scale'] == hint['scale']), None)
+        if variant is None:
+            return None
+        h, w = variant['template'].shape[:2]
+        margin = self.config['location_hint_margin']
+        x = hint['position'][0] - w // 2
+        y = hint['position'][1] - h // 2
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        x1, y1 = x + w + margin, y + h + margin
+        if frame_size:
+            x1, y1 = min(frame_size[0], x1), min(frame_size[1], y1)
+        if x1 - x0 < w or y1 - y0 < h:
+            return None
+        return variant, (x0, y0, x1, y1)
+    
+    @staticmethod
+    def nearest_variant_scale(variants: List[Dict[str, Any]], scale: float) -> Optional[float]:
+        """与给定缩放比例最接近的模板变体尺度，没有可用变体时返回None"""
+        if not variants:
+            return None
+        return min(variants, key=lambda variant: abs(variant['scale'] - scale))['scale']
+    
+    def feature_detector(self) -> str:
+        """实际使用的特征点检测器，OpenCV 5 起 AKAZE 移到了扩展模块，不可用时使用 ORB"""
+        if self.config['feature_detector'] == 'akaze' and hasattr(cv2, 'AKAZE_create'):
+            return 'akaze'
+        return 'orb'
+    
+    def feature_key(self) -> str:
+        """模板特征点在模板缓存中的变体名称"""
+        return f"features:{self.feature_detector()}"
+    
+    def _create_detector(self, max_keypoints: int = None):
+        """创建特征点检测器，ORB 和 AKAZE 都输出二进制描述子"""
+        if self.feature_detector() == 'akaze':
+            return cv2.AKAZE_create()
+        return cv2.ORB_create(nfeatures=max_keypoints or 500)
+    
+    def build_features(self, template: np.ndarray) -> Dict[str, Any]:
+        """
+        预先计算模板的特征点和描述子
+        
+        Returns:
+            Dict[str, Any]: {points, descriptors, size}，特征点不足时 descriptors 为None
+        """
+        gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY) if template.ndim == 3 else template
+        keypoints, descriptors = self._create_detector().detectAndCompute(gray, None)
+        h, w = template.shape[:2]
+        if descriptors is None or len(keypoints) < self.config['feature_min_inliers']:
+            return {'points': None, 'descriptors': None, 'size': (w, h)}
+        points = np.float32([keypoint.pt for keypoint in keypoints])
+        return {'points': points, 'descriptors': descriptors, 'size': (w, h)}
+    
+    def find_by_features(self, screenshot: np.ndarray, features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        特征点匹配：描述子最近邻匹配 + 比值检验，再用 RANSAC 估计相似变换，
+        一次匹配即可得到任意缩放比例下的模板位置
+        
+        Args:
+            screenshot: 页面截图
+            features: build_features 生成的模板特征
+            
+        Returns:
+            Optional[Dict[str, Any]]: {score, position, scale, inliers}，score 为内点比例；
+            模板特征不足或几何校验失败时返回None
+        """
+        if not features or features['descriptors'] is None:
+            return None
+        
+        gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY) if screenshot.ndim == 3 else screenshot
+        keypoints, descriptors = self._create_detector(self.config['feature_max_keypoints']).detectAndCompute(gray, None)
+        if descriptors is None or len(keypoints) < 2:
+            return None
+        
+        pairs = cv2.BFMatcher(cv2.NORM_HAMMING).knnMatch(features['descriptors'], descriptors, k=2)
+        ratio = self.config['feature_ratio_test']
+        good = [pair[0] for pair in pairs if len(pair) == 2 and pair[0].distance < ratio * pair[1].distance]
+        min_inliers = self.config['feature_min_inliers']
+        if len(good) < min_inliers:
+            return None
+        
+        src = features['points'][[match.queryIdx for match in good]]
+        dst = np.float32([keypoints[match.trainIdx].pt for match in good])
+        transform, inlier_mask = cv2.estimateAffinePartial2D(src, dst, method=cv2.RANSAC, ransacReprojThreshold=5.0)
+        if transform is None:
+            return None
+        inliers = int(inlier_mask.sum())
+        if inliers < min_inliers:
+            return None
+        
+        w, h = features['size']
+        center_x, center_y = transform @ np.array([w / 2, h / 2, 1.0])
+        scale = float(np.hypot(transform[0, 0], transform[1, 0]))
+        return {'score': inliers / len(good), 'position': (int(round(center_x)), int(round(center_y))),
+                'scale': round(scale, 2), 'inliers': inliers}
+    
+    @staticmethod
+    def _top_peaks(result: np.ndarray, count: int, width: int, height: int) -> List[Tuple[float, Tuple[int, int]]]:
+        """从得分图中取出得分最高的几个峰值，每取一个就屏蔽其周围一个模板大小的区域"""
+        peaks = []
+        for _ in range(count):
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if peaks and max_val <= -1.0:
+                break
+            peaks.append((float(max_val), max_loc))
+            x, y = max_loc
+            result[max(0, y - height // 2):y + height // 2 + 1, max(0, x - width // 2):x + width // 2 + 1] = -1.0
+        return peaks
+    
+    def _refine_match(self, screenshot: np.ndarray, template: np.ndarray, scale_factor: float,
+                      coarse_loc: Tuple[int, int], downscale: float) -> Optional[Dict[str, Any]]:
+        """在粗匹配位置映射回原尺寸后的周边区域内精匹配"""
+        h, w = template.shape[:2]
+        # 扩展量需覆盖缩放带来的位置误差
+        margin = self.config['pyramid_roi_margin'] + int(np.ceil(1 / downscale))
+        x = int(round(coarse_loc[0] / downscale))
+        y = int(round(coarse_loc[1] / downscale))
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        x1 = min(screenshot.shape[1], x + w + margin)
+        y1 = min(screenshot.shape[0], y + h + margin)
+        return self.find_template_at_scale(screenshot[y0:y1, x0:x1], template, scale_factor, origin=(x0, y0))
+    
+    def find_template_at_scale(self, screenshot: np.ndarray, template: np.ndarray, 
+                               scale_factor: float, origin: Tuple[int, int] = (0, 0)) -> Optional[Dict[str, Any]]:
+        """
+        在指定尺度下查找模板，只计算一次得分图
+        
+        Args:
+            screenshot: 页面截图（或截图中的区域）
+            template: 模板图片（已按尺度缩放）
+            scale_factor: 缩放因子
+            origin: screenshot 左上角在整张截图中的坐标
+            
+        Returns:
+            Optional[Dict[str, Any]]: {score, position, scale}，模板大于截图或匹配出错时返回None
+        """
+        try:
+            th, tw = template.shape[:2]
+            if th > screenshot.shape[0] or tw > screenshot.shape[1]:
+                return None
+            
+            # 模板匹配
+            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            
+            # 计算中心位置
+            center_x = origin[0] + max_loc[0] + tw // 2
+            center_y = origin[1] + max_loc[1] + th // 2
+            return {'score': float(max_val), 'position': (center_x, center_y), 'scale': scale_factor}
+                
+        except Exception as e:
+            log_info(f"[{self.task_id}] 指定尺度模板匹配过程中发生错误: {e}")
+            return None
@@ -0,0 +1,366 @@
+"""
+测试代码生成器
+基于预编译的Jinja2模板生成Playwright测试文件，新建与更新共用同一条生成路径
+"""
+import hashlib
+import json
+import os
+import re
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from config.logger import log_info, log_error
+from utils.image_upload_manager import image_upload_manager
+from utils.test_file_validator import test_file_validator
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'templates' / 'test_code'
+
+
+class TestCodeGenerator:
+    """测试代码生成器 - 模板在创建实例时编译一次，之后每次生成只做渲染"""
+
+    # 避免被pytest当作测试类收集
+    __test__ = False
+
+    # 生成器版本，模板输出发生变化时递增
+    GENERATOR_VERSION = '8'
+    TEMPLATE_NAME = 'test_module.py.j2'
+
+    # UI断言类型 -> (说明, UIOperations方法)
+    UI_ASSERTIONS = {
+        'exists': ('元素存在', 'elem_assert_exists'),
+        'visible': ('元素可见', 'elem_assert_visible'),
+        'text_contains': ('文本包含', 'elem_assert_text_contains'),
+        'attribute_match': ('属性匹配', 'elem_assert_attribute_match'),
+        'element_count': ('元素数量', 'elem_assert_count'),
+    }
+
+    # 图片断言类型 -> (说明, UIOperations方法, 参数名, 默认阈值)
+    IMAGE_ASSERTIONS = {
+        'template_match': ('模板匹配', 'image_assert_exists', 'confidence', 0.8),
+        'mse': ('MSE比较', 'image_assert_mse', 'threshold', 100.0),
+        'ssim': ('SSIM比较', 'image_assert_ssim', 'threshold', 0.8),
+        'perceptual_hash': ('感知哈希比较', 'image_assert_perceptual_hash', 'threshold', 10.0),
+    }
+
+    # 步骤等待策略：fixed 为固定暂停 pause_time 秒，其余策略在条件满足后立即继续
+    WAIT_STRATEGIES = ('fixed', 'selector', 'load_state', 'networkidle', 'url', 'image')
+    LOAD_STATES = ('load', 'domcontentloaded', 'networkidle')
+    DEFAULT_WAIT_TIMEOUT = 30
+
+    def __init__(self, template_dir: Path = TEMPLATE_DIR, output_dir: str = 'Test_Case'):
+        """初始化模板环境并预编译模板"""
+        self.output_dir = output_dir
+        self.environment = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            keep_trailing_newline=True,
+            auto_reload=False,
+            undefined=StrictUndefined,
+        )
+        self.environment.filters['py'] = self.py_literal
+        self.environment.filters['comment'] = self.comment_text
+        self.template = self.environment.get_template(self.TEMPLATE_NAME)
+
+    @staticmethod
+    def py_literal(value: Any) -> str:
+        """将用户输入转换为安全的Python字符串字面量"""
+        return repr('' if value is None else str(value))
+
+    @staticmethod
+    def comment_text(value: Any) -> str:
+        """将用户输入压成单行，用于生成代码中的注释"""
+        return ' '.join(str(value or '').split())
+
+    @staticmethod
+    def function_base_name(product_id: str) -> str:
+        """根据产品ID生成测试函数名前缀"""
+        return 'test_' + re.sub(r'\W', '_', str(product_id))
+
+    def build_functions(self, product_addresses: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """为每个产品地址生成测试函数描述，多地址时函数名带序号"""
+        has_multiple = len(product_addresses) > 1
+        functions = []
+        for i, (product_id, address) in enumerate(product_addresses, 1):
+            name = self.function_base_name(product_id)
+            if has_multiple:
+                name = f"{name}_{i}"
+            functions.append({'name': name, 'address': address or ''})
+        return functions
+
+    def build_steps(self, test_steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """将前端提交的步骤配置规整为模板使用的步骤描述"""
+        steps = []
+        for i, step in enumerate(test_steps or [], 1):
+            operation_type = step.get('operation_type', 'web')
+            if operation_type not in ('web', 'game'):
+                log_info(f"警告: 步骤 {i} 的操作类型 {operation_type} 不受支持，已跳过")
+                continue
+
+            try:
+                operation_count = max(1, int(step.get('operation_count', 1)))
+            except (ValueError, TypeError):
+                operation_count = 1
+                log_info(f"警告: 步骤 {i} 的操作次数无效，使用默认值 1")
+
+            try:
+                pause_time = max(0, int(step.get('pause_time', 1)))
+            except (ValueError, TypeError):
+                pause_time = 1
+                log_info(f"警告: 步骤 {i} 的暂停时间无效，使用默认值 1")
+
+            operation_params = str(step.get('operation_params') or '')
+            if operation_type == 'game':
+                operation_params = operation_params.replace('\\', '/')
+
+            screenshot_enabled = str(step.get('screenshot_enabled', 'NO')).upper() == 'YES'
+            screenshot_timing = (step.get('screenshot_config') or {}).get('timing') \
+                or step.get('screenshot_timing') or 'after'
+
+            tab_target_url = ''
+            if step.get('tab_switch_enabled', 'no') == 'yes':
+                tab_target_url = str(step.get('tab_target_url') or '').strip()
+
+            steps.append({
+                'index': i,
+                'name': str(step.get('step_name') or f'step_{i}'),
+                'type': operation_type,
+                'event': re.sub(r'\W', '_', str(step.get('operation_event') or 'click')),
+                'params': operation_params,
+                'input_value': str(step.get('input_value') or ''),
+                'count': operation_count,
+                'pause': pause_time,
+                'tab_target_url': tab_target_url,
+                'screenshot_before': screenshot_enabled and screenshot_timing in ('before', 'both'),
+                'screenshot_after': screenshot_enabled and screenshot_timing in ('after', 'both'),
+                'screenshot_on_failure': screenshot_enabled and screenshot_timing == 'on_failure',
+                'wait': self.build_wait(step, i, operation_params, tab_target_url),
+                'assertions': self.build_assertions(step, i) if operation_type == 'web' else [],
+            })
+        return steps
+
+    def build_wait(self, step: Dict[str, Any], step_index: int, operation_params: str,
+                   tab_target_url: str) -> Dict[str, Any]:
+        """
+        解析步骤的等待策略
+
+        selector/image 未填写目标时使用步骤的操作参数，url 未填写时使用标签页跳转地址，
+        配置无效时回退为固定暂停。timeout 单位为毫秒。
+        """
+        strategy = str(step.get('wait_strategy') or 'fixed')
+        target = str(step.get('wait_target') or '').strip()
+        try:
+            timeout = float(step.get('wait_timeout') or self.DEFAULT_WAIT_TIMEOUT)
+        except (ValueError, TypeError):
+            timeout = self.DEFAULT_WAIT_TIMEOUT
+            log_info(f"警告: 步骤 {step_index} 的等待超时无效，使用默认值 {self.DEFAULT_WAIT_TIMEOUT} 秒")
+
+        if strategy not in self.WAIT_STRATEGIES:
+            log_info(f"警告: 步骤 {step_index} 的等待策略 {strategy} 不受支持，使用固定暂停")
+            strategy = 'fixed'
+        elif strategy in ('selector', 'image'):
+            target = target or operation_params
+        elif strategy == 'url':
+            target = target or tab_target_url
+        elif strategy == 'load_state':
+            target = target if target in self.LOAD_STATES else 'load'
+
+        if strategy != 'fixed' and strategy != 'networkidle' and not target:
+            log_info(f"警告: 步骤 {step_index} 的等待策略 {strategy} 缺少目标，使用固定暂停")
+            strategy = 'fixed'
+
+        return {
+            'strategy': strategy,
+            'target': target if strategy not in ('fixed', 'networkidle') else '',
+            'timeout': int(max(1, timeout) * 1000),
+        }
+
+    @staticmethod
+    def call_line(method: str, args: List[Any], kwargs: Dict[str, Any] = None) -> str:
+        """生成 ui_operations 方法调用语句"""
+        params = [repr(arg) for arg in args]
+        params += [f"{key}={value!r}" for key, value in (kwargs or {}).items()]
+        return f"await ui_operations.{method}({', '.join(params)})"
+
+    def build_assertions(self, step: Dict[str, Any], step_index: int) -> List[Dict[str, Any]]:
+        """
+        生成断言描述 - 支持UI断言、图片断言、自定义断言
+
+        每个断言包含调用的方法及参数（供解释执行使用）和对应的代码行（供模板使用），
+        自定义脚本断言只有 code 字段。
+        """
+        if step.get('assertion_enabled', 'no') != 'yes':
+            return []
+
+        assertion_config = step.get('assertion_config') or {}
+        assertions = []
+
+        def add(comment, title, method=None, args=None, kwargs=None, code=None):
+            if method:
+                lines = [self.call_line(method, args, kwargs)]
+            else:
+                lines = ['# 自定义断言代码'] + code.splitlines()
+            assertions.append({
+                'comment': comment,
+                'title': title,
+                'method': method,
+                'args': args or [],
+                'kwargs': kwargs or {},
+                'code': code,
+                'lines': lines,
+            })
+
+        # UI断言
+        for assertion in assertion_config.get('ui_assertions', []):
+            assertion_type = assertion.get('type', '')
+            target_element = str(assertion.get('target_element') or '')
+            expected_value = str(assertion.get('expected_value') or '')
+            if not target_element or assertion_type not in self.UI_ASSERTIONS:
+                continue
+
+            label, method = self.UI_ASSERTIONS[assertion_type]
+            args = [target_element]
+            if assertion_type == 'text_contains':
+                if not expected_value:
+                    continue
+                args.append(expected_value)
+            elif assertion_type == 'attribute_match':
+                if ':' not in expected_value:
+                    continue
+                args.append(expected_value)
+            elif assertion_type == 'element_count':
+                if not expected_value.isdigit():
+                    continue
+                args.append(int(expected_value))
+
+            add(f"UI断言: {label}", f"测试步骤{step_index}: UI断言 - {label}", method, args)
+
+        # 图片断言：先保存断言图片，生成的代码使用相对路径
+        for assertion in assertion_config.get('image_assertions', []):
+            processed = image_upload_manager.process_image_assertion_data(assertion)
+            assertion_type = processed.get('method', '')
+            image_path = (processed.get('image_path') or '').lstrip('/')
+            if not image_path:
+                log_info("跳过图片断言：缺少图片路径")
+                continue
+            if assertion_type not in self.IMAGE_ASSERTIONS:
+                continue
+
+            label, method, arg_name, default_value = self.IMAGE_ASSERTIONS[assertion_type]
+            raw_value = processed.get(arg_name)
+            try:
+                value = float(raw_value) if raw_value not in (None, '') else default_value
+            except (ValueError, TypeError):
+                value = default_value
+
+            kwargs = {arg_name: value}
+            screenshot_area = processed.get('screenshot_area')
+            if screenshot_area and assertion_type != 'template_match':
+                kwargs['screenshot_area'] = screenshot_area
+
+            add(f"图片断言: {label}", f"测试步骤{step_index}: 图片断言 - {label}", method, [image_path], kwargs)
+
+        # 自定义断言
+        for assertion in assertion_config.get('custom_assertions', []):
+            assertion_name = assertion.get('name', '')
+            target_element = assertion.get('target_element', '')
+            expected_result = assertion.get('expected_result', '')
+            snippet = assertion.get('code', '') or ''
+            comment = f"自定义断言: {assertion_name}"
+            title = f"测试步骤{step_index}: 自定义断言 - {assertion_name}"
+
+            if target_element and expected_result:
+                add(comment, title, 'elem_custom_assert', [str(target_element), str(expected_result)])
+            elif snippet.strip():
+                add(comment, title, code=textwrap.dedent(snippet).strip('\n'))
+
+        return assertions
+
+    def render(self, data: Dict[str, Any], product_addresses: List[Tuple[str, str]]) -> str:
+        """
+        渲染测试文件内容
+
+        Args:
+            data: 项目数据，需包含 test_steps
+            product_addresses: [(product_id, address), ...]，每个地址生成一个测试函数
+
+        Returns:
+            生成的Python源码
+        """
+        if not product_addresses:
+            raise ValueError("至少需要一个产品地址才能生成测试代码")
+
+        steps = self.build_steps(data.get('test_steps', []))
+        # 只有自定义断言代码需要额外的运行时模块，其余导入由模板按需生成
+        has_custom_code = any(assertion['code'] for step in steps for assertion in step['assertions'])
+        return self.template.render(
+            generator_version=self.GENERATOR_VERSION,
+            functions=self.build_functions(product_addresses),
+            steps=steps,
+            has_custom_code=has_custom_code,
+        )
+
+    def compute_input_hash(self, data: Dict[str, Any], product_addresses: List[Tuple[str, str]]) -> str:
+        """
+        计算影响生成代码的输入哈希
+
+        包含测试步骤（含断言与截图配置）、产品地址和生成器版本，项目描述等字段不参与计算
+        """
+        payload = {
+            'generator_version': self.GENERATOR_VERSION,
+            'test_steps': data.get('test_steps', []),
+            'product_addresses': [[str(pid), str(address or '')] for pid, address in product_addresses],
+        }
+        serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def write(self, filename: str, data: Dict[str, Any],
+              product_addresses: List[Tuple[str, str]]) -> str:
+        """渲染并写入测试文件，内容未变化时不重写，无法编译时不写入，返回文件路径"""
+        file_path = os.path.join(self.output_dir, filename)
+        try:
+            code_content = self.render(data, product_addresses)
+            error = test_file_validator.validate_source(code_content, file_path)
+            if error:
+                raise ValueError(f"生成的测试代码无法编译: {test_file_validator.format_error(error)}")
+            if self.write_atomic(file_path, code_content):
+                test_file_validator.validate_file(file_path, code_content)
+                log_info(f"生成测试文件: {file_path}, 测试函数 {len(product_addresses)} 个")
+            else:
+                log_info(f"测试文件内容未变化，跳过写入: {file_path}")
+            return file_path
+        except Exception as e:
+            log_error(f"生成测试文件失败: {file_path}, 错误: {e}")
+            raise
+
+    @staticmethod
+    def write_atomic(file_path: str, content: str) -> bool:
+        """
+        原子写入文件：先写临时文件再替换，避免执行中的pytest读到半个文件
+
+        Returns:
+            是否实际写入（内容相同则返回False）
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return False
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return True
+
+
+# 创建全局实例（模板在导入时编译一次）
+test_code_generator = TestCodeGenerator()
@@ -0,0 +1,149 @@
+"""
+测试文件名索引
+在内存中维护 Test_Case 目录与 project_files 表中的文件名，
+查找已有测试文件和分配不重复的文件名时不再逐个探测文件系统
+"""
+import os
+import re
+import threading
+from typing import Dict, Optional, Set, Tuple
+from config.logger import log_info
+
+
+class TestFileIndex:
+    """测试文件名索引 - 目录修改时间变化或显式失效时重建"""
+
+    # 避免被pytest当作测试类收集
+    __test__ = False
+
+    # {stem}_{n}.py，如 SC_Web_test_2.py
+    SUFFIX_PATTERN = re.compile(r'^(?P<stem>.+)_(?P<n>\d+)\.py$')
+    # {stem}_{n}_test.py，如 SC_Web_2_test.py
+    INFIX_PATTERN = re.compile(r'^(?P<stem>.+)_(?P<n>\d+)_test\.py$')
+
+    def __init__(self, test_case_dir: str = 'Test_Case'):
+        """初始化索引，首次查询时加载"""
+        self.test_case_dir = test_case_dir
+        self._lock = threading.RLock()
+        self._dir_mtime = None
+        self._disk_names: Set[str] = set()
+        self._db_names: Optional[Set[str]] = None
+        # 已分配但可能尚未写入磁盘或数据库的文件名
+        self._reserved: Set[str] = set()
+        self._names: Set[str] = set()
+        # (格式, stem) -> 已使用的序号
+        self._numbers: Dict[Tuple[str, str], Set[int]] = {}
+
+    def invalidate(self):
+        """使索引失效（project_files 表被修改后调用），下次查询时重新加载"""
+        with self._lock:
+            self._dir_mtime = None
+            self._db_names = None
+            self._reserved = set()
+
+    def add(self, file_name: str):
+        """登记新写入的文件名"""
+        with self._lock:
+            self._ensure_loaded()
+            self._add_name(file_name)
+            if os.path.exists(os.path.join(self.test_case_dir, file_name)):
+                self._disk_names.add(file_name)
+
+    def contains(self, file_name: str) -> bool:
+        """文件名是否已存在于目录或文件映射中"""
+        with self._lock:
+            self._ensure_loaded()
+            return file_name in self._names
+
+    def exists_on_disk(self, file_name: str) -> bool:
+        """文件是否存在于 Test_Case 目录"""
+        with self._lock:
+            self._ensure_loaded()
+            return file_name in self._disk_names
+
+    def lowest_number(self, kind: str, stem: str, start: int = 2, end: int = 101) -> Optional[int]:
+        """返回目录中 [start, end] 范围内已存在的最小序号"""
+        with self._lock:
+            self._ensure_loaded()
+            numbers = [n for n in self._numbers.get((kind, stem), ()) if start <= n <= end
+                       and self.format_name(kind, stem, n) in self._disk_names]
+            return min(numbers) if numbers else None
+
+    def allocate(self, base_file_name: str, kind: str, stem: str) -> str:
+        """
+        分配不重复的文件名并登记
+
+        Args:
+            base_file_name: 基础文件名，未被占用时直接使用
+            kind: 序号格式，suffix 为 {stem}_{n}.py，infix 为 {stem}_{n}_test.py
+            stem: 序号前的文件名部分
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if base_file_name not in self._names:
+                file_name = base_file_name
+            else:
+                used = self._numbers.get((kind, stem), set())
+                file_name = self.format_name(kind, stem, max(used | {1}) + 1)
+            self._reserved.add(file_name)
+            self._add_name(file_name)
+            return file_name
+
+    @staticmethod
+    def format_name(kind: str, stem: str, number: int) -> str:
+        """按序号格式拼接文件名"""
+        if kind == 'infix':
+            return f"{stem}_{number}_test.py"
+        return f"{stem}_{number}.py"
+
+    def _ensure_loaded(self):
+        """目录修改时间变化时重新扫描目录，文件映射只在失效后重新查询"""
+        try:
+            dir_mtime = os.stat(self.test_case_dir).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = 0
+
+        reload_disk = dir_mtime != self._dir_mtime
+        reload_db = self._db_names is None
+        if not reload_disk and not reload_db:
+            return
+
+        if reload_disk:
+            try:
+                self._disk_names = {name for name in os.listdir(self.test_case_dir) if name.endswith('.py')}
+            except FileNotFoundError:
+                self._disk_names = set()
+            self._dir_mtime = dir_mtime
+        if reload_db:
+            self._db_names = self._load_db_names()
+
+        self._names = set()
+        self._numbers = {}
+        for name in self._disk_names | self._db_names | self._reserved:
+            self._add_name(name)
+        log_info(f"测试文件索引已重建: 目录文件 {len(self._disk_names)} 个, 文件映射 {len(self._db_names)} 个")
+
+    def _add_name(self, file_name: str):
+        """登记文件名及其序号"""
+        self._names.add(file_name)
+        for kind, pattern in (('suffix', self.SUFFIX_PATTERN), ('infix', self.INFIX_PATTERN)):
+            match = pattern.match(file_name)
+            if match:
+                self._numbers.setdefault((kind, match.group('stem')), set()).add(int(match.group('n')))
+
+    @staticmethod
+    def _load_db_names() -> Set[str]:
+        """读取 project_files 表中启用的文件名"""
+        from config.database import get_db_connection_with_retry
+        from utils.db_adapter import execute_query_with_results
+        try:
+            with get_db_connection_with_retry() as conn:
+                results = execute_query_with_results(conn, 'SELECT file_name FROM project_files WHERE is_active = 1')
+            return {row[0] for row in results if row[0]}
+        except Exception as e:
+            log_info(f"加载文件映射到索引失败: {str(e)}")
+            return set()
+
+
+# 创建全局实例
+test_file_index = TestFileIndex()
@@ -0,0 +1,126 @@
+"""
+测试文件校验器
+保存或生成测试文件时先编译校验，语法错误在进入执行队列前返回给编辑器；
+并缓存基于AST的文件摘要供执行时选择测试方法。
+不预先写入字节码：pytest 的断言重写从自己的 __pycache__/*-pytest-*.pyc 导入测试模块，
+py_compile 生成的 .pyc 在执行时不会被加载
+"""
+import ast
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from config.logger import log_info
+
+
+class TestFileValidator:
+    """测试文件校验器 - 编译校验与AST摘要缓存"""
+
+    # 避免被pytest当作测试类收集
+    __test__ = False
+
+    CONCURRENT_METHOD = 'test_concurrent_independent_browsers'
+
+    def __init__(self):
+        """初始化摘要缓存"""
+        # 文件绝对路径 -> ((mtime_ns, size), 摘要)
+        self._summaries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def check_source(source: str, filename: str = '<test_file>') -> Tuple[Optional[ast.Module], Optional[Dict[str, Any]]]:
+        """
+        编译校验源码
+
+        Returns:
+            (AST, None) 或 (None, 错误信息)，错误信息包含行号、列号和出错的代码行
+        """
+        try:
+            tree = ast.parse(source, filename)
+            compile(tree, filename, 'exec')
+            return tree, None
+        except SyntaxError as e:
+            return None, {
+                'type': type(e).__name__,
+                'message': e.msg,
+                'line': e.lineno,
+                'column': e.offset,
+                'text': (e.text or '').rstrip('\n'),
+            }
+        except ValueError as e:
+            # 源码中包含空字节等无法编译的内容
+            return None, {'type': 'ValueError', 'message': str(e), 'line': None, 'column': None, 'text': ''}
+
+    def validate_source(self, source: str, filename: str = '<test_file>') -> Optional[Dict[str, Any]]:
+        """校验源码，合法返回None，否则返回错误信息"""
+        _, error = self.check_source(source, filename)
+        if error:
+            log_info(f"测试文件编译失败: {filename} 第{error['line']}行第{error['column']}列: {error['message']}")
+        return error
+
+    @staticmethod
+    def format_error(error: Dict[str, Any]) -> str:
+        """将错误信息格式化为一行提示"""
+        if error.get('line'):
+            return f"第{error['line']}行第{error.get('column') or 0}列: {error['type']}: {error['message']}"
+        return f"{error['type']}: {error['message']}"
+
+    def summarize_tree(self, tree: ast.Module) -> Dict[str, Any]:
+        """从AST中提取测试方法，类中的测试方法同样计入"""
+        test_methods = []
+        for node in tree.body:
+            nodes = node.body if isinstance(node, ast.ClassDef) else [node]
+            for item in nodes:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith('test_'):
+                    test_methods.append(item.name)
+
+        has_concurrent_method = self.CONCURRENT_METHOD in test_methods
+        return {
+            'test_methods': test_methods,
+            'method_count': len(test_methods),
+            'has_concurrent_method': has_concurrent_method,
+            'should_use_concurrent': len(test_methods) > 1 and has_concurrent_method,
+        }
+
+    def get_summary(self, file_path: str) -> Dict[str, Any]:
+        """
+        获取测试文件摘要，文件的修改时间和大小未变化时直接使用缓存
+
+        Returns:
+            test_methods/method_count/has_concurrent_method/should_use_concurrent，
+            以及 valid 和 error（编译失败时的错误信息）
+        """
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._summaries.get(abs_path)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        with open(abs_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        return self._store_summary(abs_path, key, source)
+
+    def validate_file(self, file_path: str, source: str) -> Dict[str, Any]:
+        """文件写入后调用：刷新摘要缓存"""
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        return self._store_summary(abs_path, (stat.st_mtime_ns, stat.st_size), source)
+
+    def _store_summary(self, abs_path: str, key: Tuple[int, int], source: str) -> Dict[str, Any]:
+        """编译源码并缓存摘要"""
+        tree, error = self.check_source(source, abs_path)
+        if tree is not None:
+            summary = self.summarize_tree(tree)
+        else:
+            summary = {'test_methods': [], 'method_count': 0,
+                       'has_concurrent_method': False, 'should_use_concurrent': False}
+        summary['valid'] = error is None
+        summary['error'] = error
+        with self._lock:
+            self._summaries[abs_path] = (key, summary)
+        return summary
+
+
+# 创建全局实例
+test_file_validator = TestFileValidator()
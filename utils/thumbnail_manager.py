@@ -0,0 +1,170 @@
+"""
+缩略图管理器
+为测试截图和游戏模板图片生成缩略图，并在磁盘上缓存
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+from config.logger import log_info, log_error
+
+
+class ThumbnailManager:
+    """缩略图管理器"""
+
+    # 允许生成缩略图的图片类型及其源目录
+    SOURCE_DIRS = {
+        'screenshot': Path("IMG_LOGS"),
+        'assert': Path("IMG_LOGS/IMA_ASSERT"),
+        'game': Path("Game_Img"),
+    }
+
+    # 允许的缩略图宽度范围
+    MIN_WIDTH = 16
+    MAX_WIDTH = 1024
+    DEFAULT_WIDTH = 320
+
+    # 缩略图缓存总大小上限（字节）
+    MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+    def __init__(self, cache_dir: str = "IMG_LOGS/.thumbs", max_cache_bytes: int = None):
+        """初始化缩略图管理器"""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_cache_bytes = max_cache_bytes or self.MAX_CACHE_BYTES
+        self._lock = threading.Lock()
+
+    def get_thumbnail(self, kind: str, name: str, width: Optional[int] = None,
+                      fmt: str = 'webp') -> Tuple[Optional[str], Optional[str]]:
+        """
+        获取缩略图路径，不存在时生成
+
+        Args:
+            kind: 图片类型（screenshot / assert / game）
+            name: 源图片文件名
+            width: 缩略图宽度
+            fmt: 输出格式（webp / jpeg）
+
+        Returns:
+            (缩略图路径, mimetype) 的元组，失败时返回 (None, None)
+        """
+        source_path = self._resolve_source(kind, name)
+        if source_path is None:
+            return None, None
+
+        width = self._normalize_width(width)
+        fmt = 'jpeg' if fmt in ('jpg', 'jpeg') else 'webp'
+        mimetype = f'image/{fmt}'
+
+        try:
+            stat = source_path.stat()
+            # 缓存键包含源文件修改时间，源图片更新后自动失效
+            cache_name = f"{kind}_{source_path.stem}_{int(stat.st_mtime_ns)}_{stat.st_size}_w{width}.{fmt}"
+            cache_path = self.cache_dir / cache_name
+
+            if cache_path.exists():
+                try:
+                    # 更新访问时间，供淘汰策略使用
+                    os.utime(cache_path, None)
+                    return str(cache_path), mimetype
+                except FileNotFoundError:
+                    # 检查后被其他线程淘汰，按缓存未命中重新生成
+                    pass
+
+            with self._lock:
+                if not cache_path.exists():
+                    self._render(source_path, cache_path, width, fmt)
+                    log_info(f"生成缩略图: {cache_name}")
+                    self._evict_if_needed(keep_path=cache_path)
+
+            return str(cache_path), mimetype
+
+        except Exception as e:
+            log_error(f"生成缩略图失败: {kind}/{name}, 错误: {e}")
+            return None, None
+
+    def _resolve_source(self, kind: str, name: str) -> Optional[Path]:
+        """解析源图片路径，拒绝目录穿越"""
+        base_dir = self.SOURCE_DIRS.get(kind)
+        if base_dir is None or not name or os.path.basename(name) != name:
+            return None
+
+        source_path = base_dir / name
+        if not source_path.is_file():
+            return None
+        return source_path
+
+    def _normalize_width(self, width: Optional[int]) -> int:
+        """将请求宽度限制在允许范围内"""
+        if not width:
+            return self.DEFAULT_WIDTH
+        return max(self.MIN_WIDTH, min(self.MAX_WIDTH, int(width)))
+
+    def _render(self, source_path: Path, cache_path: Path, width: int, fmt: str):
+        """缩放源图片并原子写入缓存文件"""
+        from PIL import Image
+
+        with Image.open(source_path) as img:
+            img.draft('RGB', (width, width))
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.LANCZOS)
+
+            if fmt == 'jpeg':
+                img = img.convert('RGB')
+                save_kwargs = {'format': 'JPEG', 'quality': 80, 'optimize': True}
+            else:
+                if img.mode not in ('RGB', 'RGBA'):
+                    img = img.convert('RGBA')
+                save_kwargs = {'format': 'WEBP', 'quality': 80, 'method': 4}
+
+            tmp_path = cache_path.with_suffix(cache_path.suffix + '.tmp')
+            img.save(tmp_path, **save_kwargs)
+            os.replace(tmp_path, cache_path)
+
+    def _evict_if_needed(self, keep_path: Optional[Path] = None):
+        """缓存总大小超过上限时，按最近访问时间淘汰最旧的缩略图（保留本次生成的文件）"""
+        entries = []
+        total_bytes = 0
+        keep_name = keep_path.name if keep_path else None
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                if entry.name == keep_name:
+                    total_bytes += entry.stat().st_size
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_atime, stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+
+        if total_bytes <= self.max_cache_bytes:
+            return
+
+        # 淘汰到上限的80%，避免每次生成都触发淘汰
+        target_bytes = int(self.max_cache_bytes * 0.8)
+        entries.sort(key=lambda e: max(e[0], e[1]))
+        removed = 0
+        for _, _, size, path in entries:
+            if total_bytes <= target_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+                removed += 1
+            except OSError:
+                continue
+
+        log_info(f"缩略图缓存淘汰完成: 删除 {removed} 个文件, 当前大小 {total_bytes} 字节")
+
+    def clear_cache(self):
+        """清空缩略图缓存"""
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        continue
+
+
+# 创建全局实例
+thumbnail_manager = ThumbnailManager()
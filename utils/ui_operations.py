@@ -2,14 +2,11 @@ import asyncio
 import time
 import cv2
 import numpy as np
-from PIL import Image
-import io
 from datetime import datetime
 from os import path
 import uuid
 import json
 import re
-import pyautogui
 from typing import List, Dict, Any, Optional, Tuple
 from playwright.async_api import Page, Browser, Locator
 from playwright.async_api import expect
@@ -27,6 +24,8 @@ class UIOperations:
         self.task_id = task_id or f"ui_task_{id(self)}"
         # 为每个实例创建独立的图片管理器
         self.image_manager = hybrid_image_manager or HybridImageManager(task_id=self.task_id)
+        # 页面帧捕获服务：同一帧截图在图片查找和图片断言之间共用，输入、导航、滚动和等待后失效
+        self.frames = self.image_manager.image_recognition.frames
         # 添加操作超时设置
         self.default_timeout = 30  # 默认30秒超时
         self.element_timeout = 30  # 元素操作超时10秒
@@ -46,16 +45,53 @@ class UIOperations:
             self.page, image_path, confidence, timeout
         )
 
-    # async def wait_for_image(self, image_path: str, timeout: int = None,
-    #                          confidence: float = None) -> Optional[Tuple[int, int]]:
-    #     """等待图片出现"""
-    #     return await self.image_manager.wait_for_image(
-    #         self.page, image_path, timeout, confidence
-    #     )
+    async def find_all_images(self, image_paths: List[str], confidence: float = 0.8) -> List[Dict[str, Any]]:
+        """
+        在同一张截图中查找多个图片，返回所有找到的图片
+
+        Args:
+            image_paths: 图片路径列表
+            confidence: 匹配置信度，得分不低于该值才算找到
+
+        Returns:
+            List[Dict[str, Any]]: [{image, position, score, scale}, ...]，按得分从高到低排列
+        """
+        return await self.image_manager.image_recognition.find_images(self.page, image_paths, confidence)
+
+    async def find_any_image(self, image_paths: List[str], confidence: float = 0.8) -> Optional[Dict[str, Any]]:
+        """
+        在同一张截图中查找多个图片，返回得分最高的一个，用于按页面上出现的图片（如输赢弹窗）分支
+
+        Returns:
+            Optional[Dict[str, Any]]: {image, position, score, scale}，都未找到返回None
+        """
+        hits = await self.find_all_images(image_paths, confidence)
+        if hits:
+            log_info(f"[{self.task_id}] 找到图片: {hits[0]['image']}, 置信度: {hits[0]['score']:.3f}")
+            return hits[0]
+        log_info(f"[{self.task_id}] 未找到任何图片: {', '.join(image_paths)}")
+        return None
+
+    async def wait_for_image(self, image_path: str, timeout: int = 30000,
+                             confidence: float = None, poll_interval: float = 0.5) -> Tuple[int, int]:
+        """等待图片出现，在截止时间前反复截图识别，出现后立即返回坐标"""
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            position = await self.image_manager.image_recognition.find_image(
+                self.page, image_path, confidence, use_cache=False
+            )
+            if position:
+                log_info(f"[{self.task_id}] 等待图片出现成功: {image_path}, 位置: {position}")
+                return position
+            if time.monotonic() >= deadline:
+                log_info(f"[{self.task_id}] 等待图片出现超时: {image_path}")
+                raise Exception(f"WAIT_IMAGE_TIMEOUT: {image_path}")
+            await asyncio.sleep(poll_interval)
 
     async def click_image(self, image_path: str, confidence: float = None,
                           timeout: int = None) -> bool:
         """点击图片"""
+        self.frames.invalidate()
         return await self.image_manager.click_image(
             self.page, image_path, confidence, timeout
         )
@@ -89,6 +125,7 @@ class UIOperations:
                 if position:
                     # 找到图片，执行点击
                     x, y = position
+                    self.frames.invalidate('图片点击')
                     log_info(f"[{self.task_id}] 准备点击图片: {image_path}, 位置: ({x}, {y})")
                     
                     # 尝试多种点击方式
@@ -134,7 +171,8 @@ class UIOperations:
                     if not click_success:
                         try:
                             log_info(f"[{self.task_id}] 尝试PyAutoGUI备用点击方案")
-                            # 使用pyautogui重新查找图片位置
+                            # 使用pyautogui重新查找图片位置（仅在备用方案中导入，避免导入模块时访问显示器）
+                            import pyautogui
                             pyautogui_pos = pyautogui.locateCenterOnScreen(image_path, confidence=confidence*0.8)
                             if pyautogui_pos:
                                 pyautogui.click(pyautogui_pos.x, pyautogui_pos.y)
@@ -177,6 +215,18 @@ class UIOperations:
 
         return False
 
+    async def get_frame(self, screenshot_area: dict = None, exact: bool = False) -> np.ndarray:
+        """
+        获取当前页面帧（BGR图像），帧失效前多次调用只截图一次
+
+        Args:
+            screenshot_area: 截图区域 {"x": 0, "y": 0, "width": 800, "height": 600}，None 表示整页
+            exact: 是否要求像素精确（PNG）
+        """
+        if screenshot_area:
+            return await self.frames.get_region(self.page, screenshot_area, exact=exact)
+        return await self.frames.get_frame(self.page, exact=exact)
+
     def get_image_stats(self):
         """获取图片识别统计信息，包含任务ID"""
         return self.image_manager.get_image_stats()
@@ -187,21 +237,25 @@ class UIOperations:
 
     async def type_text(self, text: str):
         """输入文本"""
+        self.frames.invalidate('输入文本')
         await self.page.keyboard.type(text)
         log_info(f"[{self.task_id}] 输入文本: {text}")
 
     async def press_key(self, key: str):
         """按键"""
+        self.frames.invalidate('按键')
         await self.page.keyboard.press(key)
         log_info(f"[{self.task_id}] 按键: {key}")
 
     async def click_element(self, selector: str):
         """点击元素"""
+        self.frames.invalidate('点击元素')
         await self.page.click(selector)
         log_info(f"[{self.task_id}] 点击元素: {selector}")
 
     async def navigate_to(self, url: str, timeout: int = 90000, max_retries: int = 3):
         """导航到URL，带重试机制"""
+        self.frames.invalidate('页面导航')
         last_error = None
         
         for attempt in range(max_retries):
@@ -237,6 +291,7 @@ class UIOperations:
 
     async def scroll_page(self, delta_x: int = 0, delta_y: int = 0):
         """滚动页面"""
+        self.frames.invalidate('页面滚动')
         await self.page.mouse.wheel(delta_x, delta_y)
         log_info(f"[{self.task_id}] 页面滚动: delta_x={delta_x}, delta_y={delta_y}")
 
@@ -244,6 +299,7 @@ class UIOperations:
         return self.page.locator(element)
 
     async def elem_click(self, element):
+        self.frames.invalidate('元素点击')
         try:
             # 设置超时时间，防止无限等待
             return await asyncio.wait_for(
@@ -262,6 +318,7 @@ class UIOperations:
             raise e
 
     async def elem_double_click(self, element):
+        self.frames.invalidate('元素双击')
         try:
             return await asyncio.wait_for(
                 self.locator_element(element).dblclick(timeout=self.element_timeout * 1000),
@@ -278,6 +335,7 @@ class UIOperations:
             raise e
 
     async def elem_input(self, element, value):
+        self.frames.invalidate('元素输入')
         try:
             return await asyncio.wait_for(
                 self.locator_element(element).fill(value, timeout=self.element_timeout * 1000),
@@ -294,6 +352,7 @@ class UIOperations:
             raise e
 
     async def page_mouse_scroll(self,delta_x=0, delta_y=1100):
+        self.frames.invalidate('页面滚动')
         try:
             return await asyncio.wait_for(
                 self.page.mouse.wheel(delta_x, delta_y),
@@ -502,6 +561,68 @@ class UIOperations:
                 raise Exception("BROWSER_CLOSED_BY_USER")
             raise e
     
+    # 等待页面加载状态：load / domcontentloaded / networkidle
+    async def wait_for_load_state(self, state='load', timeout=30000):
+        try:
+            await asyncio.wait_for(
+                self.page.wait_for_load_state(state, timeout=timeout),
+                timeout=timeout/1000 + 2
+            )
+            log_info(f"[{self.task_id}] 页面已达到加载状态: {state}")
+        except asyncio.TimeoutError:
+            log_info(f"[{self.task_id}] 等待页面加载状态超时: {state}")
+            raise Exception(f"WAIT_LOAD_STATE_TIMEOUT: {state}")
+        except Exception as e:
+            error_msg = str(e).lower()
+            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
+                log_info(f"[{self.task_id}] 检测到浏览器连接异常，等待页面加载失败: {state}")
+                raise Exception("BROWSER_CLOSED_BY_USER")
+            raise e
+
+    # 等待URL匹配，url 为URL中包含的片段
+    async def wait_for_url(self, url, timeout=30000):
+        try:
+            await asyncio.wait_for(
+                self.page.wait_for_url(lambda current_url: url in current_url, timeout=timeout),
+                timeout=timeout/1000 + 2
+            )
+            log_info(f"[{self.task_id}] URL已匹配: {url}")
+        except asyncio.TimeoutError:
+            log_info(f"[{self.task_id}] 等待URL匹配超时: {url}")
+            raise Exception(f"WAIT_URL_TIMEOUT: {url}")
+        except Exception as e:
+            error_msg = str(e).lower()
+            if any(keyword in error_msg for keyword in ['target closed', 'browser has been closed', 'disconnected', 'session closed']):
+                log_info(f"[{self.task_id}] 检测到浏览器连接异常，等待URL失败: {url}")
+                raise Exception("BROWSER_CLOSED_BY_USER")
+            raise e
+
+    # 按等待策略等待页面就绪，条件满足后立即返回
+    async def wait_until(self, strategy, target=None, timeout=30000):
+        """
+        事件驱动的步骤等待
+
+        Args:
+            strategy: selector / load_state / networkidle / url / image
+            target: 选择器、加载状态、URL片段或图片路径
+            timeout: 截止时间（毫秒）
+        """
+        if strategy != 'image':
+            # 等待期间页面会变化；图片等待自身轮询截图，最后一帧即为当前帧
+            self.frames.invalidate('步骤等待')
+        if strategy == 'selector':
+            await self.wait_for_element(target, timeout=timeout)
+        elif strategy == 'load_state':
+            await self.wait_for_load_state(target or 'load', timeout=timeout)
+        elif strategy == 'networkidle':
+            await self.wait_for_load_state('networkidle', timeout=timeout)
+        elif strategy == 'url':
+            await self.wait_for_url(target, timeout=timeout)
+        elif strategy == 'image':
+            await self.wait_for_image(target, timeout=timeout)
+        else:
+            raise ValueError(f"不支持的等待策略: {strategy}")
+
     # 浏览器是否关闭
     async def is_browser_closed(self):
         try:
@@ -765,18 +886,8 @@ class UIOperations:
             
             log_info(f"[{self.task_id}] 图片断言 - MSE比较: {reference_image_path}, 阈值: {threshold}")
             
-            # 获取页面截图
-            if screenshot_area:
-                screenshot_bytes = await self.page.screenshot(
-                    clip=screenshot_area,
-                    type='png'
-                )
-            else:
-                screenshot_bytes = await self.page.screenshot(type='png')
-            
-            # 转换截图为OpenCV格式
-            screenshot_image = Image.open(io.BytesIO(screenshot_bytes))
-            screenshot_cv = cv2.cvtColor(np.array(screenshot_image), cv2.COLOR_RGB2BGR)
+            # 获取当前帧截图（像素精确），同一帧在本步骤的图片检查之间共用
+            screenshot_cv = await self.get_frame(screenshot_area, exact=True)
             
             # 读取参考图片
             reference_cv = cv2.imread(reference_image_path)
@@ -849,18 +960,8 @@ class UIOperations:
                 
                 return np.mean(ssim_map)
             
-            # 获取页面截图
-            if screenshot_area:
-                screenshot_bytes = await self.page.screenshot(
-                    clip=screenshot_area,
-                    type='png'
-                )
-            else:
-                screenshot_bytes = await self.page.screenshot(type='png')
-            
-            # 转换截图为OpenCV格式
-            screenshot_image = Image.open(io.BytesIO(screenshot_bytes))
-            screenshot_cv = cv2.cvtColor(np.array(screenshot_image), cv2.COLOR_RGB2BGR)
+            # 获取当前帧截图（像素精确），同一帧在本步骤的图片检查之间共用
+            screenshot_cv = await self.get_frame(screenshot_area, exact=True)
             screenshot_gray = cv2.cvtColor(screenshot_cv, cv2.COLOR_BGR2GRAY)
             
             # 读取参考图片
@@ -928,18 +1029,8 @@ class UIOperations:
                 """计算汉明距离"""
                 return np.sum(hash1 != hash2)
             
-            # 获取页面截图
-            if screenshot_area:
-                screenshot_bytes = await self.page.screenshot(
-                    clip=screenshot_area,
-                    type='png'
-                )
-            else:
-                screenshot_bytes = await self.page.screenshot(type='png')
-            
-            # 转换截图为OpenCV格式
-            screenshot_image = Image.open(io.BytesIO(screenshot_bytes))
-            screenshot_cv = cv2.cvtColor(np.array(screenshot_image), cv2.COLOR_RGB2BGR)
+            # 获取当前帧截图（像素精确），同一帧在本步骤的图片检查之间共用
+            screenshot_cv = await self.get_frame(screenshot_area, exact=True)
             
             # 读取参考图片
             reference_cv = cv2.imread(reference_image_path)